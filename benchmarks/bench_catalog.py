@@ -0,0 +1,55 @@
+"""Catalog lookup cost versus fleet size: linear scan vs indexed FleetCatalog.
+
+Checks that both pick the same cheapest vehicle, then reports the catalog
+lookup time (feasible, non-dominated candidates only), the time per full
+recommendation and how many vehicles the index hands to the engine.
+
+    python benchmarks/bench_catalog.py --sizes 100 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vehicle_selector import compute_best_vehicle
+from vehicle_selector.fleet_catalog import FleetCatalog
+
+from synthetic import cargo_rows, make_cargo, make_fleet
+
+
+def per_call(fn, rows):
+    start = time.perf_counter()
+    out = [fn(r) for r in rows]
+    return out, (time.perf_counter() - start) / len(rows) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--lines", type=int, default=50)
+    parser.add_argument("--profile", default="heavy_equipment")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = cargo_rows(make_cargo(args.lines, args.profile, args.seed))
+    print(f"{'fleet':>8s} {'skyline':>8s} {'build ms':>9s} {'lookup us':>10s} {'scan us':>10s} {'index us':>10s} {'visited':>8s}")
+    for size in args.sizes:
+        fleet = make_fleet(size, args.seed)
+        start = time.perf_counter()
+        catalog = FleetCatalog(fleet)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        scan, scan_us = per_call(lambda r: compute_best_vehicle(*r, vehicles=fleet), rows)
+        indexed, index_us = per_call(lambda r: compute_best_vehicle(*r, vehicles=catalog), rows)
+        for a, b in zip(scan, indexed):
+            assert (a[0]["total_cost"] if a else None) == (b[0]["total_cost"] if b else None), "index changed the cheapest option"
+
+        found, lookup_us = per_call(lambda r: catalog.candidate_indices(r[0], r[1], r[2], r[3]), rows)
+        visited = sum(len(f) for f in found) / len(rows)
+        print(f"{size:8d} {catalog.skyline_size():8d} {build_ms:9.1f} {lookup_us:10.1f} {scan_us:10.1f} {index_us:10.1f} {visited:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""External catalog load time and memory by format and fleet size.
+
+Writes a synthetic fleet as a CSV directory, a Parquet directory and a SQLite
+file, then times load_catalog on each (read + FleetCatalog/skyline build) and
+reports the peak traced memory of the load and the resulting skyline size.
+
+    python benchmarks/bench_catalog_load.py --sizes 1000 10000 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vehicle_selector.catalog import ODC_LIMITS, fragile_items
+from vehicle_selector.catalog_store import CatalogSnapshot, load_catalog, write_catalog
+from vehicle_selector.fleet_catalog import FleetCatalog
+
+from synthetic import make_fleet
+
+
+def write_parquet(path, fleet):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(path, exist_ok=True)
+    pq.write_table(pa.Table.from_pylist(fleet), os.path.join(path, "vehicles.parquet"))
+
+
+def timed_load(path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    snapshot = load_catalog(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return snapshot, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'fleet':>8s} {'format':>8s} {'load s':>8s} {'peak MB':>8s} {'skyline':>8s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            fleet = make_fleet(size, args.seed)
+            snapshot = CatalogSnapshot(FleetCatalog(fleet), ODC_LIMITS, fragile_items)
+            sources = {
+                "csv": os.path.join(tmp, f"csv-{size}"),
+                "parquet": os.path.join(tmp, f"parquet-{size}"),
+                "sqlite": os.path.join(tmp, f"fleet-{size}.sqlite"),
+            }
+            write_catalog(sources["csv"], snapshot)
+            write_parquet(sources["parquet"], fleet)
+            write_catalog(sources["sqlite"], snapshot)
+            for fmt, path in sources.items():
+                loaded, elapsed, peak = timed_load(path)
+                assert loaded.vehicles.names == snapshot.vehicles.names, f"{fmt} round trip changed the fleet"
+                print(f"{size:8d} {fmt:>8s} {elapsed:8.2f} {peak / 1e6:8.1f} {loaded.vehicles.skyline_size():8d}")
+
+
+if __name__ == "__main__":
+    main()
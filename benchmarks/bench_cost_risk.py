@@ -0,0 +1,45 @@
+"""Monte Carlo cost risk: simulation time versus scenarios and vehicle options.
+
+Simulates fuel, detention and ODC escort variation for the feasible options of
+one cargo line on fleets of increasing size and reports the time per run and
+the P50/P90/P99 of the cheapest option.
+
+    python benchmarks/bench_cost_risk.py --scenarios 100000 1000000 --fleet 10 100 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vehicle_selector import compute_best_vehicle, vehicle_types
+from vehicle_selector.cost_risk import cost_risk
+from vehicle_selector.pareto import add_objectives
+
+from synthetic import make_fleet
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--fleet", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'fleet':>6s} {'options':>8s} {'scenarios':>10s} {'time ms':>8s} {'us/option':>10s} {'p50':>11s} {'p90':>11s} {'p99':>11s}")
+    for size in args.fleet:
+        fleet = vehicle_types if size == len(vehicle_types) else make_fleet(size, args.seed)
+        results = compute_best_vehicle(6.0, 2.4, 2.8, 9000, 12, 800, False, "Standard Steel Fabrication", vehicles=fleet)
+        add_objectives(results, 6.0, 2.4, 2.8, 9000, 12, False, fleet)
+        for n in args.scenarios:
+            start = time.perf_counter()
+            risk = cost_risk(results, 800, n, args.seed)
+            elapsed = time.perf_counter() - start
+            best = risk[0]
+            print(f"{size:6d} {len(results):8d} {n:10d} {elapsed * 1000:8.1f} {elapsed * 1e6 / len(results):10.1f} "
+                  f"{best['p50']:11,.0f} {best['p90']:11,.0f} {best['p99']:11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
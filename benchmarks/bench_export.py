@@ -0,0 +1,85 @@
+"""Streaming report export: throughput and peak memory per format.
+
+Ranks every vehicle option for a synthetic manifest chunk by chunk and writes
+the rows to CSV, Parquet and Excel through export.ReportWriter, then does the
+same by collecting one DataFrame and writing it at the end. Peak memory is
+Python heap (tracemalloc, on a second run) plus Arrow's allocator.
+
+    python benchmarks/bench_export.py --lines 50000 --chunk-size 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import pyarrow as pa
+
+from vehicle_selector.export import ReportWriter
+from vehicle_selector.manifest import manifest_option_rows
+
+from synthetic import make_manifest
+
+
+def manifest_frame(n, seed):
+    m = make_manifest(n, seed)
+    return pd.DataFrame({"length": m["lengths"], "width": m["widths"], "height": m["heights"], "weight": m["weights"],
+                         "quantity": m["quantities"], "distance_km": m["distance_km"], "cargo_type": m["cargo_types"]})
+
+
+def measure(fn):
+    # Timed untraced, then run again under tracemalloc for the peak
+    start = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    arrow_peak = pa.total_allocated_bytes()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed, (peak + max(0, pa.total_allocated_bytes() - arrow_peak)) / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=50_000)
+    parser.add_argument("--chunk-size", type=int, default=5_000)
+    parser.add_argument("--formats", default="csv,parquet,xlsx")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = manifest_frame(args.lines, args.seed)
+    chunks = [manifest.iloc[i:i + args.chunk_size] for i in range(0, len(manifest), args.chunk_size)]
+    directory = tempfile.mkdtemp(prefix="export_")
+
+    for fmt in args.formats.split(","):
+        path = os.path.join(directory, f"report.{fmt}")
+
+        def streamed():
+            with ReportWriter(path, fmt) as writer:
+                for i, chunk in enumerate(chunks):
+                    writer.write(manifest_option_rows(chunk, i * args.chunk_size + 1, 800, False, "Pipeline"))
+            return writer.rows
+
+        def collected():
+            rows = []
+            for i, chunk in enumerate(chunks):
+                rows.extend(manifest_option_rows(chunk, i * args.chunk_size + 1, 800, False, "Pipeline"))
+            frame = pd.DataFrame(rows)
+            {"csv": frame.to_csv, "parquet": frame.to_parquet, "xlsx": frame.to_excel}[fmt](path, index=False)
+            return len(frame)
+
+        for label, fn in (("streamed", streamed), ("one DataFrame", collected)):
+            rows, elapsed, peak = measure(fn)
+            print(f"{fmt:8} {label:14}: {rows:>10,} rows  {elapsed:7.2f} s  {rows / elapsed:>10,.0f} rows/s  "
+                  f"peak {peak:7.1f} MB  file {os.path.getsize(path) / 2**20:6.1f} MB")
+        os.remove(path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
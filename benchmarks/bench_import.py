@@ -0,0 +1,66 @@
+"""Cold import cost of the core package versus the Streamlit script.
+
+Each measurement runs in a fresh interpreter so nothing is already cached in
+sys.modules.
+
+    python benchmarks/bench_import.py --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ["streamlit", "pandas", "altair", "numpy"]
+
+PROBE = """
+import json, logging, sys, time
+logging.disable(logging.CRITICAL)
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+TARGETS = {
+    "vehicle_selector": "vehicle_selector",
+    "vehicle_selector.batch": "vehicle_selector.batch",
+    "vehicle_selector_app (Streamlit script)": "vehicle_selector_app",
+}
+
+
+def measure(module):
+    code = PROBE.format(module=module, heavy=HEAVY)
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    report = {}
+    for label, module in TARGETS.items():
+        runs = [measure(module) for _ in range(args.repeat)]
+        report[label] = {
+            "median_ms": round(statistics.median(r["seconds"] for r in runs) * 1000, 1),
+            "heavy_modules": runs[0]["heavy"],
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for label, row in report.items():
+        heavy = ", ".join(row["heavy_modules"]) or "none"
+        print(f"{label:42s} {row['median_ms']:8.1f} ms   heavy imports: {heavy}")
+
+
+if __name__ == "__main__":
+    main()
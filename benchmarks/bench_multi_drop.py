@@ -0,0 +1,45 @@
+"""Multi-drop tour planning: time and cost versus number of sites.
+
+Compares the planned tours with the baseline of one direct (out-and-back)
+delivery per site on its cheapest vehicle, and checks every site is served.
+
+    python benchmarks/bench_multi_drop.py --sites 20 100 300 500 --budget 5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vehicle_selector.multi_drop import plan_multi_drop
+
+from synthetic import make_sites
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sites", type=int, nargs="+", default=[20, 100, 300, 500])
+    parser.add_argument("--budget", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'sites':>6s} {'time s':>7s} {'trucks':>7s} {'km':>9s} {'cost':>13s} {'direct':>13s} {'saving':>7s} {'done':>5s}")
+    for n in args.sites:
+        sites, distances = make_sites(n, args.seed)
+        # Direct-delivery baseline: a one-site plan per site
+        direct = sum(plan_multi_drop([s], [[0, distances[0][i]], [distances[i][0], 0]], time_budget=None)["total_cost"]
+                     for i, s in enumerate(sites, start=1))
+
+        start = time.perf_counter()
+        plan = plan_multi_drop(sites, distances, time_budget=args.budget)
+        elapsed = time.perf_counter() - start
+
+        served = sorted(stop for tour in plan["tours"] for stop in tour["stops"])
+        assert sorted(set(served)) == sorted(s["name"] for s in sites if s["name"] not in plan["unserved"]), "site missed"
+        print(f"{n:6d} {elapsed:7.2f} {plan['num_trucks']:7d} {plan['total_km']:9.0f} {plan['total_cost']:13,.0f} "
+              f"{direct:13,.0f} {1 - plan['total_cost'] / direct:7.1%} {str(plan['complete']):>5s}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Quote store: bulk insert rate and lookup latency at millions of rows.
+
+Fills a fresh SQLite quote store with quotes drawn from a pool of realistic
+cargo lines (so the same cargo recurs across projects and dates), then times
+"same cargo quoted before?" lookups for known and unknown cargo and a
+project/date-range history query.
+
+    python benchmarks/bench_quote_store.py --rows 1000000 --path /tmp/quotes.sqlite
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vehicle_selector import CATALOG_VERSION
+from vehicle_selector.batch import compute_best_vehicle_batch
+from vehicle_selector.quote_store import QuoteStore, quote_row
+
+from synthetic import cargo_rows, make_cargo
+
+
+def _time_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--pool", type=int, default=20_000, help="distinct cargo lines")
+    parser.add_argument("--batch", type=int, default=50_000, help="rows per bulk insert")
+    parser.add_argument("--path", help="database file (default: a temporary file)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(), "quotes.sqlite")
+    if os.path.exists(path):
+        os.remove(path)
+    store = QuoteStore(path)
+
+    cargo = cargo_rows(make_cargo(args.pool, "mixed", args.seed))
+    ranked = compute_best_vehicle_batch(*zip(*cargo))
+    rng = np.random.default_rng(args.seed)
+    now = time.time()
+
+    start = time.perf_counter()
+    written = 0
+    while written < args.rows:
+        n = min(args.batch, args.rows - written)
+        picks = rng.integers(0, args.pool, n).tolist()
+        projects = rng.integers(0, 200, n).tolist()
+        ages = rng.uniform(0, 3 * 365 * 86400, n).tolist()
+        store.record_many(quote_row(*cargo[i], ranked[i], CATALOG_VERSION, f"P-{p:04d}", now - age)
+                          for i, p, age in zip(picks, projects, ages))
+        written += n
+    elapsed = time.perf_counter() - start
+    print(f"inserted {written:,} rows in {elapsed:.1f} s ({written / elapsed:,.0f} rows/s), "
+          f"{os.path.getsize(path) / 1e6:,.0f} MB")
+
+    probes = [cargo[i] for i in rng.integers(0, args.pool, 200).tolist()]
+    hits = iter(probes * 10)
+
+    def known():
+        # lookup takes the cargo without its distance
+        c = next(hits)
+        return store.lookup(*c[:5], *c[6:], limit=10)
+
+    med, worst = _time_ms(known, 200)
+    print(f"lookup (known cargo, 10 newest)  median {med:.3f} ms  max {worst:.3f} ms")
+    med, worst = _time_ms(lambda: store.lookup(99.9, 9.9, 9.9, 1.0, 1, False, "Pipeline"), 200)
+    print(f"lookup (unknown cargo)          median {med:.3f} ms  max {worst:.3f} ms")
+    med, worst = _time_ms(lambda: store.history("P-0042", now - 30 * 86400, now, limit=100), 50)
+    print(f"history (one project, 30 days)  median {med:.3f} ms  max {worst:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Rate cards: concurrent ingestion throughput and cheapest-rate lookup latency.
+
+Writes a directory of synthetic weekly rate cards (three CSV/Excel layouts),
+ingests it with one and with several parser processes, then times the indexed
+cheapest-valid-rate lookup against a linear scan of every card and checks the
+two agree.
+
+    python benchmarks/bench_rate_cards.py --transporters 60 --weeks 8 --workers 4
+"""
+import argparse
+import datetime
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vehicle_selector import compute_best_vehicle, vehicle_types
+from vehicle_selector.engine import classify_vehicle
+from vehicle_selector.rate_cards import ANY_LANE, ingest_rate_cards, normalize_name
+
+from synthetic import make_rate_cards
+
+
+def scan(table, vehicle, origin, destination, tonnes, day):
+    # Reference: every card, no index
+    names = {normalize_name(vehicle), normalize_name(classify_vehicle(vehicle))}
+    lanes = {(origin.lower(), destination.lower()), ANY_LANE}
+    best = None
+    for r in table.rows:
+        if normalize_name(r["vehicle"]) in names and (r["origin"], r["destination"]) in lanes and r["valid_from"] <= day <= r["valid_to"]:
+            cost = r["cost_per_km"] + tonnes * r["cost_per_tkm"]
+            best = cost if best is None or cost < best else best
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transporters", type=int, default=60)
+    parser.add_argument("--weeks", type=int, default=8)
+    parser.add_argument("--lanes", type=int, default=120)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="rate_cards_")
+    try:
+        lanes = make_rate_cards(directory, args.transporters, args.weeks, args.lanes, args.seed)
+        files = len(os.listdir(directory))
+
+        timings = {}
+        for workers in sorted({1, args.workers}):
+            start = time.perf_counter()
+            table, report = ingest_rate_cards(directory, workers=workers)
+            timings[workers] = time.perf_counter() - start
+            print(f"ingest {files:,} files / {report['rows']:,} rates, {workers} worker(s): {timings[workers]:6.2f} s "
+                  f"({report['rows'] / timings[workers]:,.0f} rates/s)")
+
+        rng = random.Random(args.seed)
+        first = min(r["valid_from"] for r in table.rows)
+        queries = [(rng.choice(vehicle_types)["name"], *rng.choice(lanes), rng.uniform(0.5, 60),
+                    datetime.date.fromordinal(first + rng.randrange(args.weeks * 7))) for _ in range(args.queries)]
+
+        start = time.perf_counter()
+        indexed = [table.best_rate(v, o, d, t, day) for v, o, d, t, day in queries]
+        t_index = (time.perf_counter() - start) / len(queries)
+        sample = queries[:200]
+        start = time.perf_counter()
+        scanned = [scan(table, v, o, d, t, day.toordinal()) for v, o, d, t, day in sample]
+        t_scan = (time.perf_counter() - start) / len(sample)
+        for (v, o, d, t, day), card, reference in zip(sample, indexed, scanned):
+            got = None if card is None else card["cost_per_km"] + t * card["cost_per_tkm"]
+            assert (got is None) == (reference is None) and (got is None or abs(got - reference) < 1e-6), (v, o, d, t, day)
+        print(f"cheapest rate, indexed : {t_index * 1e6:9.1f} µs/lookup")
+        print(f"cheapest rate, scan    : {t_scan * 1e6:9.1f} µs/lookup ({t_scan / t_index:,.0f}x)")
+
+        origin, destination = lanes[0]
+        lane = table.lane(origin, destination, datetime.date.fromordinal(first))
+        cargo = (6.0, 2.4, 2.8, 9000, 12, 800, False, "Standard Steel Fabrication")
+        for label, kwargs in (("catalog rates", {}), ("rate cards", {"rate_cards": lane})):
+            start = time.perf_counter()
+            for _ in range(200):
+                compute_best_vehicle(*cargo, **kwargs)
+            print(f"compute_best_vehicle ({label:13}): {(time.perf_counter() - start) / 200 * 1e6:9.1f} µs")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Constrained shortest-path cost on a synthetic road network.
+
+Checks A* against plain Dijkstra on every query, then reports cold query time
+(Dijkstra and A*), warm time once the envelope-bucketed path cache is filled,
+and how many distinct cached paths the vehicle envelopes collapse to.
+
+    python benchmarks/bench_routes.py --nodes 2000 20000 --queries 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vehicle_selector import vehicle_types
+from vehicle_selector.road_graph import RoadGraph
+
+from synthetic import make_road_network
+
+
+def run(graph, queries, envelopes):
+    start = time.perf_counter()
+    out = [graph.shortest_path(a, b, *env) for a, b in queries for env in envelopes]
+    return out, (time.perf_counter() - start) / len(out) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # One envelope per built-in vehicle, loaded to its limits
+    envelopes = [(v["max_height"], v["max_width"], v["max_weight"]) for v in vehicle_types]
+    print(f"{'nodes':>7s} {'edges':>7s} {'dijkstra ms':>12s} {'a* ms':>8s} {'cached ms':>10s} {'paths':>6s}")
+    for n in args.nodes:
+        edges, coordinates = make_road_network(n, seed=args.seed)
+        rng = random.Random(args.seed)
+        names = sorted(coordinates)
+        queries = [(rng.choice(names), rng.choice(names)) for _ in range(args.queries)]
+
+        plain = RoadGraph(edges)
+        guided = RoadGraph(edges, coordinates)
+        dijkstra, dijkstra_ms = run(plain, queries, envelopes)
+        astar, astar_ms = run(guided, queries, envelopes)
+        for a, b in zip(dijkstra, astar):
+            assert (a and a["distance_km"]) == (b and b["distance_km"]), "A* disagrees with Dijkstra"
+        _, cached_ms = run(guided, queries, envelopes)
+        print(f"{n:7d} {guided.edge_count:7d} {dijkstra_ms:12.2f} {astar_ms:8.2f} {cached_ms:10.4f} {guided.path_cache.stats()['entries']:6d}")
+
+
+if __name__ == "__main__":
+    main()
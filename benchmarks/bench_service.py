@@ -0,0 +1,163 @@
+"""Load test for the HTTP/JSON quoting service.
+
+Starts `python -m vehicle_selector serve` on a local port (offline) and drives
+it with N concurrent keep-alive clients from service.QuoteClient. Each client
+sends single-line quotes, or batches with --batch, drawn from a pool of
+realistic cargo lines with a skewed popularity, so concurrent duplicates are
+coalesced. Requests turned away with 503 are counted and retried after a
+short pause.
+
+Per concurrency level it reports requests/s, cargo lines/s, latency
+percentiles (send to full response), 503s and the server's coalescing counts.
+
+    python benchmarks/bench_service.py --clients 1 8 32 --requests 200 --workers 2
+    python benchmarks/bench_service.py --clients 8 --batch 100 --requests 20 --output service.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vehicle_selector.service import QuoteClient
+
+from synthetic import cargo_rows, make_cargo
+
+FIELDS = ["length", "width", "height", "weight", "quantity", "distance_km", "allow_stacking", "cargo_type"]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, args):
+    command = [sys.executable, "-m", "vehicle_selector", "serve", "--port", str(port), "--workers", str(args.workers),
+               "--queue-size", str(args.queue_size)]
+    if args.catalog:
+        command += ["--catalog", args.catalog]
+    server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("service did not start")
+
+
+def _workload(clients, requests, batch, pool, seed):
+    # Lines per client request: a popularity-skewed draw from a pool of realistic lines
+    rows = [dict(zip(FIELDS, row)) for row in cargo_rows(make_cargo(pool, "mixed", seed))]
+    for row in rows:
+        row["weight"] = max(row["weight"], 0.01)
+    rng = np.random.default_rng(seed + 1)
+    weights = 1.0 / np.arange(1, pool + 1)
+    picks = rng.choice(pool, (clients, requests, batch), p=weights / weights.sum())
+    return [[[rows[i] for i in request] for request in client] for client in picks.tolist()]
+
+
+def _pct(values, q):
+    return round(float(np.percentile(values, q)), 2) if values else None
+
+
+async def _client(port, requests, batch, top, out):
+    client = QuoteClient(port=port)
+    try:
+        for lines in requests:
+            while True:
+                start = time.perf_counter()
+                if batch > 1:
+                    status, _ = await client.quote_batch(lines, top)
+                else:
+                    status, _ = await client.quote(lines[0], top)
+                if status != 503:
+                    break
+                out["rejected"] += 1
+                await asyncio.sleep(0.05)
+            out["latency_ms"].append((time.perf_counter() - start) * 1000)
+            out["errors"] += status != 200
+            out["lines"] += len(lines)
+    finally:
+        await client.close()
+
+
+def run_level(clients, args):
+    port = _free_port()
+    server = start_server(port, args)
+    try:
+        # Warm the worker pool so process start-up is not charged to the level
+        asyncio.run(_client(port, _workload(1, 2, args.batch, args.pool, args.seed + 999)[0], args.batch, args.top,
+                            {"latency_ms": [], "errors": 0, "rejected": 0, "lines": 0}))
+        out = {"latency_ms": [], "errors": 0, "rejected": 0, "lines": 0}
+        workload = _workload(clients, args.requests, args.batch, args.pool, args.seed)
+
+        async def level():
+            await asyncio.gather(*(_client(port, requests, args.batch, args.top, out) for requests in workload))
+
+        start = time.perf_counter()
+        asyncio.run(level())
+        elapsed = time.perf_counter() - start
+        stats = json.loads(urllib.request.urlopen(f"http://127.0.0.1:{port}/stats", timeout=5).read())
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latency = out["latency_ms"]
+    return {
+        "clients": clients,
+        "requests": len(latency),
+        "lines": out["lines"],
+        "errors": out["errors"],
+        "rejected_503": out["rejected"],
+        "wall_s": round(elapsed, 3),
+        "throughput_rps": round(len(latency) / elapsed, 1),
+        "lines_per_s": round(out["lines"] / elapsed, 1),
+        "latency_ms": {"p50": _pct(latency, 50), "p90": _pct(latency, 90), "p99": _pct(latency, 99),
+                       "max": round(max(latency), 2) if latency else None},
+        "server": {k: stats[k] for k in ("computed", "coalesced", "rejected")},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32], help="concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--batch", type=int, default=1, help="cargo lines per request (1: POST /quote)")
+    parser.add_argument("--top", type=int, default=5, help="options returned per line")
+    parser.add_argument("--pool", type=int, default=500, help="distinct cargo lines to draw from")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queue-size", type=int, default=512)
+    parser.add_argument("--catalog", help="fleet/rate catalog directory or SQLite file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    levels = []
+    for clients in args.clients:
+        level = run_level(clients, args)
+        levels.append(level)
+        lat = level["latency_ms"]
+        print(f"{clients:4d} clients: {level['throughput_rps']:8.1f} req/s  {level['lines_per_s']:9.1f} lines/s  "
+              f"p50 {lat['p50']:7.1f} ms  p99 {lat['p99']:7.1f} ms  {level['rejected_503']} x 503  "
+              f"{level['server']['coalesced']:,} coalesced / {level['server']['computed']:,} computed  {level['errors']} errors")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "levels": levels}, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
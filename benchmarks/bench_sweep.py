@@ -0,0 +1,79 @@
+"""What-if sweep: grid evaluation time against one compute_best_vehicle call per cell.
+
+Evaluates one cargo over quantity × distance × stacking with sweep.sweep_grid
+for the built-in fleet and synthetic fleets, times the heatmap rows and chart
+specs, and checks a random sample of cells against compute_best_vehicle.
+
+    python benchmarks/bench_sweep.py --quantities 500 --distances 100 --max-fleet 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vehicle_selector import compute_best_vehicle, vehicle_types
+from vehicle_selector.catalog import axle_geometry
+from vehicle_selector.presentation import sweep_heatmaps, sweep_rows
+from vehicle_selector.sweep import sweep_axis, sweep_grid
+
+from synthetic import make_fleet
+
+CARGO = [
+    ("control panel", (2.2, 1.2, 1.8, 1200, "Control Panel")),
+    ("steel skid", (6.0, 2.4, 2.8, 9000, "Standard Steel Fabrication")),
+    ("small parts", (0.6, 0.4, 0.4, 25, "Pipeline")),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quantities", type=int, default=500, help="quantity 1..N in steps of 1")
+    parser.add_argument("--distances", type=int, default=100, help="points between 50 and 3000 km")
+    parser.add_argument("--max-fleet", type=int, default=10000)
+    parser.add_argument("--samples", type=int, default=200, help="cells checked against compute_best_vehicle")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    quantities = sweep_axis(1, args.quantities, 1)
+    distances = sweep_axis(50, 3000, 2950 / max(1, args.distances - 1))
+    cells = len(quantities) * len(distances) * 2
+    rng = random.Random(args.seed)
+    fleets = [("built-in", vehicle_types, axle_geometry)]
+    fleets += [(f"{size:,} vehicles", make_fleet(size, args.seed), None) for size in (100, 1000, 10000) if size <= args.max_fleet]
+
+    for fleet_label, fleet, axles in fleets:
+        for cargo_label, (length, width, height, weight, cargo_type) in CARGO:
+            start = time.perf_counter()
+            sweep = sweep_grid(length, width, height, weight, cargo_type, quantities, distances, vehicles=fleet, axles=axles)
+            elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(args.samples):
+                s, i, k = rng.randrange(2), rng.randrange(len(quantities)), rng.randrange(len(distances))
+                results = compute_best_vehicle(length, width, height, weight, int(quantities[i]), distances[k], sweep["allow_stacking"][s],
+                                               cargo_type, vehicles=fleet, axles=axles)
+                best = sweep["best"][s, i, k]
+                if results:
+                    assert sweep["vehicles"][best] == results[0]["vehicle"], (cargo_label, s, i, k)
+                    assert sweep["total_cost"][s, i, k] == results[0]["total_cost"], (cargo_label, s, i, k)
+                else:
+                    assert best == -1, (cargo_label, s, i, k)
+            per_cell = (time.perf_counter() - start) / args.samples
+            print(f"{fleet_label:16} {cargo_label:14}: {cells:,} cells in {elapsed:6.3f} s  "
+                  f"(per-cell calls would take {per_cell * cells:8.1f} s)")
+
+    def heatmaps():
+        vehicle_map, cost_map = sweep_heatmaps(sweep_rows(sweep))
+        return vehicle_map.to_dict(), cost_map.to_dict()
+
+    heatmaps()  # pandas / altair imports
+    start = time.perf_counter()
+    heatmaps()
+    print(f"heatmap rows + chart specs: {time.perf_counter() - start:6.3f} s")
+
+
+if __name__ == "__main__":
+    main()
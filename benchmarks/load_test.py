@@ -0,0 +1,325 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Starts the app with `streamlit run` on a local port (headless, offline) and
+drives N concurrent browser sessions over Streamlit's websocket protocol: each
+session loads the page, then repeatedly fills the single-cargo form with a
+cargo line and clicks "Recommend Vehicle", with an exponential think time in
+between. Cargo lines are drawn from the benchmark cargo profiles with a
+skewed popularity, so some requests repeat (as planners re-quote common
+loads) and hit the result cache while the rest miss.
+
+Per concurrency level it records throughput, request latency percentiles
+(send to script finished, including rendering and transfer), first-page load
+time, errors and the growth of the server's peak resident memory per
+session. A fresh server is started for every level.
+
+    python benchmarks/load_test.py --sessions 1 4 8 16 --requests 10 --output before.json
+    python benchmarks/load_test.py --sessions 1 4 8 16 --requests 10 --output after.json
+    python benchmarks/load_test.py --compare before.json after.json
+
+Needs the `websockets` package (installed with Streamlit's server).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import cargo_rows, make_cargo
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vehicle_selector_app.py")
+FORM = ["Cargo Length (m)", "Cargo Width (m)", "Cargo Height (m)", "Cargo Weight (kg)", "Quantity of Cargo Units",
+        "Transport Distance (km)", "Allow Vertical Stacking (if feasible)", "Cargo Type"]
+SUBMIT = "🔍 Recommend Vehicle"
+
+
+# ----------------------------
+# Server
+# ----------------------------
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def start_server(port, env):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP, "--server.headless=true", f"--server.port={port}",
+         "--server.address=127.0.0.1", "--browser.gatherUsageStats=false", "--server.fileWatcherType=none"],
+        env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("streamlit server did not come up")
+
+
+# ----------------------------
+# Headless session
+# ----------------------------
+
+class Session:
+    # One browser tab: keeps widget ids from the last run and resends every value it has set
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets = {}
+        self.states = {}
+
+    async def run(self, trigger=None):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        if trigger is not None:
+            msg.rerun_script.widget_states.widgets.append(trigger)
+        await self.ws.send(msg.SerializeToString())
+
+        alerts, exceptions = [], []
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                field = element.WhichOneof("type")
+                body = getattr(element, field)
+                if getattr(body, "id", "") and getattr(body, "label", ""):
+                    self.widgets[body.label] = (field, body)
+                elif field == "alert":
+                    alerts.append(body.body)
+                elif field == "exception":
+                    exceptions.append(body.message)
+            elif kind == "script_finished":
+                return alerts, exceptions
+
+    def set(self, label, value):
+        from streamlit.proto.NumberInput_pb2 import NumberInput
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        field, body = self.widgets[label]
+        state = WidgetState(id=body.id)
+        if field == "number_input" and body.data_type == NumberInput.INT:
+            state.int_value = int(value)
+        elif field == "number_input":
+            state.double_value = float(value)
+        elif field == "checkbox":
+            state.bool_value = bool(value)
+        else:
+            state.string_value = str(value)
+        self.states[label] = state
+
+    def click(self, label):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        return WidgetState(id=self.widgets[label][1].id, trigger_value=True)
+
+
+async def _session(port, cargo, think, seed, out):
+    import websockets
+
+    rng = np.random.default_rng(seed)
+    async with websockets.connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None) as ws:
+        session = Session(ws)
+        start = time.perf_counter()
+        await session.run()
+        out["load_ms"].append((time.perf_counter() - start) * 1000)
+        for row in cargo:
+            await asyncio.sleep(rng.exponential(think) if think else 0)
+            for label, value in zip(FORM, row):
+                session.set(label, value)
+            start = time.perf_counter()
+            alerts, exceptions = await session.run(session.click(SUBMIT))
+            out["latency_ms"].append((time.perf_counter() - start) * 1000)
+            out["errors"] += bool(exceptions)
+            out["answered"] += any("Recommended Vehicle" in a or "No suitable vehicle" in a for a in alerts)
+        out["sessions_done"] += 1
+
+
+# ----------------------------
+# Load levels
+# ----------------------------
+
+def _workload(sessions, requests, pool, seed):
+    # Cargo per session: a popularity-skewed draw from a pool of realistic lines
+    rows = cargo_rows(make_cargo(pool, "mixed", seed))
+    rows = [(l, w, h, max(wt, 0.01), q, d, s, c) for l, w, h, wt, q, d, s, c in rows]
+    rng = np.random.default_rng(seed + 1)
+    weights = 1.0 / np.arange(1, pool + 1)
+    picks = rng.choice(pool, (sessions, requests), p=weights / weights.sum())
+    return [[rows[i] for i in session] for session in picks.tolist()]
+
+
+def _pct(values, q):
+    return round(float(np.percentile(values, q)), 2) if values else None
+
+
+def run_level(sessions, args):
+    port = _free_port()
+    env = {"ARTSON_CATALOG": args.catalog} if args.catalog else {}
+    server = start_server(port, env)
+    try:
+        # One throwaway session so imports and the first script compile are not charged to the level
+        warm = {"load_ms": [], "latency_ms": [], "errors": 0, "answered": 0, "sessions_done": 0}
+        asyncio.run(_session(port, _workload(1, 1, args.pool, args.seed + 999)[0], 0, 0, warm))
+        baseline_mb = _rss_mb(server.pid)
+
+        out = {"load_ms": [], "latency_ms": [], "errors": 0, "answered": 0, "sessions_done": 0}
+        workload = _workload(sessions, args.requests, args.pool, args.seed)
+
+        samples = [baseline_mb or 0.0]
+
+        async def sample_rss():
+            # Peak resident memory while the sessions are connected
+            while True:
+                samples.append(_rss_mb(server.pid) or 0.0)
+                await asyncio.sleep(0.1)
+
+        async def level():
+            sampler = asyncio.create_task(sample_rss())
+            await asyncio.gather(*(_session(port, cargo, args.think, args.seed + i, out) for i, cargo in enumerate(workload)))
+            sampler.cancel()
+
+        start = time.perf_counter()
+        asyncio.run(level())
+        elapsed = time.perf_counter() - start
+        peak_mb = max(samples)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latency = out["latency_ms"]
+    return {
+        "sessions": sessions,
+        "requests": len(latency),
+        "answered": out["answered"],
+        "errors": out["errors"],
+        "wall_s": round(elapsed, 3),
+        "throughput_rps": round(len(latency) / elapsed, 3),
+        "latency_ms": {"p50": _pct(latency, 50), "p90": _pct(latency, 90), "p99": _pct(latency, 99),
+                       "max": round(max(latency), 2) if latency else None,
+                       "mean": round(statistics.fmean(latency), 2) if latency else None},
+        "page_load_ms": {"p50": _pct(out["load_ms"], 50), "max": round(max(out["load_ms"]), 2) if out["load_ms"] else None},
+        "server_rss_mb": round(peak_mb, 1) if peak_mb else None,
+        "rss_per_session_mb": round((peak_mb - baseline_mb) / sessions, 2) if peak_mb and baseline_mb else None,
+    }
+
+
+def _environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    import streamlit
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "streamlit": streamlit.__version__,
+    }
+
+
+def run(args):
+    levels = []
+    for n in args.sessions:
+        level = run_level(n, args)
+        levels.append(level)
+        lat = level["latency_ms"]
+        print(f"{n:4d} sessions  {level['throughput_rps']:7.2f} req/s  p50 {lat['p50']:8.1f} ms  p90 {lat['p90']:8.1f} ms  "
+              f"p99 {lat['p99']:8.1f} ms  {level['rss_per_session_mb']} MB/session  {level['errors']} errors", file=sys.stderr)
+    report = {
+        "environment": _environment(),
+        "config": {"sessions": args.sessions, "requests": args.requests, "think_s": args.think, "pool": args.pool,
+                   "seed": args.seed, "catalog": args.catalog},
+        "levels": levels,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def compare(before_path, after_path, threshold):
+    with open(before_path) as f:
+        before = {r["sessions"]: r for r in json.load(f)["levels"]}
+    with open(after_path) as f:
+        after = {r["sessions"]: r for r in json.load(f)["levels"]}
+
+    regressions = 0
+    print(f"{'sessions':>8s} {'metric':16s} {'before':>10s} {'after':>10s} {'ratio':>7s}")
+    for n in sorted(set(before) & set(after)):
+        for metric, b, a, higher_is_better in (
+            ("throughput_rps", before[n]["throughput_rps"], after[n]["throughput_rps"], True),
+            ("latency_p90_ms", before[n]["latency_ms"]["p90"], after[n]["latency_ms"]["p90"], False),
+            ("latency_p99_ms", before[n]["latency_ms"]["p99"], after[n]["latency_ms"]["p99"], False),
+            ("mb_per_session", before[n]["rss_per_session_mb"], after[n]["rss_per_session_mb"], False),
+        ):
+            if b is None or a is None:
+                continue
+            ratio = a / b if b else float("inf")
+            worse = ratio < 1 - threshold if higher_is_better else ratio > 1 + threshold
+            # Memory deltas of a few MB are noise
+            if metric == "mb_per_session" and abs(a - b) < 1.0:
+                worse = False
+            regressions += worse
+            print(f"{n:8d} {metric:16s} {b:10.2f} {a:10.2f} {ratio:6.2f}x{'  <-- regression' if worse else ''}")
+        if after[n]["errors"] > before[n]["errors"]:
+            regressions += 1
+            print(f"{n:8d} {'errors':16s} {before[n]['errors']:10d} {after[n]['errors']:10d}  <-- regression")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8, 16], help="concurrency levels")
+    parser.add_argument("--requests", type=int, default=10, help="form submissions per session")
+    parser.add_argument("--think", type=float, default=0.5, help="mean think time between submissions (s)")
+    parser.add_argument("--pool", type=int, default=200, help="distinct cargo lines the sessions draw from")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--catalog", help="ARTSON_CATALOG for the server (default: built-in fleet)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two JSON reports")
+    parser.add_argument("--threshold", type=float, default=0.15, help="relative change flagged by --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
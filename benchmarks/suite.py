@@ -0,0 +1,227 @@
+"""Reproducible benchmark suite for the selection engine and rendering path.
+
+Times each stage separately over synthetic cargo and fleet catalogs from the
+built-in 10 vehicles up to 10k vendor vehicles:
+
+* compute_best_vehicle (scalar, per cargo line)
+* cost_plans (costing stage only, packing plans precomputed)
+* evaluate_batch (vectorized, per cargo line)
+* check_odc (per cargo line)
+* plan_vehicles with axle-load / CG limits (built-in fleet, per cargo line)
+* results DataFrame construction
+* Styler rendering (highlight_min, rendered to HTML)
+* Altair chart spec generation (to_dict)
+* Pareto frontier over the whole fleet plus its chart spec
+* Arrow table page (sorted server-side) and top-k chart spec, as the app renders them
+
+Results go to stdout or --output as JSON. Compare two runs with --compare:
+
+    python benchmarks/suite.py --output before.json
+    python benchmarks/suite.py --output after.json
+    python benchmarks/suite.py --compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vehicle_selector import check_odc, compute_best_vehicle
+from vehicle_selector.catalog import axle_geometry
+from vehicle_selector.engine import cost_plans, plan_vehicles
+from vehicle_selector.batch import evaluate_batch
+from vehicle_selector.pareto import compute_pareto_front
+from vehicle_selector.presentation import chart_rows, cost_chart, frontier_chart, results_frame, results_table, sort_page
+
+from synthetic import CARGO_PROFILES, cargo_rows, make_cargo, make_fleet
+
+FLEET_SIZES = [10, 100, 1000, 10000]
+PROFILES = list(CARGO_PROFILES) + ["mixed"]
+
+
+def _time(fn, repeat, number=1):
+    # Median / p90 / min wall time of one call in microseconds.
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    samples.sort()
+    return {
+        "median_us": round(statistics.median(samples), 2),
+        "p90_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.9))], 2),
+        "min_us": round(samples[0], 2),
+        "repeat": repeat,
+    }
+
+
+def _environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    import altair
+    import pandas
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pandas.__version__,
+        "altair": altair.__version__,
+    }
+
+
+def _lines_for(size, lines):
+    # Keep the (cargo x vehicle) work per measurement roughly constant across fleet sizes.
+    return max(10, min(lines, lines * 100 // size))
+
+
+def bench_engine(fleet_sizes, lines, repeat, seed):
+    out = []
+    for size in fleet_sizes:
+        fleet = make_fleet(size, seed)
+        n = _lines_for(size, lines)
+        for profile in PROFILES:
+            cargo = make_cargo(n, profile, seed)
+            rows = cargo_rows(cargo)
+            scalar = _time(lambda: [compute_best_vehicle(*r, vehicles=fleet) for r in rows], repeat)
+            batch = _time(lambda: evaluate_batch(**cargo, vehicles=fleet), repeat)
+            plans = [plan_vehicles(*r[:5], r[6], r[7], vehicles=fleet) for r in rows]
+            costing = _time(lambda: [cost_plans(p, r[3], r[4], r[5], vehicles=fleet) for p, r in zip(plans, rows)], repeat)
+            for stats in (scalar, batch, costing):
+                for k in ("median_us", "p90_us", "min_us"):
+                    stats[k] = round(stats[k] / n, 3)
+            out.append({"stage": "compute_best_vehicle", "fleet_size": size, "profile": profile, "per_line": scalar})
+            out.append({"stage": "evaluate_batch", "fleet_size": size, "profile": profile, "per_line": batch})
+            out.append({"stage": "cost_plans", "fleet_size": size, "profile": profile, "per_line": costing})
+    return out
+
+
+def bench_odc(lines, repeat, seed):
+    out = []
+    for profile in PROFILES:
+        rows = cargo_rows(make_cargo(lines, profile, seed))
+        stats = _time(lambda: [check_odc(r[0], r[1], r[2], r[3]) for r in rows], repeat)
+        for k in ("median_us", "p90_us", "min_us"):
+            stats[k] = round(stats[k] / lines, 3)
+        out.append({"stage": "check_odc", "profile": profile, "per_line": stats})
+    return out
+
+
+def bench_axles(lines, repeat, seed):
+    # Axle geometry is keyed by vehicle name, so this runs over the built-in fleet
+    out = []
+    for profile in PROFILES:
+        rows = cargo_rows(make_cargo(lines, profile, seed))
+        for stage, axles in (("plan_vehicles", None), ("plan_vehicles_axles", axle_geometry)):
+            stats = _time(lambda: [plan_vehicles(*r[:5], r[6], r[7], axles=axles) for r in rows], repeat)
+            for k in ("median_us", "p90_us", "min_us"):
+                stats[k] = round(stats[k] / lines, 3)
+            out.append({"stage": stage, "profile": profile, "per_line": stats})
+    return out
+
+
+def bench_rendering(fleet_sizes, repeat, seed):
+    import altair as alt
+
+    out = []
+    for size in fleet_sizes:
+        fleet = make_fleet(size, seed)
+        # A mid-sized skid that most vehicles can carry, so the result set grows with the fleet
+        results = compute_best_vehicle(1.2, 1.0, 1.0, 500, 40, 800, True, "Standard Steel Fabrication", vehicles=fleet)
+        df = results_frame(results)
+        out.append({"stage": "dataframe", "fleet_size": size, "rows": len(results),
+                    "per_call": _time(lambda: results_frame(results), repeat)})
+        out.append({"stage": "styler", "fleet_size": size, "rows": len(results),
+                    "per_call": _time(lambda: df.style.highlight_min(subset=["total_cost"], color="lightgreen", axis=0).to_html(), max(3, repeat // 3))})
+        # Altair refuses more than 5000 rows by default; lift the limit to measure the real cost
+        with alt.data_transformers.disable_max_rows():
+            out.append({"stage": "altair_spec", "fleet_size": size, "rows": len(results),
+                        "per_call": _time(lambda: cost_chart(df).to_dict(), repeat)})
+        # What the app sends now: one sorted Arrow page and a top-k chart, bounded whatever the fleet size
+        out.append({"stage": "arrow_page", "fleet_size": size, "rows": len(results),
+                    "per_call": _time(lambda: sort_page(results_table(results), "num_trucks", True, 1)[0].nbytes, repeat)})
+        out.append({"stage": "chart_top_k", "fleet_size": size, "rows": len(chart_rows(results)),
+                    "per_call": _time(lambda: cost_chart(results_frame(chart_rows(results))).to_dict(), repeat)})
+        # The frontier over the whole fleet and its chart
+        frontier = compute_pareto_front(1.2, 1.0, 1.0, 500, 40, 800, True, "Standard Steel Fabrication", vehicles=fleet)
+        out.append({"stage": "pareto_front", "fleet_size": size, "rows": len(frontier),
+                    "per_call": _time(lambda: frontier_chart(results_frame(compute_pareto_front(
+                        1.2, 1.0, 1.0, 500, 40, 800, True, "Standard Steel Fabrication", vehicles=fleet))).to_dict(), repeat)})
+    return out
+
+
+def run(args):
+    fleet_sizes = [s for s in FLEET_SIZES if s <= args.max_fleet]
+    report = {
+        "environment": _environment(),
+        "config": {"lines": args.lines, "repeat": args.repeat, "seed": args.seed, "fleet_sizes": fleet_sizes},
+        "results": (
+            bench_engine(fleet_sizes, args.lines, args.repeat, args.seed)
+            + bench_odc(args.lines, args.repeat, args.seed)
+            + bench_axles(args.lines, args.repeat, args.seed)
+            + bench_rendering(fleet_sizes, args.repeat, args.seed)
+        ),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def _key(row):
+    return (row["stage"], row.get("fleet_size"), row.get("profile"))
+
+
+def compare(before_path, after_path, threshold):
+    with open(before_path) as f:
+        before = {_key(r): r for r in json.load(f)["results"]}
+    with open(after_path) as f:
+        after = {_key(r): r for r in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"{'stage':22s} {'fleet':>6s} {'profile':16s} {'before':>12s} {'after':>12s} {'ratio':>7s}")
+    for key in sorted(set(before) & set(after), key=str):
+        b = (before[key].get("per_line") or before[key].get("per_call"))["median_us"]
+        a = (after[key].get("per_line") or after[key].get("per_call"))["median_us"]
+        ratio = a / b if b else float("inf")
+        flag = "  <-- regression" if ratio > 1 + threshold else ""
+        regressions += bool(flag)
+        stage, fleet, profile = key
+        print(f"{stage:22s} {fleet or '':>6} {profile or '':16s} {b:10.2f}us {a:10.2f}us {ratio:6.2f}x{flag}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=200, help="cargo lines per engine measurement")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-fleet", type=int, default=10000, help="largest synthetic fleet size to include")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two JSON reports")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown flagged by --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Synthetic cargo and fleet generators shared by the benchmarks.
+
+Everything is drawn from a seeded NumPy generator, so a given (size, seed)
+produces the same data on every machine.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vehicle_selector import vehicle_types
+
+CARGO_TYPES = [
+    "Standard Steel Fabrication", "Precision Instrument", "Glass Equipment",
+    "Control Panel", "Pipeline", "Rotating Machinery", "Fragile Custom Assembly"
+]
+
+# (length, width, height, weight) ranges in m / kg per cargo profile
+CARGO_PROFILES = {
+    "small_parts": ((0.2, 1.0), (0.2, 0.8), (0.2, 0.8), (5, 150)),
+    "skids": ((1.0, 3.0), (0.8, 1.5), (0.8, 2.2), (300, 3000)),
+    "heavy_equipment": ((3.0, 11.5), (1.5, 2.5), (1.5, 3.0), (3000, 25000)),
+    "odc_modules": ((10.0, 28.0), (2.5, 4.8), (3.0, 5.2), (30000, 300000)),
+}
+
+
+def make_cargo(n, profile="mixed", seed=0):
+    # Returns a dict of per-line arrays accepted by the batch engine (and zip-able for the scalar one).
+    rng = np.random.default_rng(seed)
+    names = list(CARGO_PROFILES) if profile == "mixed" else [profile]
+    picks = rng.integers(0, len(names), n)
+    lo = np.array([[CARGO_PROFILES[p][k][0] for k in range(4)] for p in names])[picks]
+    hi = np.array([[CARGO_PROFILES[p][k][1] for k in range(4)] for p in names])[picks]
+    dims = rng.uniform(lo, hi)
+    return {
+        "lengths": np.round(dims[:, 0], 2),
+        "widths": np.round(dims[:, 1], 2),
+        "heights": np.round(dims[:, 2], 2),
+        "weights": np.round(dims[:, 3], 1),
+        "quantities": rng.integers(1, 200, n),
+        "distance_km": rng.integers(50, 3000, n),
+        "allow_stacking": rng.random(n) < 0.5,
+        "cargo_types": rng.choice(CARGO_TYPES, n),
+    }
+
+
+def make_manifest(n, seed=0):
+    # Uniform mix used by bench_batch.py (kept for comparable numbers across commits).
+    rng = np.random.default_rng(seed)
+    return {
+        "lengths": np.round(rng.uniform(0.3, 14.0, n), 2),
+        "widths": np.round(rng.uniform(0.3, 3.2, n), 2),
+        "heights": np.round(rng.uniform(0.3, 3.8, n), 2),
+        "weights": np.round(rng.uniform(5, 45000, n), 1),
+        "quantities": rng.integers(1, 200, n),
+        "distance_km": rng.integers(50, 3000, n),
+        "allow_stacking": rng.random(n) < 0.5,
+        "cargo_types": rng.choice(CARGO_TYPES, n),
+    }
+
+
+def cargo_rows(cargo):
+    # Scalar-call arguments, one tuple per line, as plain Python values.
+    return list(zip(
+        cargo["lengths"].tolist(), cargo["widths"].tolist(), cargo["heights"].tolist(),
+        cargo["weights"].tolist(), cargo["quantities"].tolist(), cargo["distance_km"].tolist(),
+        cargo["allow_stacking"].tolist(), cargo["cargo_types"].tolist()
+    ))
+
+
+def make_fleet(n, seed=0):
+    # n vendor vehicles jittered around the built-in vehicle types (first len(vehicle_types) are the originals).
+    if n <= len(vehicle_types):
+        return [dict(v) for v in vehicle_types[:n]]
+    rng = np.random.default_rng(seed)
+    fleet = [dict(v) for v in vehicle_types]
+    templates = rng.integers(0, len(vehicle_types), n - len(fleet))
+    jitter = rng.uniform(0.85, 1.15, (len(templates), 6))
+    for i, (t, j) in enumerate(zip(templates.tolist(), jitter.tolist())):
+        base = vehicle_types[t]
+        fleet.append({
+            "name": f"{base['name']} #{i:05d}",
+            "max_length": round(base["max_length"] * j[0], 2),
+            "max_width": round(base["max_width"] * j[1], 2),
+            "max_height": round(base["max_height"] * j[2], 2),
+            "max_weight": round(base["max_weight"] * j[3], -1),
+            "cost_per_km": round(base["cost_per_km"] * j[4], 1),
+            "cost_per_tkm": round(base["cost_per_tkm"] * j[5], 2),
+            "has_sidewalls": base["has_sidewalls"],
+        })
+    return fleet
+
+
+def make_road_network(n_nodes, degree=4, seed=0):
+    # Towns scattered over a 1,500 km square with roads to their nearest neighbours.
+    # Returns (edges, coordinates) for vehicle_selector.road_graph.RoadGraph; about 10% of
+    # roads carry a height, width or weight restriction (bridges, underpasses).
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(15.0, 28.5, n_nodes)
+    lon = rng.uniform(70.0, 84.0, n_nodes)
+    names = [f"N{i:05d}" for i in range(n_nodes)]
+    coordinates = dict(zip(names, zip(lat.tolist(), lon.tolist())))
+
+    # Neighbours in a flat approximation (fine for picking nearby towns)
+    xy = np.column_stack([lat * 111.0, lon * 111.0 * np.cos(np.radians(lat))])
+    edges = []
+    seen = set()
+    for start in range(0, n_nodes, 512):
+        block = xy[start:start + 512]
+        d = np.sqrt(((block[:, None, :] - xy[None, :, :]) ** 2).sum(axis=2))
+        near = np.argsort(d, axis=1)[:, 1:degree + 1]
+        for i, row in enumerate(near.tolist(), start=start):
+            for j in row:
+                pair = (min(i, j), max(i, j))
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                # Road length: great-circle distance plus 15-40% for curves
+                la1, lo1, la2, lo2 = np.radians([lat[i], lon[i], lat[j], lon[j]])
+                h = np.sin((la2 - la1) / 2) ** 2 + np.cos(la1) * np.cos(la2) * np.sin((lo2 - lo1) / 2) ** 2
+                crow = 2 * 6371.0 * np.arcsin(np.sqrt(h))
+                edges.append({"from": names[i], "to": names[j], "distance_km": round(float(crow) * rng.uniform(1.15, 1.4), 1)})
+
+    kinds = rng.random(len(edges))
+    for e, kind in zip(edges, kinds.tolist()):
+        if kind < 0.05:
+            e["max_height"] = float(rng.choice([3.8, 4.2, 4.5, 4.75]))
+        elif kind < 0.08:
+            e["max_width"] = float(rng.choice([3.0, 3.5, 4.0]))
+        elif kind < 0.10:
+            e["max_weight"] = float(rng.choice([20000, 40000, 80000, 150000]))
+    return edges, coordinates
+
+
+def make_sites(n_sites, seed=0, area_km=400.0):
+    # Yard plus n project sites in a square; returns (sites, distances) for multi_drop.plan_multi_drop.
+    # Road distances are 1.25x straight-line; each site gets 1-3 cargo lines of skids to heavy parts.
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, area_km, (n_sites + 1, 2))
+    distances = np.round(np.sqrt(((points[:, None] - points[None]) ** 2).sum(axis=2)) * 1.25, 1)
+    sites = []
+    for i in range(n_sites):
+        items = [{
+            "length": round(float(rng.uniform(0.5, 6.0)), 2),
+            "width": round(float(rng.uniform(0.5, 2.2)), 2),
+            "height": round(float(rng.uniform(0.4, 2.0)), 2),
+            "weight": round(float(rng.uniform(50, 3000)), 1),
+            "quantity": int(rng.integers(1, 6)),
+        } for _ in range(int(rng.integers(1, 4)))]
+        sites.append({"name": f"Site {i + 1:03d}", "items": items})
+    return sites, distances.tolist()
+
+
+CITIES = ["Mumbai", "Delhi", "Chennai", "Kolkata", "Pune", "Ahmedabad", "Hyderabad", "Bengaluru", "Vadodara", "Jamnagar",
+          "Nagpur", "Visakhapatnam", "Kandla", "Raipur", "Indore", "Ludhiana"]
+
+
+def make_rate_cards(directory, n_transporters=24, weeks=4, lanes=40, seed=0, start="2026-01-05"):
+    # Weekly transporter rate cards in three layouts (long CSV, lane-column CSV with classes and
+    # dd/mm/yyyy dates, Excel with a title block), one file per transporter per week, for
+    # vehicle_selector.rate_cards.ingest_rate_cards. Returns the (origin, destination) lanes used.
+    import datetime
+
+    import pandas as pd
+
+    from vehicle_selector.engine import classify_vehicle
+
+    rng = np.random.default_rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    pairs = [(a, b) for a in CITIES for b in CITIES if a != b]
+    lane_list = [pairs[i] for i in rng.choice(len(pairs), min(lanes, len(pairs)), replace=False).tolist()]
+    first = datetime.date.fromisoformat(start)
+    for t in range(n_transporters):
+        name = f"Transporter {t + 1:02d}"
+        served = [lane_list[i] for i in rng.choice(len(lane_list), max(1, len(lane_list) // 3), replace=False).tolist()]
+        for week in range(weeks):
+            valid_from = first + datetime.timedelta(days=7 * week)
+            valid_to = valid_from + datetime.timedelta(days=6)
+            rows = []
+            for origin, destination in served:
+                for v in vehicle_types:
+                    if rng.random() < 0.3:
+                        continue
+                    j = rng.uniform(0.8, 1.2, 2)
+                    rows.append((v["name"], origin, destination, round(v["cost_per_km"] * j[0], 1), round(v["cost_per_tkm"] * j[1], 2)))
+            layout = t % 3
+            path = os.path.join(directory, f"{name.replace(' ', '_').lower()}_w{week + 1:02d}")
+            if layout == 0:
+                pd.DataFrame([{"transporter": name, "vehicle_type": v, "origin": o, "destination": d, "rate_per_km": km,
+                               "rate_per_tkm": tkm, "valid_from": valid_from.isoformat(), "valid_to": valid_to.isoformat()}
+                              for v, o, d, km, tkm in rows]).to_csv(path + ".csv", index=False)
+            elif layout == 1:
+                # Quoted per vehicle class, transporter taken from the file name
+                pd.DataFrame([{"Vehicle": classify_vehicle(v).split(" ", 1)[1] if k % 2 else v, "Lane": f"{o} - {d}",
+                               "₹/km": km, "₹/tkm": tkm, "Effective From": valid_from.strftime("%d/%m/%Y"),
+                               "Valid Till": valid_to.strftime("%d/%m/%Y")}
+                              for k, (v, o, d, km, tkm) in enumerate(rows)]).to_csv(path + ".csv", index=False)
+            else:
+                frame = pd.DataFrame([{"Truck Type": v, "From": o, "To": d, "Per KM": km, "Per TKM": tkm, "WEF": valid_from,
+                                       "Expiry": valid_to} for v, o, d, km, tkm in rows])
+                with pd.ExcelWriter(path + ".xlsx") as writer:
+                    pd.DataFrame([[f"{name} - rate card"], [f"Week {week + 1}"]]).to_excel(writer, header=False, index=False)
+                    frame.to_excel(writer, startrow=3, index=False)
+    return lane_list
@@ -0,0 +1,45 @@
+# ----------------------------
+# Artson vehicle selector – core package
+# ----------------------------
+#
+# Importing the package only loads the pure-Python engine and catalog.
+# NumPy (batch, odc_rules, sweep), pandas/openpyxl (manifest) and pandas/altair (presentation)
+# are imported on first use of those modules.
+
+from .catalog import CATALOG_VERSION, ODC_LIMITS, fragile_items, vehicle_types
+from .engine import (
+    check_odc,
+    classify_vehicle,
+    compute_best_fleet,
+    compute_best_vehicle,
+    compute_best_vehicle_mixed,
+)
+
+_LAZY = {
+    "evaluate_batch": "batch",
+    "compute_best_vehicle_batch": "batch",
+    "best_vehicle_batch": "batch",
+    "build_recommendation": "presentation",
+    "sweep_grid": "sweep",
+    "RuleTable": "odc_rules",
+}
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+
+        return getattr(import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = [
+    "CATALOG_VERSION",
+    "ODC_LIMITS",
+    "fragile_items",
+    "vehicle_types",
+    "check_odc",
+    "classify_vehicle",
+    "compute_best_fleet",
+    "compute_best_vehicle",
+    "compute_best_vehicle_mixed",
+    *_LAZY,
+]
@@ -0,0 +1,128 @@
+from .packing import EPS, unit_boxes
+
+# ----------------------------
+# Axle loads and centre of gravity
+# ----------------------------
+#
+# For low beds and modular trailers the binding limit is usually the load on
+# each axle group and where the CG sits, not max_weight. Each vehicle with an
+# entry in the catalog's axle geometry (catalog.AXLE_COLUMNS) is modelled as a
+# deck on two supports, the kingpin / front group and the rear bogie. The
+# payload splits between them by the lever rule:
+#
+#   rear share  = payload × (cg_x - front_axle_m) / (rear_axle_m - front_axle_m)
+#   front share = payload - rear share
+#
+# A load passes when both supports (tare + share) are within their limits,
+# the CG lies between the supports, the CG is no higher than max_cg_height_m
+# above the ground, and it is no further than max_lateral_offset_m from the
+# centreline. As a loader would, the whole load may first be slid along and
+# across the deck, as far as its footprint allows, towards the balance point.
+#
+# Everything is NumPy over the units. prefix=True checks "the first k units"
+# for every k in one pass of cumulative sums. That is how the interactive path
+# finds how many identical units one truck may carry (max_units_balanced): the
+# largest k whose full load and whose remainder load on the last truck pass.
+
+def _balance_point(vehicle, geometry):
+    # Deck position where the payload CG splits the load in proportion to each support's spare capacity
+    front, rear = geometry["front_axle_m"], geometry["rear_axle_m"]
+    spare_front = max(0.0, geometry["front_limit_kg"] - geometry["front_tare_kg"])
+    spare_rear = max(0.0, geometry["rear_limit_kg"] - geometry["rear_tare_kg"])
+    share = spare_rear / (spare_front + spare_rear) if spare_front + spare_rear > 0 else 0.5
+    return min(max(front + share * (rear - front), 0.0), vehicle["max_length"])
+
+def _limit(geometry, key):
+    value = geometry.get(key)
+    return float("inf") if value is None or value != value or value == "" else float(value)
+
+def balance_loads(boxes, weights, vehicle, geometry, prefix=False):
+    # boxes: (n, 6) unit boxes on the deck; weights: per unit (or one weight for all).
+    # Returns arrays (one entry, or one per prefix of the units) of payload, axle loads, CG and "ok".
+    import numpy as np
+
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 6)
+    weights = np.broadcast_to(np.asarray(weights, dtype=float), (len(boxes),))
+    total, low, high = np.cumsum, np.minimum.accumulate, np.maximum.accumulate
+    L, W = vehicle["max_length"], vehicle["max_width"]
+    front, rear = geometry["front_axle_m"], geometry["rear_axle_m"]
+    payload = total(weights)
+    safe = np.where(payload > 0, payload, 1.0)
+    cg_x = total(weights * (boxes[:, 0] + boxes[:, 3]) / 2) / safe
+    cg_y = total(weights * (boxes[:, 1] + boxes[:, 4]) / 2) / safe
+    cg_z = total(weights * (boxes[:, 2] + boxes[:, 5]) / 2) / safe
+
+    # Slide the load towards the balance point and the centreline, within the deck
+    cg_x = cg_x + np.clip(_balance_point(vehicle, geometry) - cg_x, -low(boxes[:, 0]), L - high(boxes[:, 3]))
+    cg_y = cg_y + np.clip(W / 2 - cg_y, -low(boxes[:, 1]), W - high(boxes[:, 4]))
+
+    rear_share = payload * (cg_x - front) / (rear - front)
+    front_kg = geometry["front_tare_kg"] + payload - rear_share
+    rear_kg = geometry["rear_tare_kg"] + rear_share
+    cg_height = geometry.get("deck_height_m", 0.0) + cg_z
+    lateral = np.abs(cg_y - W / 2)
+    ok = ((front_kg <= geometry["front_limit_kg"] + EPS) & (rear_kg <= geometry["rear_limit_kg"] + EPS)
+          & (cg_x >= front - EPS) & (cg_x <= rear + EPS)
+          & (cg_height <= _limit(geometry, "max_cg_height_m") + EPS) & (lateral <= _limit(geometry, "max_lateral_offset_m") + EPS))
+    loads = {"payload_kg": payload, "front_axle_kg": front_kg, "rear_axle_kg": rear_kg, "cg_x": cg_x,
+             "cg_lateral_offset": lateral, "cg_height": cg_height, "ok": ok}
+    return loads if prefix else {k: v[-1:] for k, v in loads.items()}
+
+def _loading_order(length, width, height, vehicle, geometry, allow_stacking, allow_tipping=False):
+    # Unit boxes in loading order: from the balance point outwards, bottom layer first
+    import numpy as np
+
+    boxes = unit_boxes(length, width, height, vehicle, allow_stacking, allow_tipping)
+    centre_x = (boxes[:, 0] + boxes[:, 3]) / 2
+    centre_y = (boxes[:, 1] + boxes[:, 4]) / 2
+    order = np.lexsort((np.abs(centre_y - vehicle["max_width"] / 2), boxes[:, 2],
+                        np.round(np.abs(centre_x - _balance_point(vehicle, geometry)), 3)))
+    return boxes[order]
+
+def _legal_counts(ok, quantity, limit):
+    # ok[k-1]: the first k units pass. A truck may carry k units when its full load and the
+    # remainder on the last of ceil(quantity / k) trucks both pass (k <= limit). quantity and
+    # limit may be (n, 1) columns, giving one row of counts per quantity.
+    import numpy as np
+
+    k = np.arange(1, len(ok) + 1)
+    remainder = quantity - (np.ceil(quantity / k) - 1) * k
+    return ok & ok[np.clip(remainder.astype(np.int64), 1, len(ok)) - 1] & (k <= limit)
+
+def max_units_balanced(length, width, height, weight, vehicle, geometry, allow_stacking, allow_tipping=False, limit=None,
+                       quantity=None):
+    # Most identical units one truck may carry within its axle and CG limits (at most `limit`);
+    # returns (units, balance_loads at that count). With quantity, the part-load on the last
+    # truck must pass as well.
+    import numpy as np
+
+    boxes = _loading_order(length, width, height, vehicle, geometry, allow_stacking, allow_tipping)[:limit or None]
+    if not len(boxes):
+        return 0, None
+    loads = balance_loads(boxes, weight, vehicle, geometry, prefix=True)
+    passing = np.flatnonzero(_legal_counts(loads["ok"], quantity or len(boxes), len(boxes)))
+    if not len(passing):
+        return 0, None
+    units = int(passing[-1]) + 1
+    return units, {key: v[units - 1].item() for key, v in loads.items()}
+
+def balanced_units(length, width, height, weight, vehicle, geometry, allow_stacking, quantities, limits, allow_tipping=False):
+    # max_units_balanced for many quantities at once (limits: units per truck before the axle
+    # check, one per quantity); 0 where no load passes
+    import numpy as np
+
+    quantities = np.asarray(quantities, dtype=float)
+    boxes = _loading_order(length, width, height, vehicle, geometry, allow_stacking, allow_tipping)
+    if not len(boxes):
+        return np.zeros(len(quantities), dtype=np.int64)
+    ok = balance_loads(boxes, weight, vehicle, geometry, prefix=True)["ok"]
+    legal = _legal_counts(ok, quantities[:, None], np.asarray(limits)[:, None])
+    return np.where(legal.any(axis=1), len(ok) - np.argmax(legal[:, ::-1], axis=1), 0)
+
+def check_load(load, skus, vehicle, geometry):
+    # One pack_shipment load (placements of several SKUs) -> balance_loads as scalars
+    import numpy as np
+
+    placements = np.asarray(load["placements"], dtype=float)
+    weights = np.array([skus[int(i)]["weight"] for i in placements[:, 0]])
+    return {k: v[0].item() for k, v in balance_loads(placements[:, 1:], weights, vehicle, geometry).items()}
@@ -0,0 +1,147 @@
+import numpy as np
+
+from .catalog import fragile_items, vehicle_types
+from .engine import classify_vehicle
+from .packing import units_per_vehicle_array
+
+# ----------------------------
+# Batch engine (whole manifests)
+# ----------------------------
+
+def _vehicle_arrays(vehicles):
+    if hasattr(vehicles, "columns"):
+        return vehicles.columns
+    return {
+        "max_length": np.array([v["max_length"] for v in vehicles], dtype=float),
+        "max_width": np.array([v["max_width"] for v in vehicles], dtype=float),
+        "max_height": np.array([v["max_height"] for v in vehicles], dtype=float),
+        "max_weight": np.array([v["max_weight"] for v in vehicles], dtype=float),
+        "cost_per_km": np.array([v["cost_per_km"] for v in vehicles], dtype=float),
+        "cost_per_tkm": np.array([v["cost_per_tkm"] for v in vehicles], dtype=float),
+        "has_sidewalls": np.array([v["has_sidewalls"] for v in vehicles], dtype=bool),
+    }
+
+def _axle_units(l, w, h, wt, qty, stack, feasible, max_units, vehicles, axles):
+    # Holds vehicles with axle geometry to their axle-load and CG limits, as plan_vehicles does.
+    # Lines with the same cargo share one balanced_units pass over their quantities.
+    from .axle_load import balanced_units
+
+    names = vehicles.names if hasattr(vehicles, "names") else [v["name"] for v in vehicles]
+    spec = vehicles.vehicle if hasattr(vehicles, "vehicle") else vehicles.__getitem__
+    limited = np.zeros(feasible.shape, dtype=bool)
+    cargo = np.column_stack([a[:, 0] for a in np.broadcast_arrays(l, w, h, wt, stack)])
+    for j, name in enumerate(names):
+        geometry = axles.get(name)
+        if geometry is None:
+            continue
+        rows = np.flatnonzero(feasible[:, j])
+        if not len(rows):
+            continue
+        vehicle = spec(j)
+        quantity = qty[rows, 0]
+        wanted = np.minimum(max_units[rows, j], quantity)
+        groups, inverse = np.unique(cargo[rows], axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        for g, (gl, gw, gh, gwt, gstack) in enumerate(groups.tolist()):
+            members = inverse == g
+            units = balanced_units(gl, gw, gh, gwt, vehicle, geometry, bool(gstack), quantity[members], wanted[members])
+            short = units < wanted[members]
+            feasible[rows[members], j] = units > 0
+            limited[rows[members], j] = short
+            max_units[rows[members], j] = np.where(short, np.maximum(units, 1), max_units[rows[members], j])
+    return limited
+
+def evaluate_batch(lengths, widths, heights, weights, quantities, distance_km, allow_stacking, cargo_types, vehicles=None, fragile=None,
+                   axles=None):
+    # Same maths as compute_best_vehicle, broadcast over a (cargo x vehicle) matrix.
+    # distance_km, allow_stacking and cargo_types may be scalars or one value per line.
+    # A FleetCatalog is evaluated column-wise over all its vehicles, dominated ones included.
+    # axles (vehicle name -> axle geometry) applies per-axle load and CG limits as well.
+    l = np.asarray(lengths, dtype=float)[:, None]
+    w = np.asarray(widths, dtype=float)[:, None]
+    h = np.asarray(heights, dtype=float)[:, None]
+    wt = np.asarray(weights, dtype=float)[:, None]
+    qty = np.asarray(quantities, dtype=float)[:, None]
+    n = l.shape[0]
+    dist = np.broadcast_to(np.asarray(distance_km, dtype=float), (n,))[:, None]
+    stack = np.broadcast_to(np.asarray(allow_stacking, dtype=bool), (n,))[:, None]
+    fragile = list(fragile if fragile is not None else fragile_items)
+    fragile = np.isin(np.broadcast_to(np.asarray(cargo_types, dtype=object), (n,)), fragile)[:, None]
+
+    vehicles = vehicles if vehicles is not None else vehicle_types
+    v = _vehicle_arrays(vehicles)
+
+    max_units_vol = units_per_vehicle_array(l, w, h, v["max_length"], v["max_width"], v["max_height"], stack)
+
+    feasible = ~(fragile & ~v["has_sidewalls"])
+    feasible &= (max_units_vol > 0) & (wt <= v["max_weight"])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        max_units_wt = np.where(wt > 0, np.floor(v["max_weight"] / wt), qty)
+
+        max_units = np.maximum(1, np.minimum(max_units_vol, max_units_wt))
+        axle_limited = _axle_units(l, w, h, wt, qty, stack, feasible, max_units, vehicles, axles) if axles else None
+        trucks_needed = np.ceil(qty / max_units)
+        avg_weight_per_truck_tonnes = (wt * qty / trucks_needed) / 1000
+
+        total_cost = trucks_needed * (
+            v["cost_per_km"] * dist +
+            v["cost_per_tkm"] * avg_weight_per_truck_tonnes * dist
+        )
+
+    return {
+        "feasible": feasible,
+        "num_trucks": trucks_needed.astype(np.int64),
+        "max_units_per_truck": max_units.astype(np.int64),
+        "total_cost": total_cost,
+        "axle_limited": axle_limited,
+    }
+
+def compute_best_vehicle_batch(lengths, widths, heights, weights, quantities, distance_km, allow_stacking, cargo_types, vehicles=None, fragile=None,
+                               axles=None):
+    # Ranked option lists per cargo line, identical to calling compute_best_vehicle on each line
+    # (with axles, options the axle limits cut down are flagged axle_limited, as there).
+    batch = evaluate_batch(lengths, widths, heights, weights, quantities, distance_km, allow_stacking, cargo_types, vehicles, fragile, axles)
+    vehicles = vehicles if vehicles is not None else vehicle_types
+    names = vehicles.names if hasattr(vehicles, "names") else [v["name"] for v in vehicles]
+    classes = [classify_vehicle(name) for name in names]
+
+    feasible = batch["feasible"].tolist()
+    num_trucks = batch["num_trucks"].tolist()
+    max_units = batch["max_units_per_truck"].tolist()
+    total_cost = batch["total_cost"].tolist()
+    limited = batch["axle_limited"].tolist() if batch["axle_limited"] is not None else None
+
+    ranked = []
+    for row in range(len(feasible)):
+        results = []
+        for j, ok in enumerate(feasible[row]):
+            if not ok:
+                continue
+            option = {
+                "vehicle": names[j],
+                "class": classes[j],
+                "num_trucks": num_trucks[row][j],
+                "total_cost": round(total_cost[row][j], 2),
+                "max_units_per_truck": max_units[row][j]
+            }
+            if limited is not None and limited[row][j]:
+                option["axle_limited"] = True
+            results.append(option)
+        ranked.append(sorted(results, key=lambda x: x["total_cost"]))
+    return ranked
+
+def best_vehicle_batch(lengths, widths, heights, weights, quantities, distance_km, allow_stacking, cargo_types, vehicles=None, fragile=None,
+                       axles=None):
+    # Cheapest option per cargo line as arrays; vehicle index is -1 where nothing fits.
+    batch = evaluate_batch(lengths, widths, heights, weights, quantities, distance_km, allow_stacking, cargo_types, vehicles, fragile, axles)
+    cost = np.where(batch["feasible"], np.round(batch["total_cost"], 2), np.inf)
+    best = np.argmin(cost, axis=1)
+    rows = np.arange(cost.shape[0])
+    found = batch["feasible"].any(axis=1)
+    return {
+        "vehicle_index": np.where(found, best, -1),
+        "num_trucks": np.where(found, batch["num_trucks"][rows, best], 0),
+        "total_cost": np.where(found, cost[rows, best], np.nan),
+        "max_units_per_truck": np.where(found, batch["max_units_per_truck"][rows, best], 0),
+    }
@@ -0,0 +1,68 @@
+import hashlib
+import json
+
+# ----------------------------
+# Vehicle master data
+# ----------------------------
+
+vehicle_types = [
+    {"name": "LCV Truck", "max_length": 4.2, "max_width": 2.0, "max_height": 2.2, "max_weight": 3000, "cost_per_km": 18, "cost_per_tkm": 5.5, "has_sidewalls": True},
+    {"name": "DCM Truck (7 Ton)", "max_length": 5.5, "max_width": 2.2, "max_height": 2.4, "max_weight": 7000, "cost_per_km": 24, "cost_per_tkm": 5.2, "has_sidewalls": True},
+    {"name": "14 ft Truck", "max_length": 6, "max_width": 2.5, "max_height": 2.5, "max_weight": 10000, "cost_per_km": 28, "cost_per_tkm": 5, "has_sidewalls": True},
+    {"name": "22 ft Truck", "max_length": 12, "max_width": 2.6, "max_height": 3, "max_weight": 20000, "cost_per_km": 38, "cost_per_tkm": 4.3, "has_sidewalls": True},
+    {"name": "Flatbed Trailer (40 ft)", "max_length": 18, "max_width": 2.6, "max_height": 3.5, "max_weight": 30000, "cost_per_km": 55, "cost_per_tkm": 3.8, "has_sidewalls": False},
+    {"name": "Flatbed Trailer (60 ft)", "max_length": 25, "max_width": 2.6, "max_height": 3.5, "max_weight": 35000, "cost_per_km": 65, "cost_per_tkm": 3.5, "has_sidewalls": False},
+    {"name": "Semi Low Bed", "max_length": 18, "max_width": 3.0, "max_height": 3.5, "max_weight": 40000, "cost_per_km": 75, "cost_per_tkm": 3.2, "has_sidewalls": False},
+    {"name": "Low Bed Trailer", "max_length": 18, "max_width": 3.5, "max_height": 4.2, "max_weight": 80000, "cost_per_km": 90, "cost_per_tkm": 3, "has_sidewalls": False},
+    {"name": "Multi-Axle Modular Trailer", "max_length": 30, "max_width": 5.0, "max_height": 5.5, "max_weight": 500000, "cost_per_km": 180, "cost_per_tkm": 2.5, "has_sidewalls": False},
+    {"name": "Container Trailer (40 ft)", "max_length": 12.2, "max_width": 2.6, "max_height": 2.9, "max_weight": 28000, "cost_per_km": 42, "cost_per_tkm": 3.8, "has_sidewalls": True}
+]
+
+# vehicle_types = [
+#     {"name": "LCV Truck", "max_length": 4.2, "max_width": 2.0, "max_height": 2.2, "max_weight": 3000, "cost_per_km": 18, "cost_per_tkm": 5.5, "has_sidewalls": True},
+#     {"name": "14 ft Truck", "max_length": 6, "max_width": 2.5, "max_height": 2.5, "max_weight": 10000, "cost_per_km": 28, "cost_per_tkm": 5, "has_sidewalls": True},
+#     {"name": "22 ft Truck", "max_length": 12, "max_width": 2.6, "max_height": 3, "max_weight": 20000, "cost_per_km": 38, "cost_per_tkm": 4.3, "has_sidewalls": True},
+#     {"name": "Flatbed Trailer (40 ft)", "max_length": 18, "max_width": 2.6, "max_height": 3.5, "max_weight": 30000, "cost_per_km": 55, "cost_per_tkm": 3.8, "has_sidewalls": False},
+#     {"name": "Flatbed Trailer (60 ft)", "max_length": 25, "max_width": 2.6, "max_height": 3.5, "max_weight": 35000, "cost_per_km": 65, "cost_per_tkm": 3.5, "has_sidewalls": False},
+#     {"name": "Semi Low Bed", "max_length": 18, "max_width": 3.0, "max_height": 3.5, "max_weight": 40000, "cost_per_km": 75, "cost_per_tkm": 3.2, "has_sidewalls": False},
+#     {"name": "Low Bed Trailer", "max_length": 18, "max_width": 3.5, "max_height": 4.2, "max_weight": 80000, "cost_per_km": 90, "cost_per_tkm": 3, "has_sidewalls": False},
+#     {"name": "Multi-Axle Modular Trailer", "max_length": 30, "max_width": 5.0, "max_height": 5.5, "max_weight": 500000, "cost_per_km": 180, "cost_per_tkm": 2.5, "has_sidewalls": False},
+#     {"name": "Container Trailer (40 ft)", "max_length": 12.2, "max_width": 2.6, "max_height": 2.9, "max_weight": 28000, "cost_per_km": 42, "cost_per_tkm": 3.8, "has_sidewalls": True}
+# ]
+
+ODC_LIMITS = {"length": 12.0, "width": 2.6, "height": 3.8, "weight": 40000}  # weight in kg
+
+fragile_items = {
+    "Precision Instrument": "Bubble Wrap + Custom Crating",
+    "Glass Equipment": "Wooden Crate + Shock Absorbers",
+    "Control Panel": "Shrink Wrap + Cushioning",
+    "Rotating Machinery": "Custom Industrial Packing",
+    "Fragile Custom Assembly": "Bubble Wrap + Wooden Crate"
+}
+
+# Axle geometry for trailers whose real limit is per-axle load and CG position. Positions are metres
+# from the front of the deck (front = kingpin or front hydraulic group, rear = rear bogie centre);
+# loads are kg on each support, tare included. Vehicles without an entry only get the max_weight check.
+AXLE_COLUMNS = ["front_axle_m", "rear_axle_m", "front_tare_kg", "rear_tare_kg", "front_limit_kg", "rear_limit_kg",
+                "deck_height_m", "max_cg_height_m", "max_lateral_offset_m"]
+axle_geometry = {
+    "Flatbed Trailer (40 ft)": dict(zip(AXLE_COLUMNS, [1.0, 15.5, 5000, 5500, 21000, 24000, 1.5, 3.4, 0.1])),
+    "Flatbed Trailer (60 ft)": dict(zip(AXLE_COLUMNS, [1.0, 21.5, 6000, 7000, 24000, 27000, 1.5, 3.4, 0.1])),
+    "Semi Low Bed": dict(zip(AXLE_COLUMNS, [1.5, 14.5, 6000, 7000, 24000, 31000, 0.9, 3.0, 0.1])),
+    "Low Bed Trailer": dict(zip(AXLE_COLUMNS, [1.2, 15.0, 8000, 10000, 36000, 64000, 0.75, 3.3, 0.1])),
+    "Multi-Axle Modular Trailer": dict(zip(AXLE_COLUMNS, [7.5, 22.5, 30000, 30000, 290000, 290000, 1.1, 4.0, 0.15])),
+    "Container Trailer (40 ft)": dict(zip(AXLE_COLUMNS, [0.8, 10.5, 4500, 5000, 21000, 24000, 1.4, 3.0, 0.1])),
+}
+
+def catalog_version(*catalogs):
+    # Stable digest of the vehicle/rate/limit data the recommendation depends on.
+    blob = json.dumps(catalogs, sort_keys=True, default=str).encode()
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+CATALOG_VERSION = catalog_version(vehicle_types, ODC_LIMITS, fragile_items, axle_geometry)
+
+# Packing plans only depend on vehicle geometry, so rate edits keep them valid
+PACKING_VERSION = catalog_version(
+    [{k: v[k] for k in ("name", "max_length", "max_width", "max_height", "max_weight", "has_sidewalls")} for v in vehicle_types],
+    fragile_items, axle_geometry
+)
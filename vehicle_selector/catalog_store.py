@@ -0,0 +1,328 @@
+import csv
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from . import catalog as builtin
+from .catalog import catalog_version
+
+# ----------------------------
+# External fleet / rate catalog
+# ----------------------------
+#
+# A catalog source is either
+#   * a directory with vehicles.parquet or vehicles.csv, plus optional
+#     odc_limits.csv (limit,value), odc_rules.csv (rule_set,dimension,limit,severity),
+#     fragile_items.csv (cargo_type,packaging) and axle_geometry.csv (vehicle + catalog.AXLE_COLUMNS)
+#   * a SQLite file with tables vehicles, odc_limits, odc_rules, fragile_items and axle_geometry
+#
+# odc_limits is the national rule set; odc_rules adds per-state / per-route
+# limits and escort thresholds on top of it.
+#
+# Vehicle rows are read column by column straight into a FleetCatalog, so no
+# per-vehicle dicts are built. CatalogReloader notices edits with a cheap
+# stat() check, confirms them with a content hash and swaps in a new snapshot
+# in one reference assignment, so Streamlit workers pick up rate changes
+# without a restart.
+
+VEHICLE_COLUMNS = ["name", "max_length", "max_width", "max_height", "max_weight", "cost_per_km", "cost_per_tkm", "has_sidewalls"]
+RULE_COLUMNS = ["rule_set", "dimension", "limit", "severity"]
+TRUE_VALUES = {"true", "1", "yes", "y", "t"}
+
+class CatalogError(ValueError):
+    pass
+
+class CatalogSnapshot:
+    # Immutable view of one catalog version; hand the whole object to a request.
+    def __init__(self, vehicles, odc_limits, fragile_items, source=None, odc_rules=(), axle_geometry=None):
+        from .odc_rules import RuleTable
+
+        self.vehicles = vehicles
+        self.odc_limits = {k: float(v) for k, v in odc_limits.items()}
+        self.fragile_items = dict(fragile_items)
+        self.axle_geometry = {name: {k: None if v is None else float(v) for k, v in g.items()}
+                              for name, g in (builtin.axle_geometry if axle_geometry is None else axle_geometry).items()}
+        self.extra_rules = [{**r, "limit": float(r["limit"])} for r in odc_rules]
+        self.odc_rules = RuleTable.from_limits(self.odc_limits, extra_rules=self.extra_rules)
+        self.source = source
+        self.loaded_at = time.time()
+
+        rates = [vehicles.columns["cost_per_km"].tolist(), vehicles.columns["cost_per_tkm"].tolist()]
+        geometry = [vehicles.names] + [vehicles.columns[c].tolist() for c in ("max_length", "max_width", "max_height", "max_weight", "has_sidewalls")]
+        self.packing_version = catalog_version(geometry, self.fragile_items, self.axle_geometry)
+        self.version = catalog_version(self.packing_version, rates, self.odc_limits, self.extra_rules)
+
+def builtin_snapshot():
+    from .fleet_catalog import FleetCatalog
+
+    return CatalogSnapshot(FleetCatalog(builtin.vehicle_types), builtin.ODC_LIMITS, builtin.fragile_items, source="built-in",
+                           axle_geometry=builtin.axle_geometry)
+
+# ----------------------------
+# Loading
+# ----------------------------
+
+def _to_bool(values):
+    return [v if isinstance(v, bool) else str(v).strip().lower() in TRUE_VALUES for v in values]
+
+def _vehicle_columns_to_catalog(columns, source):
+    from .fleet_catalog import FleetCatalog
+
+    missing = [c for c in VEHICLE_COLUMNS if c not in columns]
+    if missing:
+        raise CatalogError(f"{source}: vehicles is missing column(s): {', '.join(missing)}")
+    try:
+        return FleetCatalog.from_columns(
+            [str(n) for n in columns["name"]],
+            {c: columns[c] for c in VEHICLE_COLUMNS[1:-1]},
+            _to_bool(columns["has_sidewalls"]),
+        )
+    except (TypeError, ValueError) as exc:
+        raise CatalogError(f"{source}: bad vehicle value ({exc})") from exc
+
+def _read_csv_columns(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader)]
+        columns = [[] for _ in header]
+        for row in reader:
+            if not row:
+                continue
+            for col, value in zip(columns, row):
+                col.append(value)
+    return dict(zip(header, columns))
+
+def _read_parquet_columns(path):
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path)
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        # Numeric columns go to NumPy without a Python object per cell
+        columns[name.lower()] = column.to_pylist() if name.lower() in ("name", "has_sidewalls") else column.to_numpy()
+    return columns
+
+def _read_rules(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return [{k.strip().lower(): (v or "").strip() for k, v in row.items()} for row in csv.DictReader(f)]
+
+def _checked_rules(rules, source):
+    from .odc_rules import DIMENSIONS
+
+    out = []
+    for i, r in enumerate(rules, start=1):
+        try:
+            if r["dimension"].lower() not in DIMENSIONS:
+                raise ValueError(f"unknown dimension {r['dimension']!r}")
+            out.append({"rule_set": r["rule_set"], "dimension": r["dimension"].lower(),
+                        "limit": float(r["limit"]), "severity": (r.get("severity") or "odc").lower()})
+        except (KeyError, TypeError, ValueError) as exc:
+            raise CatalogError(f"{source}: bad ODC rule {i} ({exc})") from exc
+    return out
+
+def _checked_limits(pairs, source):
+    out = {}
+    for name, value in pairs:
+        try:
+            out[str(name).lower()] = float(value)
+        except (TypeError, ValueError) as exc:
+            raise CatalogError(f"{source}: bad odc_limits value {name!r} ({exc})") from exc
+    return out
+
+def _read_pairs(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    return [(r[0].strip(), r[1].strip()) for r in rows[1:] if len(r) >= 2]
+
+def _checked_axles(rows, source):
+    from .catalog import AXLE_COLUMNS
+
+    out = {}
+    for i, r in enumerate(rows, start=1):
+        try:
+            # Blank CG limits mean "not checked"
+            out[r["vehicle"]] = {c: float(r[c]) if r.get(c) not in (None, "") else None for c in AXLE_COLUMNS}
+            if any(out[r["vehicle"]][c] is None for c in AXLE_COLUMNS[:6]):
+                raise ValueError("axle positions, tare and limits are required")
+        except (KeyError, TypeError, ValueError) as exc:
+            raise CatalogError(f"{source}: bad axle geometry {i} ({exc})") from exc
+    return out
+
+def _load_directory(path):
+    parquet = os.path.join(path, "vehicles.parquet")
+    csv_path = os.path.join(path, "vehicles.csv")
+    if os.path.exists(parquet):
+        columns = _read_parquet_columns(parquet)
+    elif os.path.exists(csv_path):
+        columns = _read_csv_columns(csv_path)
+    else:
+        raise CatalogError(f"{path}: no vehicles.parquet or vehicles.csv")
+    vehicles = _vehicle_columns_to_catalog(columns, path)
+
+    limits_path = os.path.join(path, "odc_limits.csv")
+    fragile_path = os.path.join(path, "fragile_items.csv")
+    limits = _checked_limits(_read_pairs(limits_path), limits_path) if os.path.exists(limits_path) else builtin.ODC_LIMITS
+    fragile = dict(_read_pairs(fragile_path)) if os.path.exists(fragile_path) else builtin.fragile_items
+    rules_path = os.path.join(path, "odc_rules.csv")
+    rules = _checked_rules(_read_rules(rules_path), rules_path) if os.path.exists(rules_path) else []
+    axles_path = os.path.join(path, "axle_geometry.csv")
+    axles = _checked_axles(_read_rules(axles_path), axles_path) if os.path.exists(axles_path) else None
+    return CatalogSnapshot(vehicles, limits, fragile, source=path, odc_rules=rules, axle_geometry=axles)
+
+def _load_sqlite(path):
+    # Read-only URI so a writer holding the file is never blocked by the app
+    try:
+        con = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.Error as exc:
+        raise CatalogError(f"{path}: {exc}") from exc
+    try:
+        cur = con.execute(f"SELECT {', '.join(VEHICLE_COLUMNS)} FROM vehicles ORDER BY rowid")
+        columns = dict(zip(VEHICLE_COLUMNS, map(list, zip(*cur.fetchall())))) or {c: [] for c in VEHICLE_COLUMNS}
+        tables = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        limits = (con.execute("SELECT limit_name, value FROM odc_limits").fetchall()
+                  if "odc_limits" in tables else None)
+        fragile = (dict(con.execute("SELECT cargo_type, packaging FROM fragile_items"))
+                   if "fragile_items" in tables else builtin.fragile_items)
+        rules = ([dict(zip(RULE_COLUMNS, row)) for row in con.execute('SELECT rule_set, dimension, "limit", severity FROM odc_rules ORDER BY rowid')]
+                 if "odc_rules" in tables else [])
+        axle_cursor = con.execute("SELECT * FROM axle_geometry ORDER BY rowid") if "axle_geometry" in tables else None
+        axles = ([dict(zip([d[0] for d in axle_cursor.description], row)) for row in axle_cursor]
+                 if axle_cursor is not None else None)
+    except sqlite3.Error as exc:
+        raise CatalogError(f"{path}: {exc}") from exc
+    finally:
+        con.close()
+    limits = _checked_limits(limits, path) if limits is not None else builtin.ODC_LIMITS
+    return CatalogSnapshot(_vehicle_columns_to_catalog(columns, path), limits, fragile, source=path,
+                           odc_rules=_checked_rules(rules, path), axle_geometry=_checked_axles(axles, path) if axles is not None else None)
+
+def load_catalog(path):
+    if os.path.isdir(path):
+        return _load_directory(path)
+    if path.lower().endswith((".sqlite", ".sqlite3", ".db")):
+        return _load_sqlite(path)
+    raise CatalogError(f"{path}: expected a catalog directory or a .sqlite/.db file")
+
+def write_catalog(path, snapshot=None):
+    # Writes a catalog (default: the built-in one) as a CSV directory or SQLite file.
+    from .catalog import AXLE_COLUMNS
+
+    snapshot = snapshot or builtin_snapshot()
+    rows = [snapshot.vehicles.vehicle(i) for i in range(len(snapshot.vehicles))]
+    if path.lower().endswith((".sqlite", ".sqlite3", ".db")):
+        con = sqlite3.connect(path)
+        with con:
+            con.execute("DROP TABLE IF EXISTS vehicles")
+            con.execute("DROP TABLE IF EXISTS odc_limits")
+            con.execute("DROP TABLE IF EXISTS fragile_items")
+            con.execute("DROP TABLE IF EXISTS odc_rules")
+            con.execute("DROP TABLE IF EXISTS axle_geometry")
+            con.execute("CREATE TABLE vehicles (name TEXT PRIMARY KEY, max_length REAL, max_width REAL, max_height REAL, "
+                        "max_weight REAL, cost_per_km REAL, cost_per_tkm REAL, has_sidewalls INTEGER)")
+            con.execute("CREATE TABLE odc_limits (limit_name TEXT PRIMARY KEY, value REAL)")
+            con.execute("CREATE TABLE fragile_items (cargo_type TEXT PRIMARY KEY, packaging TEXT)")
+            con.execute("CREATE TABLE odc_rules (rule_set TEXT, dimension TEXT, \"limit\" REAL, severity TEXT)")
+            con.executemany(f"INSERT INTO vehicles VALUES ({', '.join('?' * len(VEHICLE_COLUMNS))})",
+                            [[r[c] for c in VEHICLE_COLUMNS] for r in rows])
+            con.executemany("INSERT INTO odc_limits VALUES (?, ?)", snapshot.odc_limits.items())
+            con.executemany("INSERT INTO fragile_items VALUES (?, ?)", snapshot.fragile_items.items())
+            con.executemany("INSERT INTO odc_rules VALUES (?, ?, ?, ?)", [[r[c] for c in RULE_COLUMNS] for r in snapshot.extra_rules])
+            con.execute(f"CREATE TABLE axle_geometry (vehicle TEXT PRIMARY KEY, {', '.join(f'{c} REAL' for c in AXLE_COLUMNS)})")
+            con.executemany(f"INSERT INTO axle_geometry VALUES ({', '.join('?' * (len(AXLE_COLUMNS) + 1))})",
+                            [[name] + [g[c] for c in AXLE_COLUMNS] for name, g in snapshot.axle_geometry.items()])
+        con.close()
+        return
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "vehicles.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=VEHICLE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(os.path.join(path, "odc_limits.csv"), "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([("limit", "value"), *snapshot.odc_limits.items()])
+    with open(os.path.join(path, "fragile_items.csv"), "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([("cargo_type", "packaging"), *snapshot.fragile_items.items()])
+    if snapshot.extra_rules:
+        with open(os.path.join(path, "odc_rules.csv"), "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=RULE_COLUMNS)
+            writer.writeheader()
+            writer.writerows(snapshot.extra_rules)
+    with open(os.path.join(path, "axle_geometry.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["vehicle"] + AXLE_COLUMNS)
+        writer.writeheader()
+        writer.writerows({"vehicle": name, **g} for name, g in snapshot.axle_geometry.items())
+
+# ----------------------------
+# Hot reload
+# ----------------------------
+
+def _source_files(path):
+    if os.path.isdir(path):
+        names = ["vehicles.parquet", "vehicles.csv", "odc_limits.csv", "odc_rules.csv", "fragile_items.csv", "axle_geometry.csv"]
+        return [os.path.join(path, n) for n in names if os.path.exists(os.path.join(path, n))]
+    return [path, path + "-wal"] if os.path.exists(path + "-wal") else [path]
+
+def _stat_signature(files):
+    sig = []
+    for f in files:
+        st = os.stat(f)
+        sig.append((f, st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+def _content_hash(files):
+    digest = hashlib.sha1()
+    for f in files:
+        with open(f, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+class CatalogReloader:
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        files = _source_files(path)
+        self._signature = _stat_signature(files)
+        self._hash = _content_hash(files)
+        self._snapshot = load_catalog(path)
+        self._next_check = time.monotonic() + check_interval
+
+    def current(self):
+        # Cheap on the hot path: at most one stat() sweep per check_interval.
+        if time.monotonic() >= self._next_check:
+            self.check()
+        return self._snapshot
+
+    def check(self):
+        # Another thread already reloading: keep serving the current snapshot meanwhile
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                files = _source_files(self.path)
+                signature = _stat_signature(files)
+                if signature == self._signature:
+                    return False
+                content = _content_hash(files)
+                if content == self._hash:
+                    # Touched but not changed
+                    self._signature = signature
+                    return False
+                snapshot = load_catalog(self.path)
+            except (OSError, CatalogError) as exc:
+                # Keep serving the last good catalog until the source is fixed
+                self.last_error = str(exc)
+                return False
+            self._signature, self._hash = signature, content
+            self._snapshot = snapshot
+            self.reloads += 1
+            self.last_error = None
+            return True
+        finally:
+            self._lock.release()
@@ -0,0 +1,454 @@
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from itertools import islice
+
+# ----------------------------
+# Command-line batch quoting
+# ----------------------------
+#
+#   python -m vehicle_selector quote manifest.csv -o quotes.jsonl --workers 8 --chunk-size 2000
+#   python -m vehicle_selector rates rate_cards/ -o rates.csv
+#   python -m vehicle_selector pack skus.csv --distance-km 650 --thorough   (one mixed-SKU shipment)
+#   python -m vehicle_selector serve --port 8765 --workers 4   (HTTP/JSON, see service.py)
+#
+# Cargo lines are read lazily, grouped into chunks and fanned out over a
+# process pool. Pool.imap hands chunks back in submission order, so the output
+# file is deterministic for any worker count and is written as chunks finish.
+
+REQUIRED = ["length", "width", "height", "weight", "quantity"]
+TRUE_VALUES = {"true", "1", "yes", "y"}
+
+def _normalize(row):
+    return {str(k).strip().lower().replace(" ", "_"): v for k, v in row.items() if k is not None}
+
+def read_manifest(path):
+    # Yields one dict per cargo line from a CSV or JSONL manifest.
+    if path == "-":
+        handle = sys.stdin
+    else:
+        handle = open(path, newline="", encoding="utf-8-sig")
+    try:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            for raw in handle:
+                if raw.strip():
+                    yield _normalize(json.loads(raw))
+        else:
+            for row in csv.DictReader(handle):
+                yield _normalize(row)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+def _number(field, value, positive):
+    # A finite float, > 0 (positive) or >= 0; anything else is a line error
+    number = float(value)
+    if not math.isfinite(number) or number < 0 or (positive and number == 0):
+        raise ValueError(f"{field} must be a finite number {'> 0' if positive else '>= 0'}, got {value!r}")
+    return number
+
+def parse_line(row, defaults):
+    missing = [c for c in REQUIRED if row.get(c) in (None, "")]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    stacking = row.get("allow_stacking")
+    quantity = float(row["quantity"])
+    if not quantity.is_integer() or quantity < 1:
+        raise ValueError(f"quantity must be a whole number >= 1, got {row['quantity']!r}")
+    return (
+        _number("length", row["length"], True), _number("width", row["width"], True),
+        _number("height", row["height"], True), _number("weight", row["weight"], False),
+        int(quantity),
+        _number("distance_km", row.get("distance_km") or defaults["distance_km"], False),
+        defaults["allow_stacking"] if stacking in (None, "") else str(stacking).strip().lower() in TRUE_VALUES,
+        row.get("cargo_type") or defaults["cargo_type"],
+    )
+
+_catalogs = {}
+
+def _load_catalog(path):
+    # One load per worker process and catalog path
+    if path not in _catalogs:
+        from .catalog_store import load_catalog
+
+        _catalogs[path] = load_catalog(path)
+    return _catalogs[path]
+
+_rate_tables = {}
+
+def _load_rate_cards(path):
+    # One ingestion per worker process (forked workers inherit the parent's)
+    if path not in _rate_tables:
+        from .rate_cards import ingest_rate_cards
+
+        _rate_tables[path] = ingest_rate_cards(path, workers=1)[0]
+    return _rate_tables[path]
+
+def quote_chunk(task):
+    # Runs in a worker process: ranks vehicles for every parseable line of one chunk.
+    from .batch import compute_best_vehicle_batch
+    from .catalog import axle_geometry
+    from .engine import compute_best_fleet, cost_plans
+
+    start_line, rows, defaults, top, mixed_fleet = task
+    catalog = _load_catalog(defaults["catalog"]) if defaults.get("catalog") else None
+    rate_table = _load_rate_cards(defaults["rate_cards"]) if defaults.get("rate_cards") else None
+    vehicles = catalog.vehicles if catalog is not None else None
+    fragile = catalog.fragile_items if catalog is not None else None
+    axles = catalog.axle_geometry if catalog is not None else axle_geometry
+    parsed, out = [], []
+    for offset, row in enumerate(rows):
+        try:
+            parsed.append((offset, parse_line(row, defaults)))
+        except (TypeError, ValueError) as exc:
+            out.append({"line": start_line + offset, "error": str(exc)})
+
+    if parsed:
+        columns = list(zip(*(args for _, args in parsed)))
+        ranked = compute_best_vehicle_batch(*columns, vehicles=vehicles, fragile=fragile, axles=axles)
+        for (offset, args), options in zip(parsed, ranked):
+            lane_rates = None
+            if rate_table is not None:
+                # The batch engine prices with catalog rates; re-rank the same packing plans on the line's lane
+                row = rows[offset]
+                lane_rates = rate_table.lane(row.get("origin") or defaults["origin"], row.get("destination") or defaults["destination"],
+                                             defaults["rates_on"])
+                options = cost_plans(options, args[3], args[4], args[5], vehicles, lane_rates)
+            if mixed_fleet:
+                fleet = compute_best_fleet(options, args[3], args[4], args[5], vehicles, lane_rates)
+                if fleet and fleet["total_cost"] < options[0]["total_cost"]:
+                    options = [fleet] + options
+            record = {"line": start_line + offset, "options": options[:top] if top else options}
+            if defaults.get("quotes"):
+                # Inputs and the full ranking travel back so the parent can write them to the quote store
+                record["quote"] = (args, options)
+            out.append(record)
+
+    out.sort(key=lambda r: r["line"])
+    return out
+
+def _chunks(rows, chunk_size, defaults, top, mixed_fleet):
+    line = 1
+    while True:
+        block = list(islice(rows, chunk_size))
+        if not block:
+            return
+        yield (line, block, defaults, top, mixed_fleet)
+        line += len(block)
+
+class _Writer:
+    # JSONL (stdout or any non-report path) record by record; CSV, Excel and Parquet through
+    # export.ReportWriter, one batch per chunk
+    FIELDS = ["line", "rank", "vehicle", "class", "num_trucks", "total_cost", "max_units_per_truck", "transporter", "error"]
+
+    def __init__(self, output):
+        from .export import EXPORT_FORMATS, ReportWriter
+
+        ext = os.path.splitext(output)[1].lower().lstrip(".")
+        self.fmt = ext if output != "-" and ext in EXPORT_FORMATS else "jsonl"
+        if self.fmt == "jsonl":
+            self.handle = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+        else:
+            self.report = ReportWriter(output, self.fmt, self.FIELDS)
+            self.rows = []
+
+    def write(self, record):
+        from .export import option_rows
+
+        if self.fmt == "jsonl":
+            self.handle.write(json.dumps(record, ensure_ascii=False, allow_nan=False) + "\n")
+        elif "error" in record:
+            self.rows.append({"line": record["line"], "error": record["error"]})
+        else:
+            self.rows.extend(option_rows(record["line"], record["options"]))
+
+    def flush(self):
+        if self.fmt == "jsonl":
+            self.handle.flush()
+        else:
+            self.report.write(self.rows)
+            self.rows = []
+
+    def close(self):
+        self.flush()
+        if self.fmt != "jsonl":
+            self.report.close()
+        elif self.handle is not sys.stdout:
+            self.handle.close()
+
+def run_quote(args):
+    defaults = {"distance_km": args.distance_km, "allow_stacking": args.stacking, "cargo_type": args.cargo_type,
+                "catalog": args.catalog}
+    if args.catalog:
+        # Fail fast on a broken catalog instead of once per worker
+        from .catalog_store import CatalogError
+
+        try:
+            _load_catalog(args.catalog)
+        except (OSError, CatalogError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+    if args.rate_cards:
+        import datetime
+
+        from .rate_cards import RateCardError
+
+        try:
+            _load_rate_cards(args.rate_cards)
+            rates_on = datetime.date.fromisoformat(args.rates_on) if args.rates_on else datetime.date.today()
+        except (OSError, RateCardError, ValueError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+        defaults.update(rate_cards=args.rate_cards, origin=args.origin, destination=args.destination, rates_on=rates_on)
+    store = None
+    if args.quotes:
+        # Only this process writes to SQLite; workers hand their rankings back with each chunk
+        from .catalog import CATALOG_VERSION
+        from .quote_store import QuoteStore, quote_row
+
+        store = QuoteStore(args.quotes)
+        catalog_version = _load_catalog(args.catalog).version if args.catalog else CATALOG_VERSION
+        defaults["quotes"] = True
+    rows = read_manifest(args.manifest)
+    tasks = _chunks(rows, args.chunk_size, defaults, args.top, args.mixed_fleet)
+
+    start = time.perf_counter()
+    lines = errors = 0
+    writer = _Writer(args.output)
+    try:
+        if args.workers == 1:
+            results = map(quote_chunk, tasks)
+            pool = None
+        else:
+            import multiprocessing
+
+            pool = multiprocessing.Pool(args.workers)
+            results = pool.imap(quote_chunk, tasks)
+        try:
+            for chunk in results:
+                quotes = []
+                for record in chunk:
+                    if "quote" in record:
+                        cargo, options = record.pop("quote")
+                        quotes.append(quote_row(*cargo, options, catalog_version, args.project))
+                    writer.write(record)
+                    lines += 1
+                    errors += "error" in record
+                writer.flush()
+                if quotes:
+                    store.record_many(quotes)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Quoted {lines:,} cargo lines ({errors:,} errors) in {elapsed:.2f} s "
+          f"with {args.workers} worker(s)", file=sys.stderr)
+    return 0
+
+def run_route(args):
+    from .multi_drop import plan_multi_drop, prepare_instance
+
+    with open(args.cargo, newline="", encoding="utf-8-sig") as f:
+        cargo_rows = list(csv.DictReader(f))
+    with open(args.distances, newline="", encoding="utf-8-sig") as f:
+        matrix_rows = [row for row in csv.reader(f) if row]
+    try:
+        sites, distances = prepare_instance(cargo_rows, matrix_rows)
+    except (KeyError, TypeError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    vehicles = fragile = None
+    if args.catalog:
+        catalog = _load_catalog(args.catalog)
+        vehicles, fragile = catalog.vehicles, catalog.fragile_items
+    start = time.perf_counter()
+    plan = plan_multi_drop(sites, distances, args.stacking, args.cargo_type, vehicles, fragile,
+                           time_budget=args.budget, max_iterations=args.max_iterations)
+    elapsed = time.perf_counter() - start
+
+    text = json.dumps(plan, ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(f"Planned {len(sites):,} sites: {plan['num_trucks']:,} trucks, {plan['total_km']:,.0f} km, "
+          f"₹ {plan['total_cost']:,.2f} in {elapsed:.2f} s", file=sys.stderr)
+    return 0
+
+def run_pack(args):
+    from .engine import compute_best_vehicle_mixed
+
+    try:
+        items = [{"length": float(row["length"]), "width": float(row["width"]), "height": float(row["height"]),
+                  "weight": float(row["weight"]), "quantity": int(float(row["quantity"]))}
+                 for row in read_manifest(args.items)]
+    except (KeyError, TypeError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    vehicles = None
+    if args.catalog:
+        from .catalog_store import CatalogError
+
+        try:
+            catalog = _load_catalog(args.catalog)
+        except (OSError, CatalogError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+        # Every vehicle, not the catalog's skyline: packing and axle limits can rule out a dominating one
+        vehicles = [catalog.vehicles.vehicle(i) for i in range(len(catalog.vehicles))]
+        axles = catalog.axle_geometry
+    else:
+        from .catalog import axle_geometry as axles
+    start = time.perf_counter()
+    options = compute_best_vehicle_mixed(items, args.distance_km, args.stacking, args.cargo_type, thorough=args.thorough,
+                                         time_budget=args.budget, vehicles=vehicles, axles=axles)
+    elapsed = time.perf_counter() - start
+
+    text = json.dumps(options[:args.top] if args.top else options, ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(f"Packed {sum(item['quantity'] for item in items):,} units of {len(items):,} SKUs on {len(options):,} vehicle types "
+          f"in {elapsed:.2f} s", file=sys.stderr)
+    return 0
+
+def run_rates(args):
+    from .rate_cards import RateCardError, ingest_rate_cards
+
+    start = time.perf_counter()
+    try:
+        table, report = ingest_rate_cards(args.directory, workers=args.workers)
+    except (OSError, RateCardError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+    for error in report["failed"]:
+        print(f"error: {error}", file=sys.stderr)
+    for reject in report["rejected"]:
+        print(f"{reject['file']}:{reject['line']}: {reject['error']}", file=sys.stderr)
+    if args.output:
+        import datetime
+
+        # Normalized rate table, dates back as ISO (blank = open-ended)
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["transporter", "vehicle", "origin", "destination", "cost_per_km", "cost_per_tkm",
+                                                   "valid_from", "valid_to"])
+            writer.writeheader()
+            for row in table.rows:
+                writer.writerow({**row, **{k: datetime.date.fromordinal(row[k]).isoformat() if 0 < row[k] < datetime.date.max.toordinal() else ""
+                                           for k in ("valid_from", "valid_to")}})
+    print(f"Ingested {report['rows']:,} rates from {report['files']:,} files ({len(report['rejected']):,} rows rejected, "
+          f"{len(report['failed']):,} files failed) in {elapsed:.2f} s", file=sys.stderr)
+    return 1 if report["failed"] else 0
+
+def run_serve(args):
+    from .catalog_store import CatalogError
+    from .service import run_service
+
+    try:
+        if args.catalog:
+            _load_catalog(args.catalog)
+    except (OSError, CatalogError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    print(f"Serving quotes on http://{args.host}:{args.port} with {args.workers} worker(s), "
+          f"queue of {args.queue_size:,} lines (Ctrl+C to stop)", file=sys.stderr)
+    run_service(args.host, args.port, catalog=args.catalog, workers=args.workers, queue_size=args.queue_size,
+                chunk_size=args.chunk_size, distance_km=args.distance_km, allow_stacking=args.stacking, cargo_type=args.cargo_type)
+    return 0
+
+def run_catalog_export(args):
+    from .catalog_store import write_catalog
+
+    write_catalog(args.path)
+    print(f"Wrote built-in catalog to {args.path}", file=sys.stderr)
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m vehicle_selector", description="Artson vehicle selector batch tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    quote = sub.add_parser("quote", help="rank vehicle options for every line of a CSV/JSONL manifest")
+    quote.add_argument("manifest", help="CSV or JSONL manifest ('-' for CSV on stdin)")
+    quote.add_argument("-o", "--output", default="-", help="output .jsonl, .csv, .xlsx or .parquet file (default: JSONL on stdout)")
+    quote.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)")
+    quote.add_argument("--chunk-size", type=int, default=1000, help="cargo lines per task (default: 1000)")
+    quote.add_argument("--top", type=int, default=0, help="keep only the N cheapest options per line (default: all)")
+    quote.add_argument("--mixed-fleet", action="store_true", help="also offer a mixed fleet when it is cheaper")
+    quote.add_argument("--distance-km", type=float, default=800, help="distance for lines without distance_km")
+    quote.add_argument("--cargo-type", default="Standard Steel Fabrication", help="cargo type for lines without cargo_type")
+    quote.add_argument("--stacking", action="store_true", help="allow stacking for lines without allow_stacking")
+    quote.add_argument("--catalog", help="fleet/rate catalog directory or SQLite file (default: built-in fleet)")
+    quote.add_argument("--quotes", help="also record every quote in this SQLite quote store")
+    quote.add_argument("--project", default="", help="project to file recorded quotes under")
+    quote.add_argument("--rate-cards", help="price with the cheapest valid transporter rate card in this directory")
+    quote.add_argument("--origin", default="*", help="lane origin for lines without origin (default: any-lane cards only)")
+    quote.add_argument("--destination", default="*", help="lane destination for lines without destination")
+    quote.add_argument("--rates-on", help="date the rates must be valid on, YYYY-MM-DD (default: today)")
+    quote.set_defaults(func=run_quote)
+
+    route = sub.add_parser("route", help="plan multi-drop truck tours from the yard to several sites")
+    route.add_argument("cargo", help="CSV with site, length, width, height, weight, quantity[, cargo_type] per cargo line")
+    route.add_argument("distances", help="CSV distance matrix in km, labelled rows and columns, yard first")
+    route.add_argument("-o", "--output", default="-", help="output JSON file (default: stdout)")
+    route.add_argument("--budget", type=float, default=5.0, help="time budget in seconds (default: 5)")
+    route.add_argument("--max-iterations", type=int, default=None, help="cap on local-search rounds per vehicle type")
+    route.add_argument("--cargo-type", default="Standard Steel Fabrication", help="cargo type for sites without cargo_type")
+    route.add_argument("--stacking", action="store_true", help="allow stacking")
+    route.add_argument("--catalog", help="fleet/rate catalog directory or SQLite file (default: built-in fleet)")
+    route.set_defaults(func=run_route)
+
+    pack = sub.add_parser("pack", help="load one mixed-SKU shipment with the 3D packer and rank the vehicles")
+    pack.add_argument("items", help="CSV or JSONL with length, width, height, weight and quantity per SKU")
+    pack.add_argument("-o", "--output", default="-", help="output JSON file (default: stdout)")
+    pack.add_argument("--top", type=int, default=0, help="keep only the N cheapest options (default: all)")
+    pack.add_argument("--distance-km", type=float, default=800, help="trip distance (default: 800)")
+    pack.add_argument("--cargo-type", default="Standard Steel Fabrication", help="cargo type of the shipment")
+    pack.add_argument("--stacking", action="store_true", help="allow stacking")
+    pack.add_argument("--thorough", action="store_true", help="try more loading orders (overnight planning)")
+    pack.add_argument("--budget", type=float, default=None,
+                      help="time budget in seconds for all vehicles together (default: 0.15, or 30 with --thorough)")
+    pack.add_argument("--catalog", help="fleet/rate catalog directory or SQLite file (default: built-in fleet)")
+    pack.set_defaults(func=run_pack)
+
+    rates = sub.add_parser("rates", help="ingest a directory of transporter rate cards and report rejected rows")
+    rates.add_argument("directory", help="directory of CSV/Excel rate cards")
+    rates.add_argument("-o", "--output", help="write the normalized rate table to this CSV")
+    rates.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parser processes (default: all cores)")
+    rates.set_defaults(func=run_rates)
+
+    serve = sub.add_parser("serve", help="run a local HTTP/JSON quoting service")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    serve.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)")
+    serve.add_argument("--queue-size", type=int, default=512, help="cargo lines queued or running before requests get 503")
+    serve.add_argument("--chunk-size", type=int, default=256, help="cargo lines per worker task (default: 256)")
+    serve.add_argument("--distance-km", type=float, default=800, help="distance for lines without distance_km")
+    serve.add_argument("--cargo-type", default="Standard Steel Fabrication", help="cargo type for lines without cargo_type")
+    serve.add_argument("--stacking", action="store_true", help="allow stacking for lines without allow_stacking")
+    serve.add_argument("--catalog", help="fleet/rate catalog directory or SQLite file (default: built-in fleet)")
+    serve.set_defaults(func=run_serve)
+
+    catalog = sub.add_parser("catalog", help="export the built-in fleet as an editable catalog")
+    catalog.add_argument("path", help="catalog directory (CSV files) or .sqlite/.db file to write")
+    catalog.set_defaults(func=run_catalog_export)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, "workers", 1) < 1 or getattr(args, "chunk_size", 1) < 1:
+        build_parser().error("--workers and --chunk-size must be at least 1")
+    return args.func(args)
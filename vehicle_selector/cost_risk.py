@@ -0,0 +1,104 @@
+import numpy as np
+
+# ----------------------------
+# Monte Carlo cost risk
+# ----------------------------
+#
+# total_cost is the planned (deterministic) freight. On top of it a quote can
+# move with three drivers, each sampled from a configurable distribution:
+#
+#   fuel_change     relative fuel price change, applied to the fuel share of the freight
+#   detention_days  days a truck is held at loading/unloading, charged per truck per day
+#   escort_per_km   escort/pilot charge per km for every truck that needs an ODC permit
+#
+# A distribution is a dict {"dist": name, ...parameters}. Fuel and escort rates
+# are market-wide, so one draw per scenario is shared by every vehicle option
+# (common random numbers: option rankings are not blurred by sampling noise).
+# Detention is per truck: an option sending n trucks draws Poisson(n × mean)
+# days, shared with the other options that send n trucks.
+#
+# Scenarios are evaluated option-chunk by option-chunk to bound memory on
+# large fleets; results only depend on the seed and the options passed in.
+
+RISK_DRIVERS = {
+    "fuel_share": {"dist": "fixed", "value": 0.35},
+    "fuel_change": {"dist": "normal", "mean": 0.0, "sd": 0.08},
+    "detention_days": {"dist": "poisson", "mean": 0.5},
+    "detention_per_day": {"dist": "fixed", "value": 2500.0},
+    "escort_per_km": {"dist": "triangular", "low": 15.0, "mode": 25.0, "high": 45.0},
+}
+PERCENTILES = [50, 90, 99]
+MAX_CELLS = 4_000_000  # options × scenarios evaluated at once
+
+def _sample(rng, spec, size):
+    dist = spec["dist"]
+    if dist == "fixed":
+        return np.full(size, float(spec["value"]))
+    if dist == "normal":
+        return rng.normal(spec["mean"], spec["sd"], size)
+    if dist == "lognormal":
+        # mean/sd of the underlying normal
+        return rng.lognormal(spec["mean"], spec["sd"], size)
+    if dist == "uniform":
+        return rng.uniform(spec["low"], spec["high"], size)
+    if dist == "triangular":
+        return rng.triangular(spec["low"], spec["mode"], spec["high"], size)
+    if dist == "poisson":
+        return rng.poisson(spec["mean"], size).astype(float)
+    raise ValueError(f"unknown distribution: {dist!r}")
+
+def _cost_blocks(results, distance_km, scenarios, seed, drivers):
+    # Yields (option slice, options × scenarios cost block)
+    drivers = {**RISK_DRIVERS, **(drivers or {})}
+    rng = np.random.default_rng(seed)
+    base = np.array([r["total_cost"] for r in results], dtype=float)
+    trucks = np.array([r["num_trucks"] for r in results], dtype=int)
+    escorted = np.array([r.get("odc_trucks", 0) for r in results], dtype=float)
+    km = np.array([r.get("distance_km", distance_km) for r in results], dtype=float)
+
+    # Market-wide drivers, one draw per scenario
+    fuel = np.maximum(_sample(rng, drivers["fuel_share"], scenarios) * _sample(rng, drivers["fuel_change"], scenarios), -1.0)
+    escort = _sample(rng, drivers["escort_per_km"], scenarios)
+    per_day = _sample(rng, drivers["detention_per_day"], scenarios)
+
+    # Detention charge per fleet size; options sending the same number of trucks share a draw
+    spec = drivers["detention_days"]
+    detention = {}
+    for n in np.unique(trucks).tolist():
+        if spec["dist"] == "poisson":
+            # Sum of per-truck Poisson days is Poisson(trucks × mean)
+            days = rng.poisson(spec["mean"] * n, scenarios).astype(float)
+        else:
+            days = np.maximum(_sample(rng, spec, scenarios), 0.0) * n
+        detention[n] = days * per_day
+
+    step = max(1, MAX_CELLS // max(scenarios, 1))
+    for start in range(0, len(results), step):
+        cols = slice(start, start + step)
+        block = base[cols, None] * (1.0 + fuel)
+        block += np.stack([detention[n] for n in trucks[cols].tolist()])
+        block += (escorted[cols] * km[cols])[:, None] * escort
+        yield cols, block
+
+def simulate_costs(results, distance_km, scenarios=100_000, seed=0, drivers=None):
+    # (options × scenarios) simulated cost matrix for result rows (after add_objectives,
+    # which supplies odc_trucks). drivers overrides entries of RISK_DRIVERS.
+    costs = np.empty((len(results), scenarios))
+    for cols, block in _cost_blocks(results, distance_km, scenarios, seed, drivers):
+        costs[cols] = block
+    return costs
+
+def cost_risk(results, distance_km, scenarios=100_000, seed=0, drivers=None, percentiles=None):
+    # One row per option: vehicle, planned cost, P50/P90/P99 (or the requested percentiles).
+    # Percentiles are taken block by block, so memory stays flat however many options there are.
+    percentiles = percentiles or PERCENTILES
+    if not results:
+        return []
+    quantiles = np.empty((len(results), len(percentiles)))
+    for cols, block in _cost_blocks(results, distance_km, scenarios, seed, drivers):
+        quantiles[cols] = np.percentile(block, percentiles, axis=1).T
+    return [{
+        "vehicle": r["vehicle"],
+        "total_cost": r["total_cost"],
+        **{f"p{p}": round(float(q), 2) for p, q in zip(percentiles, quantiles[i])},
+    } for i, r in enumerate(results)]
@@ -0,0 +1,241 @@
+import math
+import time
+
+from .catalog import ODC_LIMITS, fragile_items, vehicle_types
+from .axle_load import check_load, max_units_balanced
+from .fleet_mix import cheapest_fleet
+from .packing import FAST_BUDGET_S, THOROUGH_BUDGET_S, pack_shipment, units_per_vehicle
+from .road_graph import route_plans
+
+# ----------------------------
+# Selection engine
+# ----------------------------
+
+def classify_vehicle(name):
+    if "LCV" in name or "14 ft" in name:
+        return "🟢 Light Commercial"
+    elif "22 ft" in name or "Container" in name or "Tanker" in name:
+        return "🟡 Medium Duty"
+    elif "Flatbed" in name or "Low Bed" in name:
+        return "🟠 Heavy Duty"
+    elif "Multi-Axle" in name:
+        return "🔴 Oversize Modular"
+    else:
+        return "🔧 Custom Haulage"
+
+def check_odc(length, width, height, weight, limits=None):
+    limits = limits if limits is not None else ODC_LIMITS
+    exceeded = {}
+    if length > limits["length"]:
+        exceeded["Length"] = f"{length} m > {limits['length']} m"
+    if width > limits["width"]:
+        exceeded["Width"] = f"{width} m > {limits['width']} m"
+    if height > limits["height"]:
+        exceeded["Height"] = f"{height} m > {limits['height']} m"
+    if weight > limits["weight"]:
+        exceeded["Weight"] = f"{weight} kg > {limits['weight']} kg"
+    return exceeded
+
+def plan_vehicles(length, width, height, weight, quantity, allow_stacking, cargo_type, vehicles=None, fragile=None, axles=None,
+                  prune=True):
+    # Packing stage: which vehicles fit and how many trucks each needs. Independent of
+    # distance and rates, so it can be cached while planners edit those.
+    # axles (vehicle name -> axle geometry, see catalog.axle_geometry) also holds each truck
+    # to its axle-load and CG limits; vehicles that cannot carry even one unit are left out.
+    # prune=False keeps vehicles a FleetCatalog's skyline would drop; plans that will be routed or
+    # priced from rate cards need them, since a road may be closed to the vehicle that dominates
+    # them and a transporter's card may undercut its catalog rates.
+    plans = []
+    is_fragile = cargo_type in (fragile if fragile is not None else fragile_items)
+
+    # An indexed FleetCatalog hands back only the non-dominated vehicles the cargo fits on.
+    # A dominated vehicle can only win when its dominator is cut down by axle limits, so if any
+    # of the skyline has axle geometry, every vehicle the cargo fits on is planned instead.
+    if hasattr(vehicles, "candidates"):
+        fits = vehicles.candidates(length, width, height, weight, is_fragile, skyline=prune)
+        if prune and axles and any(v["name"] in axles for v in fits):
+            fits = vehicles.candidates(length, width, height, weight, is_fragile, skyline=False)
+        vehicles = fits
+
+    for v in vehicles if vehicles is not None else vehicle_types:
+        if not v["has_sidewalls"] and is_fragile:
+            continue
+
+        # Calculate how many cargo units can physically fit (any upright orientation)
+        max_units_vol = units_per_vehicle(length, width, height, v, allow_stacking)
+
+        # Skip if cargo does not physically fit
+        if max_units_vol == 0 or weight > v["max_weight"]:
+            continue
+
+        # Calculate how many units fit by weight
+        max_units_wt = math.floor(v["max_weight"] / weight) if weight > 0 else quantity
+
+        max_units = max(1, min(max_units_vol, max_units_wt))
+        plan = {"vehicle": v["name"], "max_units_per_truck": max_units}
+
+        geometry = axles.get(v["name"]) if axles else None
+        if geometry is not None:
+            # Only as many units as a truck will actually carry need checking
+            wanted = min(max_units, quantity)
+            units, loads = max_units_balanced(length, width, height, weight, v, geometry, allow_stacking,
+                                              limit=wanted, quantity=quantity)
+            if units == 0:
+                continue
+            if units < wanted:
+                plan["max_units_per_truck"] = max_units = units
+                plan["axle_limited"] = True
+            plan["front_axle_kg"] = round(loads["front_axle_kg"])
+            plan["rear_axle_kg"] = round(loads["rear_axle_kg"])
+
+        plan["num_trucks"] = math.ceil(quantity / max_units)
+        plans.append(plan)
+
+    return plans
+
+def _rate_table(vehicles):
+    # name -> (cost_per_km, cost_per_tkm) for a vehicle list or a FleetCatalog
+    vehicles = vehicles if vehicles is not None else vehicle_types
+    if hasattr(vehicles, "rate_table"):
+        return vehicles.rate_table()
+    return {v["name"]: (v["cost_per_km"], v["cost_per_tkm"]) for v in vehicles}
+
+# Axle check results passed through from packing plans to option rows
+AXLE_KEYS = ("axle_limited", "front_axle_kg", "rear_axle_kg")
+
+def cost_plans(plans, weight, quantity, distance_km, vehicles=None, rate_cards=None):
+    # Costing stage: prices packing plans with the current rates and ranks them.
+    # rate_cards (rate_cards.LaneRates) supplies the cheapest transporter rate valid on the lane;
+    # vehicles no card covers keep their catalog rates.
+    if hasattr(vehicles, "rates"):
+        rates = vehicles.rates
+    else:
+        rates = _rate_table(vehicles).__getitem__
+    total_weight = weight * quantity  # in kg
+    results = []
+
+    for plan in plans:
+        # Routed plans carry their own road distance (see road_graph.route_plans)
+        distance = plan.get("distance_km", distance_km)
+        trucks_needed = plan["num_trucks"]
+        avg_weight_per_truck_tonnes = (total_weight / trucks_needed) / 1000
+        card = rate_cards.best_rate(plan["vehicle"], avg_weight_per_truck_tonnes) if rate_cards is not None else None
+        if card is not None:
+            cost_per_km, cost_per_tkm = card["cost_per_km"], card["cost_per_tkm"]
+        else:
+            cost_per_km, cost_per_tkm = rates(plan["vehicle"])
+
+        total_cost = trucks_needed * (
+            cost_per_km * distance +
+            cost_per_tkm * avg_weight_per_truck_tonnes * distance
+        )
+
+        result = {
+            "vehicle": plan["vehicle"],
+            "class": classify_vehicle(plan["vehicle"]),
+            "num_trucks": trucks_needed,
+            "total_cost": round(total_cost, 2),
+            "max_units_per_truck": plan["max_units_per_truck"]
+        }
+        if "distance_km" in plan:
+            result["distance_km"] = plan["distance_km"]
+        for key in AXLE_KEYS:
+            if key in plan:
+                result[key] = plan[key]
+        if card is not None:
+            result["transporter"] = card["transporter"]
+        results.append(result)
+
+    return sorted(results, key=lambda x: x["total_cost"])
+
+def compute_best_vehicle(length, width, height, weight, quantity, distance_km, allow_stacking, cargo_type, vehicles=None, fragile=None, route=None,
+                         rate_cards=None, axles=None):
+    # route = (RoadGraph, origin, destination) prices each vehicle on the shortest road it may
+    # legally use (distance_km is then ignored); vehicles with no legal road are left out.
+    # rate_cards = RateTable.lane(origin, destination) prices with transporter rate cards.
+    # axles = catalog.axle_geometry applies per-axle load and CG limits.
+    plans = plan_vehicles(length, width, height, weight, quantity, allow_stacking, cargo_type, vehicles, fragile, axles,
+                          prune=route is None and rate_cards is None)
+    if route is not None:
+        plans = route_plans(plans, route, height, weight, quantity, allow_stacking, vehicles if vehicles is not None else vehicle_types,
+                            axles)
+    return cost_plans(plans, weight, quantity, distance_km, vehicles, rate_cards)
+
+def compute_best_fleet(results, weight, quantity, distance_km, vehicles=None, rate_cards=None):
+    # Cheapest mix of the feasible options in results that carries all units, or None
+    # when a single vehicle type is already optimal.
+    rates = _rate_table(vehicles)
+    if rate_cards is not None:
+        # Card rates for a full truck of each type, over the catalog's
+        cards = {r["vehicle"]: rate_cards.best_rate(r["vehicle"], r["max_units_per_truck"] * weight / 1000) for r in results}
+        rates = {name: rates[name] if card is None else (card["cost_per_km"], card["cost_per_tkm"])
+                 for name, card in cards.items() if card is not None or name in rates}
+    options = [{
+        "key": r["vehicle"],
+        "capacity": r["max_units_per_truck"],
+        "fixed": rates[r["vehicle"]][0] * r.get("distance_km", distance_km),
+        "per_unit": rates[r["vehicle"]][1] * (weight / 1000) * r.get("distance_km", distance_km)
+    } for r in results if r["vehicle"] in rates]
+    if len(options) < 2:
+        return None
+
+    solution = cheapest_fleet(options, quantity)
+    if solution is None:
+        return None
+    total_cost, plan = solution
+
+    counts = {}
+    for name, trucks, _ in plan:
+        counts[name] = counts.get(name, 0) + trucks
+    if len(counts) < 2:
+        return None
+
+    return {
+        "vehicle": " + ".join(f"{n} × {name}" for name, n in counts.items()),
+        "class": "🧩 Mixed Fleet",
+        "num_trucks": sum(counts.values()),
+        "total_cost": round(total_cost, 2),
+        "max_units_per_truck": max(units for _, _, units in plan)
+    }
+
+def compute_best_vehicle_mixed(items, distance_km, allow_stacking, cargo_type, thorough=False, time_budget=None, vehicles=None, axles=None):
+    # items: one dict per SKU with length, width, height, weight (per unit) and quantity.
+    # time_budget (default packing.FAST_BUDGET_S, or THOROUGH_BUDGET_S) is one deadline for all vehicles.
+    # With axles (catalog.axle_geometry), options with a load over its axle or CG limits rank last.
+    total_weight = sum(item["weight"] * item["quantity"] for item in items)  # in kg
+    total_units = sum(item["quantity"] for item in items)
+    candidates = [v for v in (vehicles if vehicles is not None else vehicle_types) if v["has_sidewalls"] or cargo_type not in fragile_items]
+    budget = time_budget if time_budget is not None else (THOROUGH_BUDGET_S if thorough else FAST_BUDGET_S)
+    deadline = time.perf_counter() + budget
+    results = []
+
+    for n, v in enumerate(candidates):
+        # An even share of the time left; whatever a vehicle does not use passes on to the rest
+        now = time.perf_counter()
+        share = now + max(0.0, deadline - now) / (len(candidates) - n)
+        plan = pack_shipment(items, v, allow_stacking, thorough=thorough, deadline=share)
+        if plan["unplaced"] or plan["num_vehicles"] == 0:
+            continue
+
+        trucks_needed = plan["num_vehicles"]
+        avg_weight_per_truck_tonnes = (total_weight / trucks_needed) / 1000
+
+        total_cost = trucks_needed * (
+            v["cost_per_km"] * distance_km +
+            v["cost_per_tkm"] * avg_weight_per_truck_tonnes * distance_km
+        )
+
+        results.append({
+            "vehicle": v["name"],
+            "class": classify_vehicle(v["name"]),
+            "num_trucks": trucks_needed,
+            "total_cost": round(total_cost, 2),
+            "max_units_per_truck": max((load["units"] for load in plan["loads"]), default=math.ceil(total_units / trucks_needed)),
+            "plan_complete": plan["complete"]
+        })
+        geometry = axles.get(v["name"]) if axles else None
+        if geometry is not None:
+            skus = [item for item in items if item["quantity"] > 0]
+            results[-1]["axle_ok"] = all(check_load(load, skus, v, geometry)["ok"] for load in plan["loads"])
+
+    return sorted(results, key=lambda x: (not x.get("axle_ok", True), x["total_cost"]))
@@ -0,0 +1,111 @@
+import csv
+import io
+import os
+
+# ----------------------------
+# Streaming report export
+# ----------------------------
+#
+# Results go to disk one batch at a time, so memory is bounded by the chunk
+# size, not the report size:
+#   * CSV is written row by row
+#   * Parquet gets one row group per batch (pyarrow ParquetWriter)
+#   * Excel uses openpyxl's write-only mode, which spools rows to a temporary
+#     file; a sheet holds at most EXCEL_MAX_ROWS rows, then "Results 2" starts
+# Every format has the same fixed columns (see REPORT_COLUMNS), so a batch
+# with no transporter or no error rows still lines up with the others.
+
+EXPORT_FORMATS = {"csv": "text/csv", "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                  "parquet": "application/vnd.apache.parquet"}
+# column -> Arrow type name
+COLUMN_TYPES = {
+    "line": "int64", "length": "float64", "width": "float64", "height": "float64", "weight": "float64", "quantity": "int64",
+    "distance_km": "float64", "rank": "int32", "vehicle": "string", "class": "string", "num_trucks": "int64",
+    "total_cost": "float64", "max_units_per_truck": "int64", "transporter": "string", "error": "string",
+}
+CARGO_COLUMNS = ["line", "length", "width", "height", "weight", "quantity", "distance_km"]
+OPTION_COLUMNS = ["rank", "vehicle", "class", "num_trucks", "total_cost", "max_units_per_truck", "transporter"]
+REPORT_COLUMNS = CARGO_COLUMNS + OPTION_COLUMNS
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_SHEET = "Results"
+
+def export_format(path):
+    ext = os.path.splitext(str(path))[1].lower().lstrip(".")
+    if ext not in EXPORT_FORMATS:
+        raise ValueError(f"unsupported export format {ext!r} (expected {', '.join(EXPORT_FORMATS)})")
+    return ext
+
+def option_rows(line, options, cargo=None, top=0):
+    # One report row per ranked option of a cargo line; cargo is the line's input columns
+    cargo = {"line": line, **(cargo or {})}
+    return [{**cargo, "rank": rank, **option} for rank, option in enumerate(options[:top] if top else options, start=1)]
+
+class ReportWriter:
+    def __init__(self, target, fmt=None, columns=None):
+        # target: a path or a binary file object (fmt is then required)
+        self.fmt = fmt or export_format(target)
+        if self.fmt not in EXPORT_FORMATS:
+            raise ValueError(f"unsupported export format {self.fmt!r}")
+        self.columns = list(columns or REPORT_COLUMNS)
+        self.rows = 0
+        self._owned = isinstance(target, (str, os.PathLike))
+        self._target = target
+        if self.fmt == "csv":
+            handle = open(target, "w", newline="", encoding="utf-8") if self._owned else io.TextIOWrapper(target, "utf-8", newline="")
+            self._handle = handle
+            self._csv = csv.DictWriter(handle, fieldnames=self.columns, extrasaction="ignore")
+            self._csv.writeheader()
+        elif self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            self._schema = pa.schema([(c, getattr(pa, COLUMN_TYPES.get(c, "string"))()) for c in self.columns])
+            self._parquet = pq.ParquetWriter(target, self._schema, compression="zstd")
+        else:
+            from openpyxl import Workbook
+
+            self._book = Workbook(write_only=True)
+            self._sheet = None
+            self._sheet_rows = 0
+
+    def write(self, rows):
+        # Appends one batch of row dicts; missing columns are left empty
+        if not rows:
+            return
+        if self.fmt == "csv":
+            self._csv.writerows(rows)
+        elif self.fmt == "parquet":
+            import pyarrow as pa
+
+            batch = {c: [r.get(c) for r in rows] for c in self.columns}
+            self._parquet.write_table(pa.Table.from_pydict(batch, schema=self._schema))
+        else:
+            for r in rows:
+                if self._sheet is None or self._sheet_rows >= EXCEL_MAX_ROWS:
+                    self._sheet = self._book.create_sheet(EXCEL_SHEET if self._sheet is None else f"{EXCEL_SHEET} {len(self._book.worksheets) + 1}")
+                    self._sheet.append(self.columns)
+                    self._sheet_rows = 1
+                self._sheet.append([r.get(c) for c in self.columns])
+                self._sheet_rows += 1
+        self.rows += len(rows)
+
+    def close(self):
+        if self.fmt == "csv":
+            self._handle.flush()
+            if self._owned:
+                self._handle.close()
+            else:
+                self._handle.detach()  # leave the caller's file open
+        elif self.fmt == "parquet":
+            self._parquet.close()
+        else:
+            if self._sheet is None:
+                self._book.create_sheet(EXCEL_SHEET).append(self.columns)
+            self._book.save(self._target)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,175 @@
+from bisect import bisect_left
+
+import numpy as np
+
+# ----------------------------
+# Indexed fleet catalog
+# ----------------------------
+#
+# Vendor fleets run to thousands of specific vehicles, so instead of a list of
+# dicts the catalog keeps one NumPy column per attribute and two indexes:
+#
+# * a skyline: vehicles that are no bigger on every axis and no cheaper on
+#   both rates than some other vehicle can never be the cheapest option, so
+#   they are dropped up front (kept separately for fragile cargo, where only
+#   vehicles with sidewalls count)
+# * sorted copies of the skyline's floor (long side), height and weight
+#   columns; a query binary-searches each one and only visits the smallest
+#   feasible suffix
+#
+# Cargo may be turned about the vertical axis, so a footprint l x w fits a bed
+# L x W exactly when max(l, w) <= max(L, W) and min(l, w) <= min(L, W).
+
+COLUMNS = ["max_length", "max_width", "max_height", "max_weight", "cost_per_km", "cost_per_tkm"]
+
+def _dominated_by(a, b):
+    # out[i, j]: row a[i] is <= row b[j] in every column (one 2-D pass per column)
+    out = a[:, None, 0] <= b[None, :, 0]
+    for c in range(1, a.shape[1]):
+        out &= a[:, None, c] <= b[None, :, c]
+    return out
+
+def skyline_mask(matrix, block=256):
+    # Rows of `matrix` not dominated by another row when every column is minimised.
+    # Sort-filter-skyline: after sorting by the normalised row sum a row can only be
+    # dominated by rows before it, so rows are checked block by block against the
+    # skyline found so far and against earlier rows of their own block.
+    matrix = np.asarray(matrix, dtype=float)
+    n = matrix.shape[0]
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    low = matrix.min(axis=0)
+    span = matrix.max(axis=0) - low
+    span[span == 0] = 1.0
+    order = np.lexsort((np.arange(n), ((matrix - low) / span).sum(axis=1)))
+
+    sky = np.empty((0, matrix.shape[1]))
+    for start in range(0, n, block):
+        idx = order[start:start + block]
+        rows = matrix[idx]
+        alive = ~_dominated_by(sky, rows).any(axis=0)
+        # Earlier rows of the block; a dominated dominator implies a dominating skyline row
+        alive &= ~np.triu(_dominated_by(rows, rows), k=1).any(axis=0)
+        keep[idx[alive]] = True
+        sky = np.vstack([sky, rows[alive]])
+    return keep
+
+class FleetCatalog:
+    def __init__(self, vehicles):
+        self._build(
+            [v["name"] for v in vehicles],
+            {c: [v[c] for v in vehicles] for c in COLUMNS},
+            [v["has_sidewalls"] for v in vehicles],
+        )
+
+    @classmethod
+    def from_columns(cls, names, columns, has_sidewalls):
+        # Build straight from column arrays (e.g. a Parquet or SQLite load) without row dicts
+        catalog = cls.__new__(cls)
+        catalog._build(list(names), columns, has_sidewalls)
+        return catalog
+
+    def _build(self, names, columns, has_sidewalls):
+        if len(set(names)) != len(names):
+            raise ValueError("vehicle names must be unique")
+        self.names = names
+        self._rates = None
+        self._heights = None
+        self._position = {name: i for i, name in enumerate(names)}
+        self.columns = {c: np.asarray(columns[c], dtype=float) for c in COLUMNS}
+        self.columns["has_sidewalls"] = np.asarray(has_sidewalls, dtype=bool)
+        if any(len(col) != len(names) for col in self.columns.values()):
+            raise ValueError("vehicle columns differ in length")
+        self.long_side = np.maximum(self.columns["max_length"], self.columns["max_width"])
+        self.short_side = np.minimum(self.columns["max_length"], self.columns["max_width"])
+
+        # Smaller is better in every column: negate capacities, keep rates
+        criteria = np.column_stack([
+            -self.long_side, -self.short_side, -self.columns["max_height"], -self.columns["max_weight"],
+            self.columns["cost_per_km"], self.columns["cost_per_tkm"]
+        ])
+        walled = np.flatnonzero(self.columns["has_sidewalls"])
+        self._indexes = {
+            False: self._build_index(np.flatnonzero(skyline_mask(criteria))),
+            True: self._build_index(walled[skyline_mask(criteria[walled])]),
+        }
+
+    def _build_index(self, members):
+        index = {"members": members}
+        for key, column in (("long", self.long_side), ("height", self.columns["max_height"]), ("weight", self.columns["max_weight"])):
+            order = members[np.argsort(column[members], kind="stable")]
+            index[key] = (column[order].tolist(), order)
+        return index
+
+    def __len__(self):
+        return len(self.names)
+
+    def skyline_size(self, fragile=False):
+        return len(self._indexes[fragile]["members"])
+
+    def vehicle(self, i):
+        row = {"name": self.names[i]}
+        for c in COLUMNS:
+            row[c] = self.columns[c][i].item()
+        row["has_sidewalls"] = bool(self.columns["has_sidewalls"][i])
+        return row
+
+    def skyline_vehicles(self):
+        # Every vehicle that is non-dominated for standard or for fragile cargo
+        members = np.union1d(self._indexes[False]["members"], self._indexes[True]["members"])
+        return [self.vehicle(i) for i in members.tolist()]
+
+    def by_name(self, name):
+        return self.vehicle(self._position[name])
+
+    def rates(self, name):
+        i = self._position[name]
+        return self.columns["cost_per_km"][i].item(), self.columns["cost_per_tkm"][i].item()
+
+    def heights(self):
+        # name -> max_height, for per-option loaded heights
+        if self._heights is None:
+            self._heights = dict(zip(self.names, self.columns["max_height"].tolist()))
+        return self._heights
+
+    def rate_table(self):
+        if self._rates is None:
+            self._rates = dict(zip(self.names, zip(self.columns["cost_per_km"].tolist(), self.columns["cost_per_tkm"].tolist())))
+        return self._rates
+
+    def candidate_indices(self, length, width, height, weight, fragile=False, skyline=True):
+        if not skyline:
+            # Every vehicle the cargo fits on, dominated ones included (one vectorised pass)
+            ok = (
+                (self.long_side >= max(length, width))
+                & (self.short_side >= min(length, width))
+                & (self.columns["max_height"] >= height)
+                & (self.columns["max_weight"] >= weight)
+            )
+            if fragile:
+                ok &= self.columns["has_sidewalls"]
+            return np.flatnonzero(ok)
+        index = self._indexes[fragile]
+        best = None
+        for key, need in (("long", max(length, width)), ("height", height), ("weight", weight)):
+            values, order = index[key]
+            suffix = order[bisect_left(values, need):]
+            if best is None or len(suffix) < len(best):
+                best = suffix
+        if len(best) == 0:
+            return best
+        ok = (
+            (self.long_side[best] >= max(length, width))
+            & (self.short_side[best] >= min(length, width))
+            & (self.columns["max_height"][best] >= height)
+            & (self.columns["max_weight"][best] >= weight)
+        )
+        return np.sort(best[ok])
+
+    def candidates(self, length, width, height, weight, fragile=False, skyline=True):
+        # Non-dominated vehicles the cargo fits on, as the dicts compute_best_vehicle expects.
+        # skyline=False returns every vehicle it fits on, for constraints the skyline does not
+        # know about (road restrictions that rule out the dominating vehicle, rate cards that undercut
+        # its catalog rates).
+        return [self.vehicle(i) for i in self.candidate_indices(length, width, height, weight, fragile, skyline).tolist()]
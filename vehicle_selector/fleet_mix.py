@@ -0,0 +1,137 @@
+import math
+from bisect import bisect_left, bisect_right
+
+# ----------------------------
+# Cost-optimal mixed fleet
+# ----------------------------
+#
+# Cost of one truck of type v carrying k units over the trip is
+#     fixed_v + per_unit_v * k
+# with fixed_v = cost_per_km * distance and per_unit_v = cost_per_tkm * unit
+# tonnes * distance, i.e. the same formula compute_best_vehicle uses.
+#
+# Because the load term is linear, units can always be shifted from the
+# dearer of two part-loaded trucks to the cheaper one, so some optimal plan
+# has at most ONE part-loaded truck. The search is therefore an unbounded
+# knapsack over full trucks plus one remainder truck.
+#
+# Two reductions keep it fast for large quantities:
+# * capacities are capped at the quantity, then dominance pruning drops any
+#   type with no more capacity, and no lower fixed or per-unit cost, than
+#   another type (one sweep in capacity order, not a pairwise check)
+# * among any c_best full trucks of other types, some subset carries a
+#   multiple of c_best units and can be swapped for cheaper-per-unit "best"
+#   trucks, so the DP only needs ~c_best * c_max units and the rest of the
+#   shipment is carried by full best trucks
+#
+# That bound grows with the square of the truck capacity, so the search is
+# also capped: the DP covers at most MIX_MAX_UNITS units (or one best truck,
+# if larger), the rest going on full best trucks as above, and only the
+# types cheapest per unit on a full truck take part, at most MIX_MAX_OPTIONS
+# and at most MIX_MAX_WORK DP states x types. Within the caps the result is
+# exact; beyond them it is the cheapest mix of that shape.
+
+MIX_MAX_OPTIONS = 24
+MIX_MAX_UNITS = 2000
+MIX_MAX_WORK = 100_000
+
+def _prune_dominated(options):
+    # One sweep in decreasing capacity: an option is dominated exactly when an earlier one is
+    # no dearer on both costs. The earlier options' non-dominated (fixed, per_unit) pairs form a
+    # staircase, per_unit falling as fixed rises, so each check is a bisect. Identical options
+    # keep the first one.
+    order = sorted(range(len(options)), key=lambda i: (-options[i]["capacity"], options[i]["fixed"], options[i]["per_unit"], i))
+    fixed, per_unit = [], []
+    kept = []
+    for i in order:
+        a = options[i]
+        at = bisect_right(fixed, a["fixed"])
+        if at and per_unit[at - 1] <= a["per_unit"]:
+            continue
+        kept.append(i)
+        lo = hi = bisect_left(fixed, a["fixed"])
+        while hi < len(fixed) and per_unit[hi] >= a["per_unit"]:
+            hi += 1
+        fixed[lo:hi] = [a["fixed"]]
+        per_unit[lo:hi] = [a["per_unit"]]
+    return [options[i] for i in sorted(kept)]
+
+def cheapest_fleet(options, quantity):
+    # options: dicts with "key", "capacity" (units per truck), "fixed" and "per_unit" costs.
+    # Returns (total_cost, [(key, trucks, units_per_truck), ...]) or None if nothing fits.
+    # No truck carries more than the whole shipment, so larger capacities are all the same here
+    options = _prune_dominated([dict(o, capacity=min(o["capacity"], quantity)) for o in options if o["capacity"] >= 1])
+    if not options or quantity <= 0:
+        return None
+
+    full_cost = [o["fixed"] + o["per_unit"] * o["capacity"] for o in options]
+    ranked = sorted(range(len(options)), key=lambda i: (full_cost[i] / options[i]["capacity"], i))
+    c_best = options[ranked[0]]["capacity"]
+    c_max = max(o["capacity"] for o in options)
+
+    # Peel off full best-ratio trucks until the residual fits the bounded DP
+    bound = min((c_best + 1) * c_max + c_best, max(MIX_MAX_UNITS, c_best))
+    extra_best = 0
+    if quantity > bound:
+        extra_best = (quantity - bound) // c_best + 1
+    q = quantity - extra_best * c_best
+
+    # The types cheapest per unit on a full truck, as many as the work cap allows (best is first)
+    keep = sorted(ranked[:max(2, min(MIX_MAX_OPTIONS, MIX_MAX_WORK // (q + 1)))])
+    options = [options[i] for i in keep]
+    full_cost = [full_cost[i] for i in keep]
+    best = keep.index(ranked[0])
+
+    # g[s]: cheapest set of full trucks carrying exactly s units
+    inf = math.inf
+    g = [inf] * (q + 1)
+    choice = [-1] * (q + 1)
+    g[0] = 0.0
+    caps = [(i, o["capacity"], full_cost[i]) for i, o in enumerate(options)]
+    for s in range(1, q + 1):
+        gs = inf
+        pick = -1
+        for i, c, cost in caps:
+            if c <= s:
+                cand = g[s - c] + cost
+                if cand < gs:
+                    gs = cand
+                    pick = i
+        g[s] = gs
+        choice[s] = pick
+
+    # One part-loaded truck carries whatever the full trucks leave over
+    best_total = inf
+    best_split = None
+    for s in range(q, -1, -1):
+        if g[s] == inf:
+            continue
+        rest = q - s
+        if rest == 0:
+            total, partial = g[s], None
+        else:
+            fits = [i for i, o in enumerate(options) if o["capacity"] >= rest]
+            if not fits:
+                continue
+            p = min(fits, key=lambda i: options[i]["fixed"] + options[i]["per_unit"] * rest)
+            total, partial = g[s] + options[p]["fixed"] + options[p]["per_unit"] * rest, p
+        if total < best_total:
+            best_total = total
+            best_split = (s, partial)
+
+    if best_split is None:
+        return None
+
+    s, partial = best_split
+    counts = [0] * len(options)
+    counts[best] += extra_best
+    while s > 0:
+        i = choice[s]
+        counts[i] += 1
+        s -= options[i]["capacity"]
+
+    plan = [(options[i]["key"], n, options[i]["capacity"]) for i, n in enumerate(counts) if n]
+    if partial is not None:
+        plan.append((options[partial]["key"], 1, q - best_split[0]))
+    total_cost = best_total + extra_best * full_cost[best]
+    return total_cost, plan
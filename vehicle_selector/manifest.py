@@ -0,0 +1,201 @@
+from itertools import islice
+
+from .batch import best_vehicle_batch
+from .catalog import axle_geometry, vehicle_types
+from .odc_rules import NATIONAL, national_rules
+
+# ----------------------------
+# Manifest upload (chunked)
+# ----------------------------
+
+MANIFEST_REQUIRED = ["length", "width", "height", "weight", "quantity"]
+MANIFEST_CHUNK_SIZE = 5000
+
+def _normalize_columns(columns):
+    return [str(c).strip().lower().replace(" ", "_") for c in columns]
+
+def count_manifest_rows(file, filename):
+    # Cheap row count for the progress bar; leaves the file rewound.
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+        wb = load_workbook(file, read_only=True, data_only=True)
+        rows = wb.active.max_row
+        wb.close()
+        file.seek(0)
+        return max(0, rows - 1) if rows else None
+    lines = 0
+    for block in iter(lambda: file.read(1 << 20), b""):
+        lines += block.count(b"\n")
+    file.seek(0)
+    return max(0, lines - 1)
+
+def iter_manifest_chunks(file, filename, chunk_size=MANIFEST_CHUNK_SIZE):
+    # Yields DataFrames of at most chunk_size rows; the full manifest is never held in memory.
+    import pandas as pd
+
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+        wb = load_workbook(file, read_only=True, data_only=True)
+        rows = wb.active.iter_rows(values_only=True)
+        header = _normalize_columns(next(rows, []))
+        try:
+            while True:
+                block = list(islice(rows, chunk_size))
+                if not block:
+                    break
+                yield pd.DataFrame(block, columns=header)
+        finally:
+            wb.close()
+    else:
+        for chunk in pd.read_csv(file, chunksize=chunk_size):
+            chunk.columns = _normalize_columns(chunk.columns)
+            yield chunk
+
+INVALID_LINE = "⚠️ Invalid line"
+NO_SUITABLE_VEHICLE = "❌ No suitable vehicle"
+
+def _line_errors(chunk, length, width, height, weight, quantity, distance_km):
+    # cli.parse_line's rules, one reason per line (None where the line may be quoted); the first failing check wins
+    import numpy as np
+
+    def numeric(column, values):
+        # Blank cells are missing (optional columns fall back to the default), anything else that did not parse is not a number
+        if column not in chunk.columns:
+            return []
+        blank = chunk[column].isna().to_numpy()
+        checks = [(blank, f"missing {column}")] if column in MANIFEST_REQUIRED else []
+        return checks + [(~blank & np.isnan(values), f"{column} is not a number")]
+
+    checks = []
+    for column, values in zip(MANIFEST_REQUIRED + ["distance_km"], (length, width, height, weight, quantity, distance_km)):
+        checks += numeric(column, values)
+    checks += [
+        (~((quantity >= 1) & (np.mod(quantity, 1) == 0)), "quantity must be a whole number >= 1"),
+        (~(np.isfinite(length) & (length > 0)), "length must be a finite number > 0"),
+        (~(np.isfinite(width) & (width > 0)), "width must be a finite number > 0"),
+        (~(np.isfinite(height) & (height > 0)), "height must be a finite number > 0"),
+        (~(np.isfinite(weight) & (weight >= 0)), "weight must be a finite number >= 0"),
+        (~(np.isfinite(distance_km) & (distance_km >= 0)), "distance_km must be a finite number >= 0"),
+    ]
+    errors = np.full(len(chunk), None, dtype=object)
+    for bad, reason in reversed(checks):
+        errors[np.broadcast_to(bad, len(chunk))] = reason
+    return errors
+
+def _chunk_inputs(chunk, distance_km, allow_stacking, cargo_type):
+    # Engine columns for one chunk and one error (or None) per line; per-line columns
+    # (distance_km, allow_stacking, cargo_type) override the form defaults.
+    import numpy as np
+    import pandas as pd
+
+    missing = [c for c in MANIFEST_REQUIRED if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Manifest is missing column(s): {', '.join(missing)}")
+
+    length, width, height, weight, quantity = (pd.to_numeric(chunk[c], errors="coerce").to_numpy(dtype=float) for c in MANIFEST_REQUIRED)
+    if "distance_km" in chunk.columns:
+        distance_km = pd.to_numeric(chunk["distance_km"], errors="coerce").where(chunk["distance_km"].notna(), distance_km).to_numpy(dtype=float)
+    else:
+        distance_km = np.float64(distance_km)
+    if "allow_stacking" in chunk.columns:
+        allow_stacking = chunk["allow_stacking"].fillna(allow_stacking).astype(str).str.lower().isin(["true", "1", "yes", "y"]).to_numpy()
+    if "cargo_type" in chunk.columns:
+        cargo_type = chunk["cargo_type"].fillna(cargo_type).astype(str).to_numpy(dtype=object)
+    errors = _line_errors(chunk, length, width, height, weight, quantity, distance_km)
+    return (length, width, height, weight, quantity, distance_km, allow_stacking, cargo_type), errors
+
+def _valid(inputs, ok):
+    # The engine columns of the lines that may be quoted (scalar defaults stay scalars)
+    import numpy as np
+
+    return tuple(a[ok] if np.ndim(a) else a for a in inputs)
+
+def rank_manifest_chunk(chunk, distance_km, allow_stacking, cargo_type, catalog=None):
+    # Every ranked vehicle option of every line in one chunk (compute_best_vehicle_batch);
+    # invalid lines are not quoted and get no options
+    import numpy as np
+
+    from .batch import compute_best_vehicle_batch
+
+    inputs, errors = _chunk_inputs(chunk, distance_km, allow_stacking, cargo_type)
+    ok = np.equal(errors, None)
+    ranked = iter(compute_best_vehicle_batch(*_valid(inputs, ok),
+                                             vehicles=catalog.vehicles if catalog is not None else None,
+                                             fragile=catalog.fragile_items if catalog is not None else None,
+                                             axles=catalog.axle_geometry if catalog is not None else axle_geometry)
+                  if ok.any() else [])
+    return [next(ranked) if good else [] for good in ok.tolist()]
+
+def evaluate_manifest_chunk(chunk, distance_km, allow_stacking, cargo_type, catalog=None, route=None, ranked=None):
+    # catalog is a CatalogSnapshot; None means the built-in fleet.
+    # route lists the ODC rule sets the shipment passes through (default: national limits only).
+    # ranked (rank_manifest_chunk for the same chunk) takes each line's best option from it instead of scoring again.
+    # Lines failing cli.parse_line's checks are not quoted: they show as INVALID_LINE with the reason in "error".
+    import numpy as np
+    import pandas as pd
+
+    inputs, errors = _chunk_inputs(chunk, distance_km, allow_stacking, cargo_type)
+    ok = np.equal(errors, None)
+    vehicle = np.full(len(chunk), INVALID_LINE, dtype=object)
+    num_trucks = np.zeros(len(chunk), dtype=np.int64)
+    total_cost = np.full(len(chunk), np.nan)
+    max_units = np.zeros(len(chunk), dtype=np.int64)
+    if ranked is None:
+        if ok.any():
+            best = best_vehicle_batch(*_valid(inputs, ok), catalog.vehicles if catalog is not None else None,
+                                      catalog.fragile_items if catalog is not None else None,
+                                      catalog.axle_geometry if catalog is not None else axle_geometry)
+            vehicle_names = catalog.vehicles.names if catalog is not None else [v["name"] for v in vehicle_types]
+            names = np.array(vehicle_names + [NO_SUITABLE_VEHICLE], dtype=object)
+            vehicle[ok] = names[best["vehicle_index"]]
+            num_trucks[ok] = best["num_trucks"]
+            total_cost[ok] = best["total_cost"]
+            max_units[ok] = best["max_units_per_truck"]
+    else:
+        for i in np.flatnonzero(ok).tolist():
+            if ranked[i]:
+                o = ranked[i][0]
+                vehicle[i], num_trucks[i], total_cost[i], max_units[i] = o["vehicle"], o["num_trucks"], o["total_cost"], o["max_units_per_truck"]
+            else:
+                vehicle[i] = NO_SUITABLE_VEHICLE
+    out = pd.DataFrame({
+        "vehicle": vehicle,
+        "num_trucks": num_trucks,
+        "total_cost": total_cost,
+        "max_units_per_truck": max_units,
+        "error": errors,
+    }, index=chunk.index)
+
+    # One boolean column per ODC severity (odc, escort, ...) over the whole route
+    rules = catalog.odc_rules if catalog is not None else national_rules()
+    flags = rules.evaluate(*inputs[:4])
+    for severity in rules.severities:
+        out[severity] = rules.route_flags(flags, route or [NATIONAL], severity) & ok
+    return out
+
+def manifest_option_rows(chunk, first_line, distance_km, allow_stacking, cargo_type, catalog=None, top=0, ranked=None):
+    # Report rows (export.REPORT_COLUMNS plus "error") for every ranked vehicle option of every line in one chunk;
+    # first_line numbers the chunk's first cargo line. top keeps the N cheapest options per line.
+    # ranked (rank_manifest_chunk for the same chunk) reuses a ranking already computed.
+    # An invalid line gets one row with its input and the reason in "error".
+    import numpy as np
+
+    from .export import option_rows
+
+    inputs, errors = _chunk_inputs(chunk, distance_km, allow_stacking, cargo_type)
+    if ranked is None:
+        ranked = rank_manifest_chunk(chunk, distance_km, allow_stacking, cargo_type, catalog)
+    length, width, height, weight, quantity, distances = (np.broadcast_to(a, len(chunk)).tolist() for a in inputs[:6])
+    rows = []
+    for i, options in enumerate(ranked):
+        if errors[i] is not None:
+            # Only what parsed as a number is echoed back (an unparseable cell is left blank)
+            cargo = {k: v if v == v else None for k, v in (("length", length[i]), ("width", width[i]), ("height", height[i]),
+                                                           ("weight", weight[i]), ("distance_km", distances[i]))}
+            cargo["quantity"] = int(quantity[i]) if float(quantity[i]).is_integer() else None
+            rows.append({"line": first_line + i, **cargo, "error": errors[i]})
+            continue
+        cargo = {"length": length[i], "width": width[i], "height": height[i], "weight": weight[i], "quantity": int(quantity[i]),
+                 "distance_km": distances[i]}
+        rows.extend(option_rows(first_line + i, options, cargo, top))
+    return rows
@@ -0,0 +1,209 @@
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# ----------------------------
+# Per-stage timing metrics
+# ----------------------------
+#
+# One process-wide registry, `metrics`, shared by every Streamlit session.
+# Code wraps each stage of the recommendation flow in `metrics.stage(name)`;
+# while metrics are disabled (the default) that returns a shared no-op
+# context manager, so instrumented hot paths cost one attribute check.
+#
+# When enabled, each stage keeps:
+#   * cumulative Prometheus histogram buckets, sum and count
+#   * a rolling window of the last WINDOW samples for p50/p90/p99
+# and every `metrics.request(label)` block becomes one record (stage timings,
+# total, label) in a ring of the last RECENT requests, optionally appended to
+# a JSONL log.
+
+BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]  # seconds
+WINDOW = 1024
+RECENT = 50
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL = _NullStage()
+
+class _Stage:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+class _Request:
+    def __init__(self, metrics, label):
+        self.metrics = metrics
+        self.record = {"label": label, "stages": {}}
+
+    def __enter__(self):
+        self.metrics._local.request = self.record
+        self.record["time"] = time.time()
+        self.start = time.perf_counter()
+        return self.record
+
+    def __exit__(self, *exc):
+        self.record["total_ms"] = round((time.perf_counter() - self.start) * 1000, 3)
+        self.metrics._local.request = None
+        self.metrics._finish(self.record)
+        return False
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.window = deque(maxlen=WINDOW)
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        self.window.append(seconds)
+
+    def quantiles(self, qs=(0.5, 0.9, 0.99)):
+        ordered = sorted(self.window)
+        if not ordered:
+            return [None for _ in qs]
+        return [ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in qs]
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.log_path = None
+        self._histograms = {}
+        self._recent = deque(maxlen=RECENT)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def configure(self, enabled=True, log_path=None, recent=RECENT):
+        # log_path: append one JSON line per request
+        self.enabled = enabled
+        self.log_path = log_path
+        with self._lock:
+            self._recent = deque(self._recent, maxlen=recent)
+        return self
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL
+        return _Stage(self, name)
+
+    def request(self, label=""):
+        if not self.enabled:
+            return _NULL
+        return _Request(self, label)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = _Histogram()
+            histogram.add(seconds)
+        request = getattr(self._local, "request", None)
+        if request is not None:
+            # A stage can run more than once per request (e.g. chunks); times add up
+            stages = request["stages"]
+            stages[name] = round(stages.get(name, 0.0) + seconds * 1000, 3)
+
+    def annotate(self, **fields):
+        # Extra fields (cache hit, option count, ...) for the request in progress on this thread
+        request = getattr(self._local, "request", None) if self.enabled else None
+        if request is not None:
+            request.update(fields)
+
+    def _finish(self, record):
+        self.observe("request", record["total_ms"] / 1000)
+        with self._lock:
+            self._recent.append(record)
+        if self.log_path:
+            with self._lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def recent(self):
+        with self._lock:
+            return list(self._recent)[::-1]
+
+    def summary(self):
+        # One row per stage over the rolling window, slowest p90 first
+        with self._lock:
+            rows = []
+            for name, h in self._histograms.items():
+                p50, p90, p99 = h.quantiles()
+                rows.append({"stage": name, "count": h.count, "p50_ms": round(p50 * 1000, 3), "p90_ms": round(p90 * 1000, 3),
+                             "p99_ms": round(p99 * 1000, 3), "mean_ms": round(h.sum / h.count * 1000, 3)})
+        return sorted(rows, key=lambda r: -r["p90_ms"])
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._recent.clear()
+
+    # ----------------------------
+    # Prometheus exposition
+    # ----------------------------
+
+    def prometheus_text(self, prefix="artson_stage"):
+        lines = [f"# HELP {prefix}_seconds Time spent per recommendation stage.", f"# TYPE {prefix}_seconds histogram"]
+        with self._lock:
+            for name in sorted(self._histograms):
+                h = self._histograms[name]
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ["+Inf"], h.counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_seconds_sum{{stage="{name}"}} {h.sum:.6f}')
+                lines.append(f'{prefix}_seconds_count{{stage="{name}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # Atomic replace, for node_exporter's textfile collector
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+    def serve_prometheus(self, port, host="127.0.0.1"):
+        # /metrics on a daemon thread; returns the server (call shutdown() to stop)
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+metrics = Metrics()
@@ -0,0 +1,316 @@
+import math
+import time
+
+from .catalog import fragile_items, vehicle_types
+from .engine import classify_vehicle
+from .packing import units_per_vehicle
+
+# ----------------------------
+# Multi-drop route planning (yard -> several project sites)
+# ----------------------------
+#
+# sites: one dict per site with a name, an items list (length, width, height,
+# weight, quantity and an optional cargo_type per line) and an optional
+# site-wide cargo_type for lines without one. distances: square
+# matrix in km, index 0 is the yard and index i the i-th site; it may be
+# asymmetric (one-way roads).
+#
+# A site's demand on a vehicle type is (load fraction, weight): each cargo
+# line uses quantity / units_per_vehicle of the deck, and loads are treated as
+# divisible by that fraction (mixed SKUs are not packed exactly here).
+#
+# For every vehicle type that can serve the sites:
+#   1. demand above one truckload goes out as full direct trucks
+#   2. Clarke-Wright savings merge the rest into tours (directed savings, so
+#      one-way distances are fine)
+#   3. local search (relocate between tours, 2-opt inside a tour) shortens
+#      tours until nothing improves or the time / iteration budget runs out
+#   4. each tour is moved to the cheapest type that can carry it
+# and the cheapest plan wins. Sites the type cannot serve get direct trucks
+# of the cheapest type that can.
+#
+# Tour cost uses the same rates as compute_best_vehicle, on tonne-km actually
+# carried: cost_per_km * tour km + cost_per_tkm * sum(load on leg x leg km).
+
+DEFAULT_BUDGET_S = 2.0
+EPS = 1e-9
+
+def _site_demand(site, vehicle, allow_stacking, fragile, cargo_type):
+    # (load fraction, weight kg) of a site on one vehicle, or None if it cannot carry it;
+    # one fragile line keeps the whole site off open vehicles
+    fraction = weight = 0.0
+    for item in site["items"]:
+        if not vehicle["has_sidewalls"] and item.get("cargo_type", site.get("cargo_type", cargo_type)) in fragile:
+            return None
+        units = units_per_vehicle(item["length"], item["width"], item["height"], vehicle, allow_stacking)
+        if units == 0 or item["weight"] > vehicle["max_weight"]:
+            return None
+        fraction += item["quantity"] / units
+        weight += item["weight"] * item["quantity"]
+    return fraction, weight
+
+def _trucks_for(demand, vehicle):
+    return max(1, math.ceil(max(demand[0], demand[1] / vehicle["max_weight"]) - EPS))
+
+def _tour_km(tour, d):
+    prev, km = 0, 0.0
+    for c in tour:
+        km += d[prev][c]
+        prev = c
+    return km + d[prev][0]
+
+def _tour_cost(tour, loads, d, vehicle):
+    # loads[c]: weight in kg dropped at site c
+    remaining = sum(loads[c] for c in tour)
+    prev, km, tkm = 0, 0.0, 0.0
+    for c in tour:
+        km += d[prev][c]
+        tkm += remaining / 1000 * d[prev][c]
+        remaining -= loads[c]
+        prev = c
+    km += d[prev][0]
+    return vehicle["cost_per_km"] * km + vehicle["cost_per_tkm"] * tkm, km
+
+def _savings(customers, d):
+    # Directed Clarke-Wright savings s(i, j) = d[i][0] + d[0][j] - d[i][j], best first;
+    # independent of the vehicle type, so sorted once per plan
+    return sorted(
+        ((d[i][0] + d[0][j] - d[i][j], i, j) for i in customers for j in customers if i != j and d[i][0] + d[0][j] > d[i][j]),
+        reverse=True
+    )
+
+def _savings_tours(customers, demand, savings, cap_weight):
+    tour_of = {c: [c] for c in customers}
+    load = {c: demand[c] for c in customers}
+    for s, i, j in savings:
+        if i not in tour_of or j not in tour_of:
+            continue
+        a, b = tour_of[i], tour_of[j]
+        # i must end its tour and j start another one
+        if a is b or a[-1] != i or b[0] != j:
+            continue
+        la, lb = load[a[0]], load[b[0]]
+        if la[0] + lb[0] > 1 + EPS or la[1] + lb[1] > cap_weight + EPS:
+            continue
+        merged = a + b
+        combined = (la[0] + lb[0], la[1] + lb[1])
+        for c in merged:
+            tour_of[c] = merged
+        load[merged[0]] = combined
+    seen, tours = set(), []
+    for c in customers:
+        t = tour_of[c]
+        if id(t) not in seen:
+            seen.add(id(t))
+            tours.append(t)
+    return tours
+
+def _two_opt(tour, d, deadline):
+    # Full re-evaluation per move, so reversed segments are priced right on one-way roads
+    best, best_km = tour, _tour_km(tour, d)
+    improved = True
+    while improved and time.monotonic() <= deadline:
+        improved = False
+        for i in range(len(best) - 1):
+            for j in range(i + 1, len(best)):
+                cand = best[:i] + best[i:j + 1][::-1] + best[j + 1:]
+                km = _tour_km(cand, d)
+                if km < best_km - EPS:
+                    best, best_km, improved = cand, km, True
+    return best
+
+def _relocate_pass(tours, demand, d, cap_weight, deadline):
+    # Moves single sites to the cheapest feasible position in another tour; True if anything moved.
+    loads = [[sum(demand[c][0] for c in t), sum(demand[c][1] for c in t)] for t in tours]
+    moved = False
+    for ta in range(len(tours)):
+        a = tours[ta]
+        pos = 0
+        while pos < len(a):
+            if time.monotonic() > deadline:
+                return moved
+            c = a[pos]
+            prev = a[pos - 1] if pos > 0 else 0
+            nxt = a[pos + 1] if pos + 1 < len(a) else 0
+            gain = d[prev][c] + d[c][nxt] - d[prev][nxt]
+            best = None
+            for tb, b in enumerate(tours):
+                if tb == ta or not b:
+                    continue
+                if loads[tb][0] + demand[c][0] > 1 + EPS or loads[tb][1] + demand[c][1] > cap_weight + EPS:
+                    continue
+                for k in range(len(b) + 1):
+                    p = b[k - 1] if k > 0 else 0
+                    n = b[k] if k < len(b) else 0
+                    cost = d[p][c] + d[c][n] - d[p][n]
+                    if cost < gain - EPS and (best is None or cost < best[0]):
+                        best = (cost, tb, k)
+            if best is None:
+                pos += 1
+                continue
+            _, tb, k = best
+            a.pop(pos)
+            tours[tb].insert(k, c)
+            loads[ta][0] -= demand[c][0]
+            loads[ta][1] -= demand[c][1]
+            loads[tb][0] += demand[c][0]
+            loads[tb][1] += demand[c][1]
+            moved = True
+    tours[:] = [t for t in tours if t]
+    return moved
+
+def _improve(tours, demand, d, cap_weight, deadline, max_iterations):
+    iterations = 0
+    complete = True
+    while True:
+        if time.monotonic() > deadline or (max_iterations is not None and iterations >= max_iterations):
+            complete = False
+            break
+        iterations += 1
+        moved = _relocate_pass(tours, demand, d, cap_weight, deadline)
+        for i, t in enumerate(tours):
+            if time.monotonic() > deadline:
+                break
+            if len(t) > 2:
+                tours[i] = _two_opt(t, d, deadline)
+        if not moved:
+            break
+    return tours, iterations, complete
+
+def plan_multi_drop(sites, distances, allow_stacking=False, cargo_type="Standard Steel Fabrication", vehicles=None, fragile=None,
+                    time_budget=DEFAULT_BUDGET_S, max_iterations=None):
+    # Cheapest set of truck tours from the yard (index 0) delivering every site's cargo.
+    if hasattr(vehicles, "skyline_vehicles"):
+        vehicles = vehicles.skyline_vehicles()
+    vehicles = list(vehicles if vehicles is not None else vehicle_types)
+    fragile = fragile if fragile is not None else fragile_items
+    d = [list(map(float, row)) for row in distances]
+    n = len(sites)
+    if len(d) != n + 1 or any(len(row) != n + 1 for row in d):
+        raise ValueError(f"distance matrix must be {n + 1} x {n + 1} (yard + {n} sites)")
+    customers = list(range(1, n + 1))
+
+    # demand[v][c] for every vehicle type and site (None: this type cannot serve the site)
+    demand = [{c: _site_demand(sites[c - 1], v, allow_stacking, fragile, cargo_type) for c in customers} for v in vehicles]
+    unserved = [sites[c - 1]["name"] for c in customers if all(dem[c] is None for dem in demand)]
+
+    def direct(c, vi, trucks_demand):
+        # Out-and-back trucks for one site on vehicle type vi
+        v = vehicles[vi]
+        trucks = _trucks_for(trucks_demand, v)
+        per_truck = trucks_demand[1] / trucks
+        cost = trucks * (v["cost_per_km"] * (d[0][c] + d[c][0]) + v["cost_per_tkm"] * per_truck / 1000 * d[0][c])
+        return {"vehicle": v["name"], "trucks": trucks, "stops": [c], "distance_km": d[0][c] + d[c][0],
+                "weight": trucks_demand[1], "load_fraction": trucks_demand[0] / trucks, "cost": cost}
+
+    def cheapest_direct(c):
+        options = [direct(c, vi, dem[c]) for vi, dem in enumerate(demand) if dem[c] is not None]
+        return min(options, key=lambda r: r["cost"])
+
+    deadline_total = time.monotonic() + time_budget if time_budget is not None else math.inf
+    candidates = [vi for vi, dem in enumerate(demand) if any(dem[c] is not None for c in customers)]
+    savings = _savings([c for c in customers if sites[c - 1]["name"] not in unserved], d)
+    best_plan = None
+    complete = True
+    iterations = 0
+    for rank, vi in enumerate(candidates):
+        v = vehicles[vi]
+        dem = demand[vi]
+        # Share what is left of the budget among the remaining vehicle types
+        remaining = deadline_total - time.monotonic()
+        deadline = time.monotonic() + remaining / (len(candidates) - rank) if remaining != math.inf else math.inf
+
+        trips, routed, ratio = [], {}, {}
+        for c in customers:
+            if sites[c - 1]["name"] in unserved:
+                continue
+            if dem[c] is None:
+                trips.append(cheapest_direct(c))
+                continue
+            trucks = _trucks_for(dem[c], v)
+            # Full trucks go direct; the last 1/trucks share joins the tours
+            ratio[c] = 1 / trucks
+            routed[c] = (dem[c][0] * ratio[c], dem[c][1] * ratio[c])
+            if trucks > 1:
+                trips.append(direct(c, vi, (dem[c][0] - routed[c][0], dem[c][1] - routed[c][1])))
+
+        tours = _savings_tours(list(routed), routed, savings, v["max_weight"])
+        tours, used, done = _improve(tours, routed, d, v["max_weight"], deadline, max_iterations)
+        iterations += used
+        complete = complete and done
+
+        for tour in tours:
+            loads = {c: routed[c][1] for c in tour}
+            weight = sum(loads.values())
+            # Move the tour to the cheapest type that can carry it
+            best_tour = None
+            for wi in candidates:
+                w, wdem = vehicles[wi], demand[wi]
+                if weight > w["max_weight"] + EPS or any(wdem[c] is None for c in tour):
+                    continue
+                fraction = sum(wdem[c][0] * ratio[c] for c in tour)
+                if fraction > 1 + EPS:
+                    continue
+                cost, km = _tour_cost(tour, loads, d, w)
+                if best_tour is None or cost < best_tour["cost"]:
+                    best_tour = {"vehicle": w["name"], "trucks": 1, "stops": list(tour), "distance_km": km,
+                                 "weight": weight, "load_fraction": fraction, "cost": cost}
+            # Separate trucks per site can still be cheaper (small vs. large vehicle rates)
+            singles = [min((direct(c, wi, (demand[wi][c][0] * ratio[c], demand[wi][c][1] * ratio[c]))
+                            for wi in candidates if demand[wi][c] is not None), key=lambda r: r["cost"]) for c in tour]
+            if len(tour) > 1 and sum(r["cost"] for r in singles) < best_tour["cost"]:
+                trips.extend(singles)
+            else:
+                trips.append(best_tour)
+
+        total = sum(t["cost"] for t in trips)
+        if best_plan is None or total < best_plan[0]:
+            best_plan = (total, trips)
+
+    trips = best_plan[1] if best_plan else []
+    for t in trips:
+        t["class"] = classify_vehicle(t["vehicle"])
+        t["stops"] = [sites[c - 1]["name"] for c in t["stops"]]
+        t["distance_km"] = round(t["distance_km"], 2)
+        t["weight"] = round(t["weight"], 1)
+        t["load_fraction"] = round(t["load_fraction"], 3)
+        t["cost"] = round(t["cost"], 2)
+    trips.sort(key=lambda t: (-len(t["stops"]), t["stops"]))
+    return {
+        "tours": trips,
+        "total_cost": round(sum(t["cost"] for t in trips), 2),
+        "num_trucks": sum(t["trucks"] for t in trips),
+        "total_km": round(sum(t["distance_km"] * t["trucks"] for t in trips), 2),
+        "unserved": unserved,
+        "iterations": iterations,
+        "complete": complete,
+    }
+
+# ----------------------------
+# CSV inputs (CLI and app)
+# ----------------------------
+
+def prepare_instance(cargo_rows, matrix_rows):
+    # cargo_rows: dicts with site, length, width, height, weight, quantity[, cargo_type], one per cargo line.
+    # matrix_rows: CSV rows of a labelled square matrix, header ",Yard,Site A,..." with the yard first.
+    # Returns (sites, distances) in matrix order; matrix places without cargo are dropped.
+    header = [h.strip() for h in matrix_rows[0][1:]]
+    labels = [r[0].strip() for r in matrix_rows[1:]]
+    if header != labels:
+        raise ValueError("distance matrix row labels must match its header")
+    position = {name: i for i, name in enumerate(header)}
+
+    sites = {}
+    for n, row in enumerate(cargo_rows, start=1):
+        row = {str(k).strip().lower(): v for k, v in row.items() if k is not None}
+        name = str(row.get("site") or "").strip()
+        if name not in position or position[name] == 0:
+            raise ValueError(f"cargo line {n}: site {name!r} is not a destination in the distance matrix")
+        item = {k: float(row[k]) for k in ("length", "width", "height", "weight")} | {"quantity": int(float(row["quantity"]))}
+        if row.get("cargo_type"):
+            item["cargo_type"] = row["cargo_type"]
+        sites.setdefault(name, {"name": name, "items": []})["items"].append(item)
+
+    order = [0] + sorted(position[name] for name in sites)
+    distances = [[float(matrix_rows[i + 1][j + 1]) for j in order] for i in order]
+    return [sites[header[i]] for i in order[1:]], distances
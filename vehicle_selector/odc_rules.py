@@ -0,0 +1,104 @@
+import numpy as np
+
+from .catalog import ODC_LIMITS
+
+# ----------------------------
+# Rule-table ODC / permit engine
+# ----------------------------
+#
+# A rule says "in rule set S (a state, a route leg), cargo whose D exceeds L
+# triggers SEVERITY" (odc, escort, ...). Rules are stored as columns and a
+# whole manifest is checked in one broadcast: margins[i, r] = value - limit.
+# Flags are reduced to a (cargo x rule set) boolean per severity, and
+# human-readable messages are only built for the rows a view actually shows.
+
+DIMENSIONS = ["length", "width", "height", "weight"]
+UNITS = {"length": "m", "width": "m", "height": "m", "weight": "kg"}
+NATIONAL = "National (CMVR)"
+
+class RuleTable:
+    def __init__(self, rules):
+        # rules: iterable of dicts with rule_set, dimension, limit and optional severity (default "odc")
+        rules = sorted(
+            ({**r, "dimension": r["dimension"].strip().lower(), "severity": (r.get("severity") or "odc").strip().lower()} for r in rules),
+            key=lambda r: r["rule_set"]
+        )
+        for r in rules:
+            if r["dimension"] not in DIMENSIONS:
+                raise ValueError(f"unknown ODC rule dimension: {r['dimension']!r}")
+        self.rules = rules
+        self.rule_sets = list(dict.fromkeys(r["rule_set"] for r in rules))
+        self.severities = list(dict.fromkeys(r["severity"] for r in rules))
+
+        set_index = {name: i for i, name in enumerate(self.rule_sets)}
+        self.rule_set = np.array([set_index[r["rule_set"]] for r in rules], dtype=np.int64)
+        self.dimension = np.array([DIMENSIONS.index(r["dimension"]) for r in rules], dtype=np.int64)
+        self.limit = np.array([r["limit"] for r in rules], dtype=float)
+        # (rule x rule set) membership per severity, for the matrix reduction in evaluate;
+        # float32 so the product runs through BLAS (integer matmul is ~10x slower)
+        self._membership = {}
+        for sev in self.severities:
+            m = np.zeros((len(rules), len(self.rule_sets)), dtype=np.float32)
+            for i, r in enumerate(rules):
+                if r["severity"] == sev:
+                    m[i, set_index[r["rule_set"]]] = 1
+            self._membership[sev] = m
+
+    @classmethod
+    def from_limits(cls, limits, rule_set=NATIONAL, extra_rules=()):
+        # The flat ODC_LIMITS dict as one rule set, plus any state / route rules
+        return cls([{"rule_set": rule_set, "dimension": d, "limit": limits[d], "severity": "odc"} for d in DIMENSIONS if d in limits]
+                   + list(extra_rules))
+
+    def __len__(self):
+        return len(self.rules)
+
+    def evaluate(self, lengths, widths, heights, weights):
+        # margins (cargo x rule) and, per severity, a (cargo x rule set) flag matrix.
+        values = np.column_stack([np.atleast_1d(np.asarray(x, dtype=float)) for x in (lengths, widths, heights, weights)])
+        margins = values[:, self.dimension] - self.limit
+        exceeded = margins > 0
+        hits = exceeded.astype(np.float32)
+        flags = {sev: (hits @ m) > 0 for sev, m in self._membership.items()}
+        return {"values": values, "margins": margins, "exceeded": exceeded, "flags": flags}
+
+    def set_mask(self, rule_sets):
+        # Boolean mask over rule sets for a route (the rule sets it passes through)
+        wanted = set(rule_sets)
+        missing = wanted - set(self.rule_sets)
+        if missing:
+            raise KeyError(f"unknown rule set(s): {', '.join(sorted(missing))}")
+        return np.array([name in wanted for name in self.rule_sets])
+
+    def route_flags(self, result, rule_sets, severity="odc"):
+        # Per cargo line: does any rule set on the route flag it at this severity
+        flags = result["flags"].get(severity)
+        if flags is None:
+            return np.zeros(result["values"].shape[0], dtype=bool)
+        return flags[:, self.set_mask(rule_sets)].any(axis=1)
+
+    def messages(self, result, row, rule_set=NATIONAL, severity="odc"):
+        # check_odc-style {"Length": "13.0 m > 12.0 m"} for one row and rule set; formatting is per displayed row only
+        out = {}
+        for r in np.flatnonzero(result["exceeded"][row]).tolist():
+            rule = self.rules[r]
+            if rule["rule_set"] != rule_set or rule["severity"] != severity:
+                continue
+            dim = rule["dimension"]
+            value = result["values"][row, self.dimension[r]].item()
+            out[dim.capitalize()] = f"{value} {UNITS[dim]} > {rule['limit']} {UNITS[dim]}"
+        return out
+
+    def summary(self, result, row):
+        # Every flagged rule for one row, for a per-state breakdown table
+        return [{
+            "rule_set": self.rules[r]["rule_set"],
+            "severity": self.rules[r]["severity"],
+            "dimension": self.rules[r]["dimension"],
+            "value": result["values"][row, self.dimension[r]].item(),
+            "limit": self.rules[r]["limit"],
+            "margin": round(result["margins"][row, r].item(), 3),
+        } for r in np.flatnonzero(result["exceeded"][row]).tolist()]
+
+def national_rules():
+    return RuleTable.from_limits(ODC_LIMITS)
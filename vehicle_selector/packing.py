@@ -0,0 +1,334 @@
+import math
+import random
+import time
+from itertools import permutations
+
+# ----------------------------
+# 3D packing engine
+# ----------------------------
+#
+# Two levels of packing are used by the vehicle selector:
+#
+# * units_per_vehicle() answers "how many identical units fit in one vehicle".
+#   It tries every allowed orientation, places the largest grid block it can and
+#   fills the leftover slabs with their own best grid (a two-stage guillotine
+#   cut). It is deterministic and cheap enough for every candidate vehicle, and
+#   units_per_vehicle_array() evaluates the same rule with NumPy for manifests.
+#
+# * pack_shipment() loads mixed cargo (several SKUs) into as few copies of one
+#   vehicle as it can, using an extreme-point, first-fit-decreasing heuristic
+#   that honours stacking and the vehicle weight limit under a time budget.
+#   Only loads packed to the end are repeated; when the deadline cuts a load
+#   short, the plan is marked incomplete and the units left over are estimated
+#   from the fullest load packed so far.
+
+EPS = 1e-9
+
+FAST_BUDGET_S = 0.15       # interactive: one deadline for all candidate vehicles, ~200 ms per recommendation
+THOROUGH_BUDGET_S = 30.0   # overnight planning runs
+MAX_STALE_PERTURBATIONS = 200
+
+def orientations(length, width, height, allow_tipping=False):
+    # Upright cargo may only be turned about the vertical axis; tipping allows all six.
+    if allow_tipping:
+        dims = set(permutations((length, width, height)))
+    else:
+        dims = {(length, width, height), (width, length, height)}
+    return sorted(dims, reverse=True)
+
+def _grid(space_l, space_w, space_h, a, b, c, allow_stacking):
+    nl = math.floor((space_l + EPS) / a)
+    nw = math.floor((space_w + EPS) / b)
+    nh = math.floor((space_h + EPS) / c)
+    if not allow_stacking:
+        nh = min(nh, 1)
+    return nl, nw, nh
+
+def _best_grid(space_l, space_w, space_h, dims, allow_stacking):
+    best = 0
+    for a, b, c in dims:
+        nl, nw, nh = _grid(space_l, space_w, space_h, a, b, c, allow_stacking)
+        best = max(best, nl * nw * nh)
+    return best
+
+def units_per_vehicle(length, width, height, vehicle, allow_stacking, allow_tipping=False):
+    L, W, H = vehicle["max_length"], vehicle["max_width"], vehicle["max_height"]
+    dims = orientations(length, width, height, allow_tipping)
+    best = 0
+    for a, b, c in dims:
+        nl, nw, nh = _grid(L, W, H, a, b, c, allow_stacking)
+        main = nl * nw * nh
+        if main == 0:
+            continue
+        used_l, used_w, used_h = nl * a, nw * b, nh * c
+        top = _best_grid(used_l, used_w, H - used_h, dims, allow_stacking) if allow_stacking else 0
+        # Length-first and width-first guillotine cuts of the leftover floor
+        split_l = _best_grid(L - used_l, W, H, dims, allow_stacking) + _best_grid(used_l, W - used_w, H, dims, allow_stacking)
+        split_w = _best_grid(L, W - used_w, H, dims, allow_stacking) + _best_grid(L - used_l, used_w, H, dims, allow_stacking)
+        best = max(best, main + top + max(split_l, split_w))
+    return best
+
+def _grid_boxes(x0, y0, z0, space_l, space_w, space_h, dims, allow_stacking):
+    # Unit boxes of the best single-orientation grid in one space (the layout _best_grid counts)
+    import numpy as np
+
+    best = None
+    for a, b, c in dims:
+        nl, nw, nh = _grid(space_l, space_w, space_h, a, b, c, allow_stacking)
+        if best is None or nl * nw * nh > best[0]:
+            best = (nl * nw * nh, a, b, c, nl, nw, nh)
+    if best is None or best[0] <= 0:
+        return np.empty((0, 6))
+    _, a, b, c, nl, nw, nh = best
+    ix, iy, iz = np.meshgrid(np.arange(nl), np.arange(nw), np.arange(nh), indexing="ij")
+    x, y, z = x0 + ix.ravel() * a, y0 + iy.ravel() * b, z0 + iz.ravel() * c
+    return np.column_stack([x, y, z, x + a, y + b, z + c])
+
+def unit_boxes(length, width, height, vehicle, allow_stacking, allow_tipping=False):
+    # (units_per_vehicle, 6) array of unit boxes (x0, y0, z0, x1, y1, z1; x from the deck front,
+    # y from the left side, z from the deck) for the layout units_per_vehicle counts.
+    import numpy as np
+
+    L, W, H = vehicle["max_length"], vehicle["max_width"], vehicle["max_height"]
+    dims = orientations(length, width, height, allow_tipping)
+    best = None
+    for a, b, c in dims:
+        nl, nw, nh = _grid(L, W, H, a, b, c, allow_stacking)
+        main = nl * nw * nh
+        if main == 0:
+            continue
+        used_l, used_w, used_h = nl * a, nw * b, nh * c
+        top = _best_grid(used_l, used_w, H - used_h, dims, allow_stacking) if allow_stacking else 0
+        split_l = _best_grid(L - used_l, W, H, dims, allow_stacking) + _best_grid(used_l, W - used_w, H, dims, allow_stacking)
+        split_w = _best_grid(L, W - used_w, H, dims, allow_stacking) + _best_grid(L - used_l, used_w, H, dims, allow_stacking)
+        total = main + top + max(split_l, split_w)
+        if best is None or total > best[0]:
+            best = (total, a, b, c, nl, nw, nh, split_l >= split_w)
+    if best is None:
+        return np.empty((0, 6))
+
+    _, a, b, c, nl, nw, nh, length_first = best
+    used_l, used_w, used_h = nl * a, nw * b, nh * c
+    blocks = [_grid_boxes(0.0, 0.0, 0.0, used_l, used_w, used_h, [(a, b, c)], allow_stacking)]
+    if allow_stacking:
+        blocks.append(_grid_boxes(0.0, 0.0, used_h, used_l, used_w, H - used_h, dims, allow_stacking))
+    if length_first:
+        blocks += [_grid_boxes(used_l, 0.0, 0.0, L - used_l, W, H, dims, allow_stacking),
+                   _grid_boxes(0.0, used_w, 0.0, used_l, W - used_w, H, dims, allow_stacking)]
+    else:
+        blocks += [_grid_boxes(0.0, used_w, 0.0, L, W - used_w, H, dims, allow_stacking),
+                   _grid_boxes(used_l, 0.0, 0.0, L - used_l, used_w, H, dims, allow_stacking)]
+    return np.concatenate(blocks)
+
+def units_per_vehicle_array(lengths, widths, heights, max_length, max_width, max_height, allow_stacking, allow_tipping=False):
+    # NumPy mirror of units_per_vehicle; all arguments broadcast against each other.
+    import numpy as np
+
+    l, w, h = np.broadcast_arrays(lengths, widths, heights)
+    stack = np.asarray(allow_stacking, dtype=bool)
+    if allow_tipping:
+        dims = [(l, w, h), (l, h, w), (w, l, h), (w, h, l), (h, l, w), (h, w, l)]
+    else:
+        dims = [(l, w, h), (w, l, h)]
+
+    def grid(space_l, space_w, space_h, a, b, c):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            nl = np.floor((space_l + EPS) / a)
+            nw = np.floor((space_w + EPS) / b)
+            nh = np.floor((space_h + EPS) / c)
+        return nl, nw, np.where(stack, nh, np.minimum(nh, 1))
+
+    def best_grid(space_l, space_w, space_h):
+        best = 0
+        for a, b, c in dims:
+            nl, nw, nh = grid(space_l, space_w, space_h, a, b, c)
+            best = np.maximum(best, nl * nw * nh)
+        return best
+
+    best = 0
+    for a, b, c in dims:
+        nl, nw, nh = grid(max_length, max_width, max_height, a, b, c)
+        main = nl * nw * nh
+        used_l, used_w, used_h = nl * a, nw * b, nh * c
+        top = np.where(stack, best_grid(used_l, used_w, max_height - used_h), 0)
+        split_l = best_grid(max_length - used_l, max_width, max_height) + best_grid(used_l, max_width - used_w, max_height)
+        split_w = best_grid(max_length, max_width - used_w, max_height) + best_grid(max_length - used_l, used_w, max_height)
+        best = np.maximum(best, np.where(main > 0, main + top + np.maximum(split_l, split_w), 0))
+    return best.astype(np.int64)
+
+# ----------------------------
+# Mixed cargo: extreme-point packing
+# ----------------------------
+
+def _overlaps(box, placed):
+    x0, y0, z0, x1, y1, z1 = box
+    for p in placed:
+        if x0 < p[3] - EPS and p[0] < x1 - EPS and y0 < p[4] - EPS and p[1] < y1 - EPS and z0 < p[5] - EPS and p[2] < z1 - EPS:
+            return True
+    return False
+
+def _supported(box, placed):
+    # Stacked units must rest fully on the tops of units directly below them.
+    x0, y0, z0, x1, y1, z1 = box
+    if z0 <= EPS:
+        return True
+    area = 0.0
+    for p in placed:
+        if abs(p[5] - z0) <= EPS:
+            dx = min(x1, p[3]) - max(x0, p[0])
+            dy = min(y1, p[4]) - max(y0, p[1])
+            if dx > EPS and dy > EPS:
+                area += dx * dy
+    return area >= (x1 - x0) * (y1 - y0) - 1e-6
+
+def _pack_one(order, remaining, skus, vehicle, allow_stacking, allow_tipping, deadline):
+    L, W, H = vehicle["max_length"], vehicle["max_width"], vehicle["max_height"]
+    max_weight = vehicle["max_weight"]
+    placed = []
+    placements = []
+    points = [(0.0, 0.0, 0.0)]
+    load_weight = 0.0
+    loaded = [0] * len(skus)
+    timed_out = False
+
+    for idx in order:
+        sku = skus[idx]
+        dims = orientations(sku["length"], sku["width"], sku["height"], allow_tipping)
+        while loaded[idx] < remaining[idx]:
+            if time.perf_counter() > deadline:
+                timed_out = True
+                break
+            if load_weight + sku["weight"] > max_weight + EPS:
+                break
+            spot = None
+            for x, y, z in points:
+                if z > EPS and not allow_stacking:
+                    continue
+                for a, b, c in dims:
+                    box = (x, y, z, x + a, y + b, z + c)
+                    if box[3] > L + EPS or box[4] > W + EPS or box[5] > H + EPS:
+                        continue
+                    if _overlaps(box, placed) or not _supported(box, placed):
+                        continue
+                    spot = box
+                    break
+                if spot:
+                    break
+            if spot is None:
+                break
+
+            placed.append(spot)
+            placements.append((idx,) + spot)
+            load_weight += sku["weight"]
+            loaded[idx] += 1
+            x0, y0, z0, x1, y1, z1 = spot
+            points.remove((x0, y0, z0))
+            points.extend([(x1, y0, z0), (x0, y1, z0)] + ([(x0, y0, z1)] if allow_stacking else []))
+            points = sorted(set(points), key=lambda p: (p[2], p[0], p[1]))
+        if timed_out:
+            break
+
+    return loaded, placements, load_weight, timed_out
+
+def _pack_all(order, skus, vehicle, allow_stacking, allow_tipping, deadline):
+    remaining = [s["quantity"] for s in skus]
+    loads = []
+    complete = True
+    while any(remaining):
+        if time.perf_counter() > deadline:
+            complete = False
+            break
+        loaded, placements, load_weight, timed_out = _pack_one(order, remaining, skus, vehicle, allow_stacking, allow_tipping, deadline)
+        if timed_out:
+            # A load cut short is not a real truckload: it is neither kept nor repeated
+            complete = False
+            break
+        if not placements:
+            break
+        # The same load pattern can be repeated while enough of every SKU remains
+        repeat = min(remaining[i] // n for i, n in enumerate(loaded) if n)
+        remaining = [r - n * repeat for r, n in zip(remaining, loaded)]
+        loads.append({"count": repeat, "placements": placements, "weight": load_weight, "units": sum(loaded)})
+    return loads, remaining, complete
+
+def _score(loads, remaining):
+    vehicles = sum(load["count"] for load in loads)
+    last = min((load["units"] for load in loads), default=0)
+    return (sum(remaining), vehicles, last)
+
+SORT_KEYS = [
+    lambda s: s["length"] * s["width"] * s["height"],
+    lambda s: s["length"] * s["width"],
+    lambda s: s["height"],
+    lambda s: max(s["length"], s["width"]),
+    lambda s: s["weight"],
+]
+
+def pack_shipment(items, vehicle, allow_stacking, thorough=False, time_budget=None, allow_tipping=False, seed=0, deadline=None):
+    # items: dicts with length, width, height, weight and quantity (one per SKU).
+    # deadline (a time.perf_counter() value) overrides time_budget, so several vehicles can share one.
+    skus = [dict(item) for item in items if item["quantity"] > 0]
+    if deadline is None:
+        budget = time_budget if time_budget is not None else (THOROUGH_BUDGET_S if thorough else FAST_BUDGET_S)
+        deadline = time.perf_counter() + budget
+
+    # SKUs that cannot go on this vehicle at all are reported rather than packed
+    unplaceable = {}
+    for i, s in enumerate(skus):
+        if s["weight"] > vehicle["max_weight"] or units_per_vehicle(s["length"], s["width"], s["height"], vehicle, allow_stacking, allow_tipping) == 0:
+            unplaceable[i] = s["quantity"]
+    packable = [i for i in range(len(skus)) if i not in unplaceable]
+
+    orders = [sorted(packable, key=lambda i, key=key: key(skus[i]), reverse=True) for key in (SORT_KEYS if thorough else SORT_KEYS[:1])]
+    best = None
+    rng = random.Random(seed)
+    attempt = 0
+    stale = 0
+    while True:
+        if attempt < len(orders):
+            order = orders[attempt]
+        elif thorough and len(packable) > 1 and stale < MAX_STALE_PERTURBATIONS and time.perf_counter() < deadline:
+            # Perturb the best order found so far
+            order = list(best_order)
+            i, j = sorted(rng.sample(range(len(order)), 2))
+            order[i], order[j] = order[j], order[i]
+        else:
+            break
+        attempt += 1
+
+        skus_left = [s if i in packable else dict(s, quantity=0) for i, s in enumerate(skus)]
+        loads, remaining, complete = _pack_all(order, skus_left, vehicle, allow_stacking, allow_tipping, deadline)
+        if not complete and best is not None:
+            break
+        score = _score(loads, remaining)
+        if best is None or score < best[0]:
+            best = (score, loads, remaining, complete)
+            best_order = order
+            stale = 0
+        else:
+            stale += 1
+
+    _, loads, remaining, complete = best
+    num_vehicles = sum(load["count"] for load in loads)
+    if not complete:
+        left = {i: n for i, n in enumerate(remaining) if n and i in packable}
+        if loads:
+            # Out of time: the rest go at the fullest load packed so far (more trucks if their weight needs them)
+            per = max(load["units"] for load in loads)
+            left_weight = sum(skus[i]["weight"] * n for i, n in left.items())
+            num_vehicles += max(math.ceil(sum(left.values()) / per), math.ceil(left_weight / vehicle["max_weight"]))
+        else:
+            # No full load before the deadline: estimate one SKU at a time with the block heuristic
+            for i, n in left.items():
+                s = skus[i]
+                per = units_per_vehicle(s["length"], s["width"], s["height"], vehicle, allow_stacking, allow_tipping)
+                per = max(1, min(per, math.floor(vehicle["max_weight"] / s["weight"]) if s["weight"] > 0 else per))
+                num_vehicles += math.ceil(n / per)
+
+    return {
+        "vehicle": vehicle["name"],
+        "num_vehicles": num_vehicles,
+        "loads": loads,
+        "unplaced": {i: q for i, q in unplaceable.items()},
+        "complete": complete,
+    }
@@ -0,0 +1,128 @@
+import numpy as np
+
+from .batch import _vehicle_arrays, evaluate_batch
+from .catalog import ODC_LIMITS, vehicle_types
+from .engine import check_odc, classify_vehicle
+from .fleet_catalog import skyline_mask
+
+# ----------------------------
+# Pareto frontier of vehicle options
+# ----------------------------
+#
+# Planners trade four objectives per option:
+#   total_cost   (min)
+#   num_trucks   (min)
+#   utilization  (max)  units shipped / unit slots on the trucks sent
+#   odc_trucks   (min)  trucks whose loaded envelope needs an ODC permit
+#
+# An option is on the frontier when no other option is at least as good on
+# all four and better on one. The loaded envelope of a truck is the cargo
+# footprint, the cargo height (the vehicle's full height when stacking) and
+# its payload, checked against the ODC limits.
+#
+# Options with identical objectives are collapsed before the skyline pass and
+# all of them are kept, so ties never hide a vehicle.
+
+OBJECTIVES = ["total_cost", "num_trucks", "utilization", "odc_trucks"]
+
+def _minimised(cost, trucks, utilization, odc_trucks):
+    return np.column_stack([cost, trucks, -np.asarray(utilization, dtype=float), odc_trucks])
+
+def frontier_mask(cost, trucks, utilization, odc_trucks):
+    matrix = _minimised(cost, trucks, utilization, odc_trucks)
+    if len(matrix) == 0:
+        return np.zeros(0, dtype=bool)
+    unique, inverse = np.unique(matrix, axis=0, return_inverse=True)
+    return skyline_mask(unique)[inverse.ravel()]
+
+def add_objectives(results, length, width, height, weight, quantity, allow_stacking, vehicles=None, limits=None):
+    # Adds utilization and odc_trucks to each option row in place (rows without a catalog
+    # vehicle, e.g. a mixed fleet, use their largest truck and single-layer height).
+    vehicles = vehicles if vehicles is not None else vehicle_types
+    if not allow_stacking:
+        heights = {}
+    elif hasattr(vehicles, "heights"):
+        heights = vehicles.heights()
+    else:
+        heights = {v["name"]: v["max_height"] for v in vehicles}
+    for r in results:
+        loaded_height = heights.get(r["vehicle"], height)
+        payload = min(r["max_units_per_truck"], quantity) * weight
+        r["utilization"] = round(quantity / (r["num_trucks"] * r["max_units_per_truck"]), 3)
+        r["odc_trucks"] = r["num_trucks"] if check_odc(max(length, width), min(length, width), loaded_height, payload, limits) else 0
+    return results
+
+def pareto_front(results):
+    # Non-dominated rows of results (after add_objectives), cheapest first.
+    if not results:
+        return []
+    mask = frontier_mask(*([r[k] for r in results] for k in OBJECTIVES))
+    return sorted((r for r, keep in zip(results, mask.tolist()) if keep), key=lambda r: r["total_cost"])
+
+def pareto_inputs(length, width, height, weight, quantity, allow_stacking, cargo_type, vehicles=None, fragile=None, limits=None):
+    # The distance- and rate-independent half of compute_pareto_front: trucks, fill and permit burden
+    # of every feasible vehicle in one vectorised pass, to be cached under the packing key.
+    vehicles = vehicles if vehicles is not None else vehicle_types
+    limits = limits if limits is not None else ODC_LIMITS
+    batch = evaluate_batch([length], [width], [height], [weight], [quantity], 0.0, allow_stacking, [cargo_type], vehicles, fragile)
+    feasible = np.flatnonzero(batch["feasible"][0])
+
+    names = vehicles.names if hasattr(vehicles, "names") else [v["name"] for v in vehicles]
+    vehicle_height = _vehicle_arrays(vehicles)["max_height"]
+    trucks = batch["num_trucks"][0, feasible]
+    units = batch["max_units_per_truck"][0, feasible]
+    loaded_height = vehicle_height[feasible] if allow_stacking else np.full(len(feasible), float(height))
+    payload = np.minimum(units, quantity) * weight
+    odc = ((max(length, width) > limits["length"]) | (min(length, width) > limits["width"])
+           | (loaded_height > limits["height"]) | (payload > limits["weight"]))
+    utilization = np.round(quantity / (trucks * units), 3)
+    odc_trucks = np.where(odc, trucks, 0)
+    # Vehicles alike on trucks, fill and permits differ only in cost, so just the cheapest of
+    # each group can be on the frontier at any distance; groups are contiguous in group_order
+    _, group = np.unique(np.column_stack([trucks, utilization, odc_trucks]), axis=0, return_inverse=True)
+    group = group.ravel()
+    group_order = np.argsort(group, kind="stable")
+    return {
+        "index": feasible,
+        "vehicles": [names[j] for j in feasible.tolist()],
+        "num_trucks": trucks,
+        "max_units_per_truck": units,
+        "utilization": utilization,
+        "odc_trucks": odc_trucks,
+        "group": group,
+        "group_order": group_order,
+        "group_starts": np.flatnonzero(np.r_[True, np.diff(group[group_order]) != 0]),
+        "avg_weight_per_truck_tonnes": (weight * quantity / trucks) / 1000,
+    }
+
+def pareto_from_inputs(inputs, distance_km, vehicles=None):
+    # Prices cached pareto_inputs with the vehicles' current rates at distance_km (the batch
+    # engine's formula) and keeps the frontier
+    if len(inputs["vehicles"]) == 0:
+        return []
+    v = _vehicle_arrays(vehicles if vehicles is not None else vehicle_types)
+    trucks = inputs["num_trucks"]
+    cost = np.round(trucks * (
+        v["cost_per_km"][inputs["index"]] * distance_km +
+        v["cost_per_tkm"][inputs["index"]] * inputs["avg_weight_per_truck_tonnes"] * distance_km
+    ), 2)
+    order = inputs["group_order"]
+    cheapest = np.flatnonzero(cost == np.minimum.reduceat(cost[order], inputs["group_starts"])[inputs["group"]])
+    keep = cheapest[frontier_mask(cost[cheapest], trucks[cheapest], inputs["utilization"][cheapest], inputs["odc_trucks"][cheapest])]
+    rows = [{
+        "vehicle": inputs["vehicles"][i],
+        "class": classify_vehicle(inputs["vehicles"][i]),
+        "num_trucks": int(trucks[i]),
+        "total_cost": float(cost[i]),
+        "max_units_per_truck": int(inputs["max_units_per_truck"][i]),
+        "utilization": float(inputs["utilization"][i]),
+        "odc_trucks": int(inputs["odc_trucks"][i]),
+    } for i in keep.tolist()]
+    return sorted(rows, key=lambda r: r["total_cost"])
+
+def compute_pareto_front(length, width, height, weight, quantity, distance_km, allow_stacking, cargo_type, vehicles=None, fragile=None,
+                         limits=None):
+    # Frontier straight from a whole fleet in one vectorised pass (every vehicle, not just the
+    # catalog's capacity/rate skyline: a smaller, dearer truck can still win on utilization).
+    inputs = pareto_inputs(length, width, height, weight, quantity, allow_stacking, cargo_type, vehicles, fragile, limits)
+    return pareto_from_inputs(inputs, distance_km, vehicles)
@@ -0,0 +1,229 @@
+from functools import lru_cache
+
+from .catalog import ODC_LIMITS, PACKING_VERSION, axle_geometry, vehicle_types
+from .engine import check_odc, compute_best_fleet, cost_plans, plan_vehicles
+from .metrics import metrics
+from .odc_rules import NATIONAL
+from .pareto import add_objectives, pareto_from_inputs, pareto_front, pareto_inputs
+from .result_cache import packing_key
+from .road_graph import route_plans
+
+# ----------------------------
+# Presentation helpers
+# ----------------------------
+#
+# pandas, pyarrow and altair are only imported when a view is actually built,
+# so the engine stays cheap to import for batch jobs.
+#
+# What reaches the browser is bounded whatever the fleet size: tables go out
+# as Arrow one page at a time (sorted server-side, highlighting as a column
+# instead of a Styler), and charts get at most CHART_TOP_K options plus one
+# aggregate row per vehicle class for the rest. Sweep heatmaps draw every
+# n-th grid point, at most SWEEP_CHART_CELLS per stacking panel.
+
+PAGE_SIZE = 50
+CHART_TOP_K = 25
+SWEEP_CHART_CELLS = (60, 40)  # quantities × distances per heatmap panel
+
+def results_frame(results):
+    import pandas as pd
+
+    return pd.DataFrame(results)
+
+def results_table(results):
+    # Arrow table of the option rows with a "cheapest" flag column
+    import pyarrow as pa
+
+    # Columns from every row, not just the first (a mixed-fleet row has no transporter or distance)
+    columns = list(dict.fromkeys(k for r in results for k in r))
+    table = pa.Table.from_pydict({k: [r.get(k) for r in results] for k in columns})
+    if table.num_rows:
+        cheapest = min(r["total_cost"] for r in results)
+        table = table.append_column("cheapest", pa.array([r["total_cost"] == cheapest for r in results]))
+    return table
+
+def sort_page(table, sort_by="total_cost", descending=False, page=0, page_size=PAGE_SIZE):
+    # (rows of one page, number of pages); ties are broken by vehicle so pages never overlap
+    import pyarrow.compute as pc
+
+    pages = max(1, -(-table.num_rows // page_size))
+    page = min(max(page, 0), pages - 1)
+    keys = [(sort_by, "descending" if descending else "ascending")]
+    if sort_by != "vehicle" and "vehicle" in table.column_names:
+        keys.append(("vehicle", "ascending"))
+    order = pc.sort_indices(table, sort_keys=keys)
+    return table.take(order[page * page_size:(page + 1) * page_size]), pages
+
+def chart_rows(results, top_k=CHART_TOP_K):
+    # The top_k cheapest options, then one row per class for the rest with its cheapest cost
+    ranked = sorted(results, key=lambda r: r["total_cost"])
+    rows = [{**r, "aggregated": False} for r in ranked[:top_k]]
+    rest = {}
+    for r in ranked[top_k:]:
+        rest.setdefault(r["class"], []).append(r)
+    for cls, group in rest.items():
+        best = group[0]
+        rows.append({**best, "vehicle": f"{len(group):,} more {cls} (from)", "aggregated": True})
+    return rows
+
+# Building the encodings (altair infers and validates every channel) costs far more than the
+# data, so each chart's spec is built once and every call only attaches its rows.
+
+@lru_cache(maxsize=None)
+def _cost_chart_spec():
+    import altair as alt
+
+    return alt.Chart().mark_bar().encode(
+        y=alt.Y("vehicle:N", title="Vehicle Type", sort="-x"),
+        x=alt.X("total_cost:Q", title="Estimated Cost ₹"),
+        color="class:N",
+        tooltip=["vehicle", "total_cost", "num_trucks"]
+    ).properties(height=400)
+
+def cost_chart(df):
+    return _cost_chart_spec().properties(data=df)
+
+@lru_cache(maxsize=None)
+def _frontier_chart_spec():
+    import altair as alt
+
+    base = alt.Chart().encode(
+        x=alt.X("total_cost:Q", title="Estimated Cost ₹", scale=alt.Scale(zero=False)),
+        y=alt.Y("utilization:Q", title="Fill Utilization", axis=alt.Axis(format="%"), scale=alt.Scale(domain=[0, 1])),
+    )
+    points = base.mark_point(filled=True, opacity=0.85).encode(
+        size=alt.Size("num_trucks:Q", title="Trucks"),
+        color="class:N",
+        shape=alt.Shape("odc_trucks:O", title="ODC Trucks"),
+        tooltip=["vehicle", "class", "total_cost", "num_trucks", alt.Tooltip("utilization:Q", format=".0%"), "odc_trucks"]
+    )
+    labels = base.mark_text(align="left", dx=8, dy=-6, fontSize=11).encode(text="vehicle:N")
+    return (points + labels).properties(height=400)
+
+def frontier_chart(df):
+    # Frontier options only: cost vs. fill, sized by trucks, shaped by trucks needing an ODC permit
+    return _frontier_chart_spec().properties(data=df)
+
+def _sampled(values, limit):
+    # Every n-th grid index (at most limit) and the upper edge of each cell
+    import numpy as np
+
+    picked = np.arange(0, len(values), -(-len(values) // limit))
+    last = values[-1] + (values[-1] - values[-2] if len(values) > 1 else 1)
+    return picked, np.append(values[picked[1:]], last)
+
+def sweep_rows(sweep, cells=SWEEP_CHART_CELLS):
+    # One DataFrame row per drawn heatmap cell (see sweep.sweep_grid)
+    import numpy as np
+    import pandas as pd
+
+    qi, q_end = _sampled(sweep["quantity"], cells[0])
+    di, d_end = _sampled(sweep["distance_km"], cells[1])
+    names = list(sweep["vehicles"]) + ["(no vehicle fits)"]
+    frames = []
+    for s, stack in enumerate(sweep["allow_stacking"]):
+        best = sweep["best"][s][qi][:, di]
+        frames.append(pd.DataFrame({
+            "stacking": "Stacking on" if stack else "Stacking off",
+            "quantity": sweep["quantity"][qi].repeat(len(di)).astype(int), "quantity_end": q_end.repeat(len(di)),
+            "distance_km": np.tile(sweep["distance_km"][di], len(qi)), "distance_end": np.tile(d_end, len(qi)),
+            "vehicle": [names[j] for j in best.ravel().tolist()],
+            "total_cost": sweep["total_cost"][s][qi][:, di].ravel(),
+            "num_trucks": sweep["num_trucks"][s][qi][:, di].ravel(),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+def sweep_heatmaps(df):
+    # (best vehicle, best cost) heatmaps over quantity × distance, one panel per stacking value
+    import altair as alt
+
+    base = alt.Chart(df).mark_rect().encode(
+        x=alt.X("quantity:Q", title="Quantity", scale=alt.Scale(zero=False, nice=False)), x2="quantity_end",
+        y=alt.Y("distance_km:Q", title="Distance (km)", scale=alt.Scale(zero=False, nice=False)), y2="distance_end",
+        tooltip=["stacking", "quantity", "distance_km", "vehicle", alt.Tooltip("total_cost:Q", format=",.0f"), "num_trucks"]
+    ).properties(width=280, height=240)
+    vehicle = base.encode(color=alt.Color("vehicle:N", title="Best Vehicle")).facet(column=alt.Column("stacking:N", title=None))
+    cost = base.encode(color=alt.Color("total_cost:Q", title="Best Cost ₹", scale=alt.Scale(scheme="viridis"))).facet(
+        column=alt.Column("stacking:N", title=None))
+    return vehicle, cost
+
+def build_recommendation(length, width, height, weight, quantity, distance_km, allow_stacking, cargo_type, plan_cache=None, catalog=None,
+                         route=None, rate_cards=None):
+    # Everything the results view renders; cached objects are shared, so treat them as read-only.
+    # With a plan_cache, only the costing stage re-runs when distance or rates change.
+    # catalog is a CatalogSnapshot; None means the built-in fleet and limits.
+    # route = (RoadGraph, origin, destination) replaces distance_km with per-vehicle road distances.
+    # rate_cards = RateTable.lane(origin, destination) prices with the cheapest valid transporter cards.
+    vehicles = catalog.vehicles if catalog is not None else None
+    fragile = catalog.fragile_items if catalog is not None else None
+    limits = catalog.odc_limits if catalog is not None else None
+    # Quotes are held to per-axle load and CG limits
+    axles = catalog.axle_geometry if catalog is not None else axle_geometry
+
+    # Routed or card-priced plans need the vehicles a catalog's skyline drops (see plan_vehicles)
+    prune = route is None and rate_cards is None
+
+    def plan():
+        return plan_vehicles(length, width, height, weight, quantity, allow_stacking, cargo_type, vehicles, fragile, axles, prune)
+
+    def cached(tag, compute):
+        # Distance- and rate-independent stages share the packing key (the plan cache clears on a new packing version)
+        if plan_cache is None:
+            return compute()
+        version = catalog.packing_version if catalog is not None else PACKING_VERSION
+        key = packing_key(length, width, height, weight, quantity, allow_stacking, cargo_type, version)
+        return plan_cache.get_or_compute(key[:-1] + tag + (version,), compute)
+
+    with metrics.stage("packing"):
+        plans = cached((prune,), plan)
+    paths = {}
+    if route is not None:
+        with metrics.stage("routing"):
+            plans = route_plans(plans, route, height, weight, quantity, allow_stacking, vehicles if vehicles is not None else vehicle_types,
+                                axles)
+            paths = {p["vehicle"]: p["path"] for p in plans}
+    with metrics.stage("costing"):
+        results = cost_plans(plans, weight, quantity, distance_km, vehicles, rate_cards)
+
+    # A mix of vehicle types can beat the cheapest single type
+    with metrics.stage("mixed_fleet"):
+        fleet = compute_best_fleet(results, weight, quantity, distance_km, vehicles, rate_cards)
+        if fleet and fleet["total_cost"] < results[0]["total_cost"]:
+            results = [fleet] + results
+
+    # Pareto frontier over cost, trucks, fill and permit burden. Without a route or rate cards it is
+    # taken from the whole fleet, since a catalog only hands the engine its capacity/rate skyline.
+    with metrics.stage("pareto"):
+        add_objectives(results, length, width, height, weight, quantity, allow_stacking, vehicles, limits)
+        if route is None and rate_cards is None:
+            # What each vehicle packs is cached; only the cost column is re-priced
+            inputs = cached(("pareto", tuple(sorted((limits or ODC_LIMITS).items()))),
+                            lambda: pareto_inputs(length, width, height, weight, quantity, allow_stacking, cargo_type, vehicles, fragile,
+                                                  limits))
+            candidates = pareto_from_inputs(inputs, distance_km, vehicles)
+            # The fleet-wide pass knows nothing of axle limits: take those vehicles from results
+            ranked = {r["vehicle"]: r for r in results}
+            candidates = [ranked.get(c["vehicle"], c) for c in candidates if c["vehicle"] in ranked or c["vehicle"] not in axles]
+            candidates += [r for r in results if r["class"] == "🧩 Mixed Fleet"]
+        else:
+            candidates = results
+        frontier = pareto_front(candidates)
+        on_frontier = {r["vehicle"] for r in frontier}
+        for r in results:
+            r["pareto"] = r["vehicle"] in on_frontier
+
+    with metrics.stage("check_odc"):
+        odc_exceeded = check_odc(length, width, height, weight, limits)
+    rec = {"results": results, "frontier": frontier, "odc_exceeded": odc_exceeded, "odc_rules": [], "paths": paths, "chart": None,
+           "table": None}
+    if catalog is not None and catalog.extra_rules:
+        # Per-state / route rules flagged for this cargo, national ones are in odc_exceeded already
+        with metrics.stage("odc_rules"):
+            rules = catalog.odc_rules
+            rec["odc_rules"] = [r for r in rules.summary(rules.evaluate(length, width, height, weight), 0) if r["rule_set"] != NATIONAL]
+    if results:
+        with metrics.stage("table"):
+            rec["table"] = results_table(results)
+        with metrics.stage("chart"):
+            rec["chart"] = frontier_chart(results_frame(chart_rows(frontier)))
+    return rec
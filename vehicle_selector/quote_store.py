@@ -0,0 +1,153 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from .result_cache import packing_key
+
+# ----------------------------
+# Persistent quote store
+# ----------------------------
+#
+# Every recommendation can be written to a local SQLite file: the inputs, the
+# chosen vehicle, the alternatives (JSON) and the catalog version it was
+# priced with. The database runs in WAL mode, so the app's sessions and a
+# batch job can read while one of them writes.
+#
+# "Same cargo quoted before?" is answered through the cargo signature: a 64-bit
+# digest of the packing inputs (dimensions, weight, quantity, stacking, cargo
+# type at mm/g resolution, as in result_cache.packing_key). Distance is left
+# out so a cargo shows up whatever lane it was quoted for; it is stored and can
+# be filtered on. (signature, created_at) is indexed, as are (project,
+# created_at) and created_at, so lookups stay index range scans at millions of rows.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    project TEXT NOT NULL DEFAULT '',
+    signature INTEGER NOT NULL,
+    length REAL NOT NULL,
+    width REAL NOT NULL,
+    height REAL NOT NULL,
+    weight REAL NOT NULL,
+    quantity INTEGER NOT NULL,
+    distance_km REAL NOT NULL,
+    allow_stacking INTEGER NOT NULL,
+    cargo_type TEXT NOT NULL,
+    catalog_version TEXT,
+    vehicle TEXT,
+    num_trucks INTEGER,
+    total_cost REAL,
+    alternatives TEXT
+);
+CREATE INDEX IF NOT EXISTS quotes_signature ON quotes (signature, created_at);
+CREATE INDEX IF NOT EXISTS quotes_project ON quotes (project, created_at);
+CREATE INDEX IF NOT EXISTS quotes_created ON quotes (created_at);
+"""
+COLUMNS = ["created_at", "project", "signature", "length", "width", "height", "weight", "quantity", "distance_km",
+           "allow_stacking", "cargo_type", "catalog_version", "vehicle", "num_trucks", "total_cost", "alternatives"]
+ALTERNATIVE_FIELDS = ["vehicle", "num_trucks", "total_cost"]
+
+def cargo_signature(length, width, height, weight, quantity, allow_stacking, cargo_type):
+    key = packing_key(length, width, height, weight, quantity, allow_stacking, cargo_type, None)[:-1]
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+def quote_row(length, width, height, weight, quantity, distance_km, allow_stacking, cargo_type, results, catalog_version=None,
+              project="", created_at=None):
+    # One quotes row (tuple in COLUMNS order) from a ranked option list; no options means "no vehicle fits"
+    best = results[0] if results else {}
+    # Stored as [vehicle, num_trucks, total_cost] triples to keep rows small
+    alternatives = [[r["vehicle"], r["num_trucks"], r["total_cost"]] for r in results[1:]]
+    return (
+        time.time() if created_at is None else created_at, project or "",
+        cargo_signature(length, width, height, weight, quantity, allow_stacking, cargo_type),
+        float(length), float(width), float(height), float(weight), int(quantity), float(distance_km), int(bool(allow_stacking)),
+        str(cargo_type), catalog_version, best.get("vehicle"), best.get("num_trucks"), best.get("total_cost"),
+        json.dumps(alternatives, ensure_ascii=False, separators=(",", ":")),
+    )
+
+class QuoteStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as con:
+            con.executescript(SCHEMA)
+
+    def _connect(self):
+        # One connection per thread (sqlite3 connections are not shared across threads)
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=30)
+            con.row_factory = sqlite3.Row
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            # Room for the signature index pages during bulk inserts
+            con.execute("PRAGMA cache_size=-65536")
+            self._local.con = con
+        return con
+
+    def record(self, length, width, height, weight, quantity, distance_km, allow_stacking, cargo_type, results, catalog_version=None,
+               project=""):
+        row = quote_row(length, width, height, weight, quantity, distance_km, allow_stacking, cargo_type, results, catalog_version, project)
+        with self._connect() as con:
+            return con.execute(f"INSERT INTO quotes ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", row).lastrowid
+
+    def record_many(self, rows):
+        # Bulk insert of quote_row tuples in one transaction; returns the number written
+        with self._connect() as con:
+            cursor = con.executemany(f"INSERT INTO quotes ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", rows)
+            return cursor.rowcount
+
+    def lookup(self, length, width, height, weight, quantity, allow_stacking, cargo_type, project=None, catalog_version=None, limit=10):
+        # Earlier quotes of the same cargo, newest first
+        sql = "SELECT * FROM quotes WHERE signature = ?"
+        params = [cargo_signature(length, width, height, weight, quantity, allow_stacking, cargo_type)]
+        if project is not None:
+            sql += " AND project = ?"
+            params.append(project)
+        if catalog_version is not None:
+            sql += " AND catalog_version = ?"
+            params.append(catalog_version)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        rows = self._connect().execute(sql, params + [limit]).fetchall()
+        # A 64-bit digest can collide; the stored inputs decide
+        key = packing_key(length, width, height, weight, quantity, allow_stacking, cargo_type, None)
+        return [_quote(r) for r in rows if packing_key(r["length"], r["width"], r["height"], r["weight"], r["quantity"],
+                                                         bool(r["allow_stacking"]), r["cargo_type"], None) == key]
+
+    def history(self, project=None, since=None, until=None, limit=100):
+        # Quotes in a date range (unix seconds), optionally for one project, newest first
+        clauses, params = [], []
+        if project is not None:
+            clauses.append("project = ?")
+            params.append(project)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(f"SELECT * FROM quotes{where} ORDER BY created_at DESC LIMIT ?", params + [limit]).fetchall()
+        return [_quote(r) for r in rows]
+
+    def projects(self):
+        return [r[0] for r in self._connect().execute("SELECT DISTINCT project FROM quotes ORDER BY project")]
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM quotes").fetchone()[0]
+
+    def close(self):
+        con = getattr(self._local, "con", None)
+        if con is not None:
+            con.close()
+            self._local.con = None
+
+def _quote(row):
+    quote = dict(row)
+    quote["allow_stacking"] = bool(quote["allow_stacking"])
+    quote["alternatives"] = [dict(zip(ALTERNATIVE_FIELDS, a)) for a in json.loads(quote["alternatives"] or "[]")]
+    return quote
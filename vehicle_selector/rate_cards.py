@@ -0,0 +1,291 @@
+import datetime
+import hashlib
+import os
+import re
+from bisect import bisect_right
+from functools import lru_cache
+
+# ----------------------------
+# Transporter rate cards
+# ----------------------------
+#
+# A directory of weekly rate cards (CSV / Excel, one or more per transporter)
+# stands in for the vendor feeds. Layouts vary, so each file is normalized:
+#   * the header row is the first of the top rows naming a vehicle and a rate column
+#   * column names are matched against COLUMN_ALIASES
+#   * a lane is origin/destination columns or one "Mumbai - Delhi" style column;
+#     blank, "*" or "All India" means any lane
+#   * vehicle is a vehicle type name or a vehicle class ("Medium Duty")
+#   * transporter comes from a column or else the file name
+# Files are parsed in a process pool (Excel parsing is CPU-bound).
+#
+# A rate is two-part (₹/km per truck plus ₹/tonne-km), so which card is
+# cheapest depends on the load per truck. For each (vehicle, lane) the
+# validity windows are cut into elementary date segments, and each segment
+# keeps the lower convex hull of its (₹/km, ₹/tkm) points: the cheapest card
+# for a load of t tonnes per truck minimises cost_per_km + t × cost_per_tkm,
+# which is always a hull vertex, found by bisecting the hull's switch points.
+# A lookup is a dict probe and two bisects, O(log n) in the number of cards.
+
+COLUMN_ALIASES = {
+    "transporter": ["transporter", "vendor", "carrier", "transporter_name", "vendor_name"],
+    "vehicle": ["vehicle", "vehicle_type", "vehicle_class", "truck", "truck_type", "class"],
+    "origin": ["origin", "from", "source", "from_city", "origin_city", "loading_point"],
+    "destination": ["destination", "to", "dest", "to_city", "destination_city", "unloading_point"],
+    "lane": ["lane", "route", "corridor"],
+    "cost_per_km": ["cost_per_km", "rate_per_km", "per_km", "rs_per_km", "inr_per_km", "km_rate", "₹/km", "rs/km"],
+    "cost_per_tkm": ["cost_per_tkm", "rate_per_tkm", "per_tkm", "rs_per_tkm", "inr_per_tkm", "tkm_rate", "₹/tkm", "rs/tkm",
+                     "per_tonne_km", "rate_per_tonne_km"],
+    "valid_from": ["valid_from", "effective_from", "from_date", "start_date", "w_e_f", "wef"],
+    "valid_to": ["valid_to", "valid_till", "valid_until", "to_date", "end_date", "expiry", "expires"],
+}
+ANY = "*"
+ANY_LANE = (ANY, ANY)
+ANY_NAMES = {"", "*", "any", "all", "all india", "pan india", "pan-india"}
+OPEN_END = datetime.date.max.toordinal()
+LANE_SEPARATORS = re.compile(r"\s*(?:->|→|–|—|\bto\b|-|/)\s*", re.IGNORECASE)
+HEADER_SCAN_ROWS = 10
+
+class RateCardError(ValueError):
+    pass
+
+def normalize_name(text):
+    # "22 FT Truck" / "22ft truck" -> "22fttruck"; classes lose their emoji
+    return re.sub(r"[^0-9a-z]+", "", str(text).lower())
+
+def _place(text):
+    text = "" if text is None else str(text).strip()
+    return ANY if text.lower() in ANY_NAMES or text.lower() == "nan" else text.lower()
+
+def _column_key(text):
+    text = str(text).strip().lower()
+    if text in ("₹/km", "rs/km", "₹/tkm", "rs/tkm"):
+        return text
+    return re.sub(r"[^0-9a-z₹/]+", "_", text.replace("₹", "rs")).strip("_")
+
+def _alias(column):
+    key = _column_key(column)
+    for field, names in COLUMN_ALIASES.items():
+        if key in names:
+            return field
+    return None
+
+DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d %b %Y", "%d-%b-%Y", "%d-%b-%y", "%Y-%m-%d %H:%M:%S"]
+
+@lru_cache(maxsize=4096)
+def _date_text(text):
+    # Cards repeat the same few dates on every row, so parses are memoized
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, fmt).toordinal()
+        except ValueError:
+            pass
+    import pandas as pd
+
+    return pd.to_datetime(text, dayfirst=not re.match(r"^\d{4}-", text)).date().toordinal()
+
+def _date(value, default):
+    if value is None or (isinstance(value, float) and value != value) or str(value).strip() in ("", "nan", "NaT"):
+        return default
+    if isinstance(value, datetime.date):  # Excel cells (datetime included)
+        return value.toordinal()
+    return _date_text(str(value).strip())
+
+def _split_lane(text):
+    text = "" if text is None else str(text).strip()
+    if text.lower() in ANY_NAMES or text.lower() == "nan":
+        return ANY_LANE
+    parts = [p for p in LANE_SEPARATORS.split(text) if p]
+    if len(parts) != 2:
+        raise ValueError(f"unreadable lane {text!r}")
+    return _place(parts[0]), _place(parts[1])
+
+def _read_table(path):
+    # Raw cells of the first sheet / the CSV, no header assumed
+    import pandas as pd
+
+    if path.lower().endswith((".xlsx", ".xlsm", ".xls")):
+        return pd.read_excel(path, header=None, dtype=object)
+    return pd.read_csv(path, header=None, dtype=object, encoding="utf-8-sig", skip_blank_lines=True)
+
+def parse_rate_card(path):
+    # (rows, rejects) for one file; rows are dicts with the normalized fields
+    raw = _read_table(path)
+    header_at = None
+    for i in range(min(HEADER_SCAN_ROWS, len(raw))):
+        fields = {_alias(c) for c in raw.iloc[i].tolist() if c is not None and str(c) != "nan"}
+        if "vehicle" in fields and ("cost_per_km" in fields or "cost_per_tkm" in fields):
+            header_at = i
+            break
+    if header_at is None:
+        raise RateCardError(f"{os.path.basename(path)}: no header row with a vehicle and a rate column")
+
+    columns = [_alias(c) if c is not None and str(c) != "nan" else None for c in raw.iloc[header_at].tolist()]
+    # "acme_roadways_w14.csv" -> "acme roadways"
+    stem = os.path.splitext(os.path.basename(path))[0]
+    default_transporter = re.sub(r"[_\- ]*(w(eek)?\d+|\d{4}-?\d{2}(-?\d{2})?)$", "", stem, flags=re.IGNORECASE).replace("_", " ") or stem
+    rows, rejects = [], []
+    for line, values in enumerate(raw.iloc[header_at + 1:].itertuples(index=False), start=header_at + 2):
+        cells = {field: value for field, value in zip(columns, values) if field is not None}
+        if all(v is None or str(v).strip() in ("", "nan") for v in cells.values()):
+            continue
+        try:
+            if cells.get("lane") is not None and str(cells["lane"]).strip() not in ("", "nan"):
+                origin, destination = _split_lane(cells["lane"])
+            else:
+                origin, destination = _place(cells.get("origin")), _place(cells.get("destination"))
+            vehicle = str(cells.get("vehicle") or "").strip()
+            if not vehicle or vehicle == "nan":
+                raise ValueError("no vehicle")
+            per_km = float(str(cells.get("cost_per_km") or 0).replace(",", "") or 0)
+            per_tkm = float(str(cells.get("cost_per_tkm") or 0).replace(",", "") or 0)
+            if per_km < 0 or per_tkm < 0 or per_km + per_tkm <= 0:
+                raise ValueError("no positive rate")
+            valid_from = _date(cells.get("valid_from"), 0)
+            valid_to = _date(cells.get("valid_to"), OPEN_END)
+            if valid_to < valid_from:
+                raise ValueError("valid_to before valid_from")
+            transporter = str(cells.get("transporter") or "").strip()
+            rows.append({
+                "transporter": default_transporter if transporter in ("", "nan") else transporter,
+                "vehicle": vehicle, "origin": origin, "destination": destination,
+                "cost_per_km": per_km, "cost_per_tkm": per_tkm, "valid_from": valid_from, "valid_to": valid_to,
+            })
+        except (TypeError, ValueError) as exc:
+            rejects.append({"file": os.path.basename(path), "line": line, "error": str(exc)})
+    return rows, rejects
+
+def _parse_task(path):
+    # Pool worker: never raises, so one bad file cannot sink the batch
+    try:
+        rows, rejects = parse_rate_card(path)
+        return path, rows, rejects, None
+    except RateCardError as exc:
+        return path, [], [], str(exc)
+    except Exception as exc:  # noqa: BLE001 - reported per file
+        return path, [], [], f"{os.path.basename(path)}: {exc}"
+
+# ----------------------------
+# Indexed rate table
+# ----------------------------
+
+def _lower_hull(points):
+    # points: (per_km, per_tkm, card); keeps the vertices minimising per_km + t × per_tkm for some t >= 0,
+    # ordered by per_km ascending (per_tkm descending)
+    hull = []
+    for p in sorted(points, key=lambda p: (p[0], p[1])):
+        if hull and p[1] >= hull[-1][1]:
+            continue  # dearer on both parts than a cheaper-per-km card
+        while len(hull) >= 2:
+            (x1, y1, _), (x2, y2, _) = hull[-2], hull[-1]
+            # Drop the middle vertex unless it bends the right way
+            if (x2 - x1) * (p[1] - y1) - (y2 - y1) * (p[0] - x1) <= 0:
+                hull.pop()
+            else:
+                break
+        hull.append(p)
+    # Load per truck (tonnes) above which the next vertex is cheaper
+    switches = [(b[0] - a[0]) / (a[1] - b[1]) for a, b in zip(hull, hull[1:])]
+    return hull, switches
+
+class RateTable:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        cards = {}
+        for row in self.rows:
+            key = (normalize_name(row["vehicle"]), row["origin"], row["destination"])
+            cards.setdefault(key, []).append(row)
+        # key -> (segment starts, [(hull, switches) per segment])
+        self._index = {}
+        for key, group in cards.items():
+            starts = sorted({r["valid_from"] for r in group} | {r["valid_to"] + 1 for r in group if r["valid_to"] < OPEN_END})
+            segments = []
+            for start in starts:
+                live = [(r["cost_per_km"], r["cost_per_tkm"], r) for r in group if r["valid_from"] <= start <= r["valid_to"]]
+                segments.append(_lower_hull(live) if live else ([], []))
+            self._index[key] = (starts, segments)
+        self.places = sorted({p for r in self.rows for p in (r["origin"], r["destination"]) if p != ANY})
+        self.version = hashlib.sha1(repr(sorted((r["transporter"], r["vehicle"], r["origin"], r["destination"], r["cost_per_km"],
+                                                 r["cost_per_tkm"], r["valid_from"], r["valid_to"]) for r in self.rows)).encode()).hexdigest()[:12]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _cheapest(self, key, tonnes_per_truck, day):
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        starts, segments = entry
+        i = bisect_right(starts, day) - 1
+        if i < 0:
+            return None
+        hull, switches = segments[i]
+        if not hull:
+            return None
+        return hull[bisect_right(switches, tonnes_per_truck)][2]
+
+    def best_rate(self, vehicle, origin, destination, tonnes_per_truck, on=None):
+        # Cheapest card valid on `on` (a date, default today) for this vehicle type or its class,
+        # on this lane or an any-lane card; None when no card applies
+        from .engine import classify_vehicle
+
+        day = (on or datetime.date.today()).toordinal()
+        lanes = [(_place(origin), _place(destination)), ANY_LANE]
+        names = [normalize_name(vehicle), normalize_name(classify_vehicle(vehicle))]
+        best, best_cost = None, None
+        for name in names:
+            for lane in lanes:
+                card = self._cheapest((name,) + lane, tonnes_per_truck, day)
+                if card is not None:
+                    cost = card["cost_per_km"] + tonnes_per_truck * card["cost_per_tkm"]
+                    if best is None or cost < best_cost:
+                        best, best_cost = card, cost
+        return best
+
+    def lane(self, origin, destination, on=None):
+        return LaneRates(self, origin, destination, on)
+
+class LaneRates:
+    # A RateTable bound to one lane and date, as passed to compute_best_vehicle(rate_cards=...)
+    def __init__(self, table, origin, destination, on=None):
+        self.table = table
+        self.origin = origin
+        self.destination = destination
+        self.on = on or datetime.date.today()
+        # key identifies the lane and date within a cache entry; version is the table's, so caches
+        # keyed on it are only cleared when the cards themselves change
+        self.key = (_place(origin), _place(destination), self.on.isoformat())
+        self.version = table.version
+
+    def best_rate(self, vehicle, tonnes_per_truck):
+        return self.table.best_rate(vehicle, self.origin, self.destination, tonnes_per_truck, self.on)
+
+# ----------------------------
+# Ingestion
+# ----------------------------
+
+RATE_CARD_EXTENSIONS = (".csv", ".xlsx", ".xlsm", ".xls")
+
+def ingest_rate_cards(directory, workers=None):
+    # Parses every rate card under directory concurrently; returns (RateTable, report)
+    paths = sorted(os.path.join(root, name) for root, _, names in os.walk(directory) for name in names
+                   if name.lower().endswith(RATE_CARD_EXTENSIONS) and not name.startswith(("~$", ".")))
+    if not paths:
+        raise RateCardError(f"{directory}: no rate card files")
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    if workers == 1:
+        results = list(map(_parse_task, paths))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_task, paths, chunksize=max(1, len(paths) // (workers * 4))))
+
+    rows, report = [], {"files": len(paths), "rows": 0, "rejected": [], "failed": []}
+    for path, file_rows, rejects, error in results:
+        rows.extend(file_rows)
+        report["rejected"].extend(rejects)
+        if error:
+            report["failed"].append(error)
+    report["rows"] = len(rows)
+    return RateTable(rows), report
@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import OrderedDict
+
+# ----------------------------
+# Recommendation result cache
+# ----------------------------
+#
+# One instance is shared by every Streamlit session in the process. Entries
+# are keyed on canonicalized cargo inputs plus catalog.CATALOG_VERSION, so editing
+# vehicle_types, the rates or the ODC limits produces new keys and the old
+# entries are dropped. Packing plans are cached separately under
+# catalog.PACKING_VERSION, which ignores rates, so distance and rate edits
+# only re-run the costing stage.
+
+def canonical_key(length, width, height, weight, quantity, distance_km, allow_stacking, cargo_type, version):
+    # Millimetre / gram resolution so 2.2 and 2.2000000001 share an entry.
+    return (
+        round(float(length), 3), round(float(width), 3), round(float(height), 3),
+        round(float(weight), 3), int(quantity), round(float(distance_km), 3),
+        bool(allow_stacking), str(cargo_type), version
+    )
+
+def packing_key(length, width, height, weight, quantity, allow_stacking, cargo_type, version):
+    # Key for the distance- and rate-independent packing stage (see engine.plan_vehicles).
+    return (
+        round(float(length), 3), round(float(width), 3), round(float(height), 3),
+        round(float(weight), 3), int(quantity), bool(allow_stacking), str(cargo_type), version
+    )
+
+class ResultCache:
+    def __init__(self, max_entries=512, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        version = key[-1]
+        now = time.monotonic()
+        with self._lock:
+            if version != self._version:
+                # Catalog changed: nothing cached under the old version is valid
+                self.evictions += len(self._entries)
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Computed outside the lock so one slow miss does not block other sessions
+        value = compute()
+
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = (time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,179 @@
+import csv
+import heapq
+import math
+import os
+from bisect import bisect_left
+
+from .catalog import catalog_version
+from .result_cache import ResultCache
+
+# ----------------------------
+# Offline road graph with clearance restrictions
+# ----------------------------
+#
+# edges.csv: from,to,distance_km[,max_height,max_width,max_weight,oneway]
+# nodes.csv (optional): node,lat,lon -- enables A* with a great-circle bound
+#
+# Blank restriction cells mean "unrestricted". Weight limits are compared with
+# the payload per truck, since the catalog carries no tare weights.
+#
+# A shortest path only depends on which edges a vehicle may use, and that set
+# only changes when the envelope crosses one of the distinct limit values in
+# the file. Envelopes are therefore bucketed against those values before
+# caching: every envelope in the same bucket shares one cached path, exactly.
+
+EARTH_RADIUS_KM = 6371.0
+RESTRICTIONS = ["max_height", "max_width", "max_weight"]
+TRUE_VALUES = {"true", "1", "yes", "y"}
+
+class RoadGraphError(ValueError):
+    pass
+
+def _haversine(a, b):
+    lat1, lon1 = map(math.radians, a)
+    lat2, lon2 = map(math.radians, b)
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+def _limit(value):
+    return math.inf if value in (None, "") else float(value)
+
+class RoadGraph:
+    def __init__(self, edges, coordinates=None, cache_entries=4096):
+        # edges: dicts with from, to, distance_km, optional max_height/max_width/max_weight and oneway
+        self.nodes = []
+        self._index = {}
+        self.coordinates = dict(coordinates or {})
+        rows = []
+        for e in edges:
+            limits = tuple(_limit(e.get(k)) for k in RESTRICTIONS)
+            distance = float(e["distance_km"])
+            if distance < 0:
+                raise RoadGraphError(f"negative distance on {e['from']} -> {e['to']}")
+            rows.append((self._node(str(e["from"])), self._node(str(e["to"])), distance, limits))
+            if str(e.get("oneway") or "").strip().lower() not in TRUE_VALUES:
+                rows.append((rows[-1][1], rows[-1][0], distance, limits))
+
+        # Distinct finite limits per restriction; an edge stores the bucket of each limit
+        self._thresholds = [sorted({r[3][k] for r in rows if r[3][k] != math.inf}) for k in range(len(RESTRICTIONS))]
+        self._adjacency = [[] for _ in self.nodes]
+        for a, b, distance, limits in rows:
+            buckets = tuple(bisect_left(t, lim) if lim != math.inf else len(t) for t, lim in zip(self._thresholds, limits))
+            self._adjacency[a].append((b, distance, buckets))
+        self.edge_count = len(rows)
+        self.version = catalog_version(sorted((self.nodes[a], self.nodes[b], d, l) for a, b, d, l in rows), sorted(self.coordinates.items()))
+
+        # A* stays admissible if the great-circle bound is scaled by the worst
+        # road-to-crow-flight ratio in the file (road distances can be shorter
+        # than haversine on badly geocoded nodes)
+        self._heuristic_scale = 0.0
+        if self.coordinates and all(n in self.coordinates for n in self.nodes):
+            ratios = [d / g for a, b, d, _ in rows
+                      if (g := _haversine(self.coordinates[self.nodes[a]], self.coordinates[self.nodes[b]])) > 0]
+            self._heuristic_scale = min(1.0, min(ratios)) if ratios else 1.0
+        self.path_cache = ResultCache(max_entries=cache_entries, ttl_seconds=math.inf)
+
+    def _node(self, name):
+        if name not in self._index:
+            self._index[name] = len(self.nodes)
+            self.nodes.append(name)
+        return self._index[name]
+
+    def __contains__(self, node):
+        return node in self._index
+
+    def envelope_key(self, height, width, weight):
+        # Bucket an envelope: same bucket means the same usable edges
+        return tuple(bisect_left(t, v) for t, v in zip(self._thresholds, (height, width, weight)))
+
+    def shortest_path(self, origin, destination, height=0.0, width=0.0, weight=0.0):
+        # {"distance_km", "nodes"} for the shortest route this envelope may use, or None.
+        for node in (origin, destination):
+            if node not in self._index:
+                raise KeyError(f"unknown node: {node!r}")
+        bucket = self.envelope_key(height, width, weight)
+        key = (origin, destination, bucket, self.version)
+        return self.path_cache.get_or_compute(key, lambda: self._search(self._index[origin], self._index[destination], bucket))
+
+    def _search(self, source, target, bucket):
+        # Dijkstra, or A* when every node has coordinates
+        goal = self.coordinates.get(self.nodes[target]) if self._heuristic_scale else None
+        scale = self._heuristic_scale
+        bound = {}
+
+        def h(n):
+            if goal is None:
+                return 0.0
+            if n not in bound:
+                bound[n] = scale * _haversine(self.coordinates[self.nodes[n]], goal)
+            return bound[n]
+
+        best = {source: 0.0}
+        parent = {source: None}
+        heap = [(h(source), 0.0, source)]
+        done = set()
+        while heap:
+            _, dist, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(self.nodes[node])
+                    node = parent[node]
+                return {"distance_km": round(dist, 3), "nodes": path[::-1]}
+            done.add(node)
+            for nxt, length, limits in self._adjacency[node]:
+                # Edge usable when each limit bucket is at or above the envelope's bucket
+                if limits[0] < bucket[0] or limits[1] < bucket[1] or limits[2] < bucket[2]:
+                    continue
+                nd = dist + length
+                if nd < best.get(nxt, math.inf):
+                    best[nxt] = nd
+                    parent[nxt] = node
+                    heapq.heappush(heap, (nd + h(nxt), nd, nxt))
+        return None
+
+def load_road_graph(path):
+    # A directory with edges.csv (+ nodes.csv), or a single edges CSV file.
+    edges_path = os.path.join(path, "edges.csv") if os.path.isdir(path) else path
+    nodes_path = os.path.join(os.path.dirname(edges_path), "nodes.csv")
+    try:
+        with open(edges_path, newline="", encoding="utf-8-sig") as f:
+            edges = [{k.strip().lower(): v for k, v in row.items() if k} for row in csv.DictReader(f)]
+        coordinates = {}
+        if os.path.exists(nodes_path):
+            with open(nodes_path, newline="", encoding="utf-8-sig") as f:
+                for row in csv.DictReader(f):
+                    row = {k.strip().lower(): v for k, v in row.items() if k}
+                    coordinates[row["node"]] = (float(row["lat"]), float(row["lon"]))
+        return RoadGraph(edges, coordinates)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise RoadGraphError(f"{path}: bad road graph ({exc})") from exc
+
+# ----------------------------
+# Routing packing plans
+# ----------------------------
+
+def route_envelope(vehicle, height, weight, units_per_truck, quantity, allow_stacking, deck_height=0.0):
+    # Loaded height above the road: the deck plus the cargo itself, or plus the vehicle's full
+    # load height when units may be stacked
+    loaded_height = deck_height + (vehicle["max_height"] if allow_stacking else height)
+    payload = weight * min(units_per_truck, quantity)
+    return loaded_height, vehicle["max_width"], payload
+
+def route_plans(plans, route, height, weight, quantity, allow_stacking, vehicles, axles=None):
+    # Adds distance_km / path to each plan for route = (graph, origin, destination);
+    # plans with no legal path for their envelope are dropped. axles (catalog.axle_geometry)
+    # supplies deck heights; vehicles without one are taken as loading from road level.
+    graph, origin, destination = route
+    specs = vehicles.by_name if hasattr(vehicles, "by_name") else {v["name"]: v for v in vehicles}.__getitem__
+    routed = []
+    for plan in plans:
+        deck_height = ((axles or {}).get(plan["vehicle"]) or {}).get("deck_height_m") or 0.0
+        envelope = route_envelope(specs(plan["vehicle"]), height, weight, plan["max_units_per_truck"], quantity, allow_stacking,
+                                  deck_height)
+        path = graph.shortest_path(origin, destination, *envelope)
+        if path is not None:
+            routed.append({**plan, "distance_km": path["distance_km"], "path": path["nodes"]})
+    return routed
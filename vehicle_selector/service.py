@@ -0,0 +1,273 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .catalog import CATALOG_VERSION
+from .cli import _load_catalog, _normalize, parse_line, quote_chunk
+from .metrics import metrics
+from .result_cache import canonical_key
+
+# ----------------------------
+# Quoting service (HTTP/JSON)
+# ----------------------------
+#
+#   python -m vehicle_selector serve --port 8765 --workers 4 --queue-size 512
+#
+#   POST /quote        one cargo line (the manifest columns) -> {"options": [...]}
+#   POST /quote/batch  {"lines": [...], "top": N} -> {"results": [{"line": 1, "options": [...]}, ...]}
+#   GET  /health, GET /stats
+#
+# Lines are ranked exactly as by `python -m vehicle_selector quote`: the
+# batch engine runs cli.quote_chunk in a bounded worker process pool, so the
+# event loop only parses HTTP and JSON. Identical lines that are in flight at
+# the same time, from one request or many, share one computation. Lines are
+# keyed like the result cache (result_cache.canonical_key).
+#
+# Backpressure: at most queue_size distinct lines may be queued or running.
+# A request that would go over that gets 503 with Retry-After straight away,
+# without waiting; a batch larger than queue_size gets 413. Lines that join
+# an in-flight computation do not count against the limit.
+
+SERVICE_CHUNK_SIZE = 256  # lines per worker task
+MAX_BODY_BYTES = 16 * 2**20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error", 503: "Service Unavailable"}
+
+class ServiceBusy(Exception):
+    pass
+
+class QuoteService:
+    def __init__(self, catalog=None, workers=1, queue_size=512, chunk_size=SERVICE_CHUNK_SIZE, distance_km=800,
+                 allow_stacking=False, cargo_type="Standard Steel Fabrication", executor=None):
+        # catalog: directory or SQLite path (default: built-in fleet); executor overrides the process pool
+        version = _load_catalog(catalog).version if catalog else CATALOG_VERSION
+        self.defaults = {"distance_km": distance_km, "allow_stacking": allow_stacking, "cargo_type": cargo_type,
+                         "catalog": catalog}
+        self.version = version
+        self.workers = workers
+        self.queue_size = queue_size
+        self.chunk_size = chunk_size
+        self.executor = executor or ProcessPoolExecutor(workers)
+        self.pending = 0
+        self.stats = {"requests": 0, "lines": 0, "computed": 0, "coalesced": 0, "rejected": 0, "errors": 0}
+        self._inflight = {}
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    async def _compute(self, rows, futures):
+        try:
+            for start in range(0, len(rows), self.chunk_size):
+                task = (0, rows[start:start + self.chunk_size], self.defaults, 0, False)
+                records = await asyncio.get_running_loop().run_in_executor(self.executor, quote_chunk, task)
+                for record in records:
+                    future = futures[start + record["line"]]
+                    if not future.done():
+                        future.set_result(record.get("options", record.get("error")))
+        except Exception as exc:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            self.pending -= len(rows)
+
+    async def quote_lines(self, lines):
+        # One ranked option list (or error message) per line; raises ServiceBusy when the queue is full
+        keys, parsed, errors = [], [], {}
+        for i, row in enumerate(lines):
+            try:
+                row = _normalize(row)
+                args = parse_line(row, self.defaults)
+            except (AttributeError, TypeError, ValueError) as exc:
+                errors[i] = str(exc)
+                keys.append(None)
+                continue
+            keys.append(canonical_key(*args, self.version))
+            parsed.append(row)
+
+        fresh = {}
+        for key, row in zip((k for k in keys if k is not None), parsed):
+            if key not in self._inflight and key not in fresh:
+                fresh[key] = row
+        if self.pending + len(fresh) > self.queue_size:
+            self.stats["rejected"] += 1
+            raise ServiceBusy(f"{self.pending:,} lines queued")
+
+        loop = asyncio.get_running_loop()
+        futures = {key: loop.create_future() for key in fresh}
+        for key, future in futures.items():
+            self._inflight[key] = future
+            future.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+        if fresh:
+            self.pending += len(fresh)
+            loop.create_task(self._compute(list(fresh.values()), list(futures.values())))
+
+        self.stats["lines"] += len(lines)
+        self.stats["computed"] += len(fresh)
+        self.stats["coalesced"] += len(parsed) - len(fresh)
+        self.stats["errors"] += len(errors)
+        waiting = [self._inflight.get(key) or futures[key] for key in keys if key is not None]
+        done = iter(await asyncio.gather(*waiting))
+        return [{"error": errors[i]} if key is None else _outcome(next(done)) for i, key in enumerate(keys)]
+
+    async def handle(self, method, path, body):
+        # (status, JSON-able payload)
+        path = path.split("?")[0].rstrip("/") or "/"
+        if path == "/health":
+            return 200, {"status": "ok", "catalog_version": self.version}
+        if path == "/stats":
+            return 200, {**self.stats, "pending": self.pending, "inflight": len(self._inflight), "workers": self.workers,
+                         "queue_size": self.queue_size}
+        if path not in ("/quote", "/quote/batch"):
+            return 404, {"error": f"no such endpoint: {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError as exc:
+            return 400, {"error": f"invalid JSON: {exc}"}
+        batch = path == "/quote/batch"
+        if not isinstance(payload, dict) or (batch and not isinstance(payload.get("lines"), list)):
+            return 400, {"error": "expected a JSON object" + (" with a 'lines' list" if batch else "")}
+        lines = payload["lines"] if batch else [payload]
+        if len(lines) > self.queue_size:
+            return 413, {"error": f"batch of {len(lines):,} lines exceeds the queue size ({self.queue_size:,})"}
+        try:
+            top = int(payload.get("top") or 0)
+        except (TypeError, ValueError):
+            return 400, {"error": "top must be an integer"}
+
+        self.stats["requests"] += 1
+        start = time.perf_counter()
+        try:
+            outcomes = await self.quote_lines(lines)
+        except ServiceBusy as exc:
+            return 503, {"error": f"busy, retry later ({exc})"}
+        except Exception as exc:
+            # A worker failed (e.g. the pool broke); the lines it carried get the same error
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+        if metrics.enabled:
+            metrics.observe("service_batch" if batch else "service_quote", time.perf_counter() - start)
+        results = [{"line": i, **({"options": o["options"][:top] if top else o["options"]} if "options" in o else o)}
+                   for i, o in enumerate(outcomes, start=1)]
+        if batch:
+            return 200, {"results": results}
+        return (400, {"error": results[0]["error"]}) if "error" in results[0] else (200, {"options": results[0]["options"]})
+
+    async def serve_connection(self, reader, writer):
+        # HTTP/1.1 with keep-alive; one request at a time per connection
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = (request_line.decode("latin-1").split() + ["", "", ""])[:3]
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    status, payload = 400, {"error": "invalid Content-Length"}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": f"body over {MAX_BODY_BYTES:,} bytes"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.handle(method.upper(), path, body)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                try:
+                    data = json.dumps(payload, ensure_ascii=False, allow_nan=False).encode()
+                except ValueError:
+                    # A NaN or infinity is not JSON; never send one as a quote
+                    status, keep_alive = 500, False
+                    data = json.dumps({"error": "result is not valid JSON (NaN or infinity)"}).encode()
+                head = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json",
+                        f"Content-Length: {len(data)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                if status == 503:
+                    head.append("Retry-After: 1")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutting down with the connection idle
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        # Returns the asyncio server (port=0 picks a free port: server.sockets[0].getsockname()[1])
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+def _outcome(result):
+    return {"error": result} if isinstance(result, str) else {"options": result}
+
+# ----------------------------
+# Client
+# ----------------------------
+
+class QuoteClient:
+    # Minimal asyncio client over one keep-alive connection (used by benchmarks/bench_service.py)
+    def __init__(self, host="127.0.0.1", port=8765):
+        self.host, self.port = host, port
+        self._reader = self._writer = None
+
+    async def request(self, method, path, payload=None):
+        # (status, decoded JSON)
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self._writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                           f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self._writer.drain()
+        status = int((await self._reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        data = await self._reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection") == "close":
+            await self.close()
+        return status, json.loads(data) if data else None
+
+    async def quote(self, line, top=0):
+        return await self.request("POST", "/quote", {**line, "top": top} if top else line)
+
+    async def quote_batch(self, lines, top=0):
+        return await self.request("POST", "/quote/batch", {"lines": lines, "top": top})
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._reader = self._writer = None
+
+def run_service(host="127.0.0.1", port=8765, **options):
+    # Blocks until interrupted
+    service = QuoteService(**options)
+
+    async def main():
+        server = await service.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
@@ -0,0 +1,115 @@
+import numpy as np
+
+from .axle_load import balanced_units
+from .batch import _vehicle_arrays
+from .catalog import fragile_items, vehicle_types
+from .packing import units_per_vehicle_array
+
+# ----------------------------
+# What-if sweeps
+# ----------------------------
+#
+# compute_best_vehicle for one cargo over a grid of quantity × distance ×
+# stacking, in one pass. How many units fit on each vehicle depends only on
+# the cargo and the stacking toggle, so packing runs once per stacking value.
+# Truck counts are a (quantity × vehicle) matrix. With per-km rates a cost is
+# a per-km figure times the distance, so for each quantity only the vehicles
+# whose per-km figure is within rounding of the cheapest can win any cell.
+# Only those contenders get a (quantity × contender × distance) cost block,
+# in blocks of at most SWEEP_MAX_CELLS. Costs use the same formula and
+# rounding as engine.cost_plans, so every cell agrees with a
+# compute_best_vehicle call.
+
+SWEEP_MAX_CELLS = 4_000_000  # quantities × contenders × distances costed at once
+
+def sweep_axis(start, stop, step):
+    # Inclusive range, e.g. sweep_axis(50, 3000, 50)
+    values = np.arange(start, stop + step / 2, step, dtype=float)
+    return values[values <= stop + 1e-9]
+
+def _vehicle_list(vehicles):
+    if hasattr(vehicles, "vehicle"):
+        return [vehicles.vehicle(i) for i in range(len(vehicles))]
+    return list(vehicles)
+
+def sweep_grid(length, width, height, weight, cargo_type, quantities, distances, stackings=(False, True), vehicles=None,
+               fragile=None, axles=None):
+    # Returns the axes, the vehicle names and (stacking, quantity, distance) arrays:
+    # best (index into vehicles, -1 where nothing fits), total_cost (NaN there) and num_trucks.
+    # axles (catalog.axle_geometry) applies the axle-load / CG check as plan_vehicles does.
+    vehicles = vehicles if vehicles is not None else vehicle_types
+    v = _vehicle_arrays(vehicles)
+    names = list(vehicles.names) if hasattr(vehicles, "names") else [x["name"] for x in vehicles]
+    q = np.asarray(quantities, dtype=float)
+    d = np.asarray(distances, dtype=float)
+    stackings = [bool(s) for s in stackings]
+    is_fragile = cargo_type in (fragile if fragile is not None else fragile_items)
+    checked = [j for j, name in enumerate(names) if axles and name in axles]
+    listed = _vehicle_list(vehicles) if checked else None
+
+    shape = (len(stackings), len(q), len(d))
+    best = np.full(shape, -1, dtype=np.int64)
+    best_cost = np.full(shape, np.nan)
+    best_trucks = np.zeros(shape, dtype=np.int64)
+
+    for s, stack in enumerate(stackings):
+        max_units_vol = units_per_vehicle_array(length, width, height, v["max_length"], v["max_width"], v["max_height"], stack)
+        fits = (max_units_vol > 0) & (weight <= v["max_weight"]) & ~(is_fragile & ~v["has_sidewalls"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            max_units_wt = np.floor(v["max_weight"] / weight) if weight > 0 else q[:, None]
+        max_units = np.broadcast_to(np.maximum(1, np.minimum(max_units_vol, max_units_wt)), (len(q), len(names))).copy()
+        feasible = np.broadcast_to(fits, max_units.shape).copy()
+        for j in checked:
+            if fits[j]:
+                units = balanced_units(length, width, height, weight, listed[j], axles[names[j]], stack, q,
+                                       np.minimum(max_units[:, j], q))
+                feasible[:, j] = units > 0
+                max_units[:, j] = np.where(units > 0, np.minimum(max_units[:, j], units), max_units[:, j])
+
+        trucks = np.ceil(q[:, None] / max_units)
+        avg_weight_per_truck_tonnes = (weight * q[:, None] / trucks) / 1000
+        # Cost is per_km × distance; only vehicles within rounding of the cheapest per_km can win any cell
+        per_km = np.where(feasible, trucks * (v["cost_per_km"] + v["cost_per_tkm"] * avg_weight_per_truck_tonnes), np.inf)
+        cheapest = per_km.min(axis=1, keepdims=True)
+        slack = 0.01 / d.min() + 1e-9 * cheapest if len(d) and d.min() > 0 else np.inf
+        near = feasible & (per_km <= cheapest + slack)
+        contenders = max(1, int(near.sum(axis=1).max()))
+        # Contenders per quantity in catalog order, so ties go to the first vehicle as in cost_plans
+        idx = np.sort(np.argsort(~near, axis=1, kind="stable")[:, :contenders], axis=1)
+        step = max(1, SWEEP_MAX_CELLS // max(1, contenders * len(d)))
+        for lo in range(0, len(q), step):
+            block = slice(lo, lo + step)
+            j = idx[block]
+            t = np.take_along_axis(trucks[block], j, axis=1)
+            cost = t[:, :, None] * (
+                v["cost_per_km"][j][:, :, None] * d +
+                (v["cost_per_tkm"][j] * np.take_along_axis(avg_weight_per_truck_tonnes[block], j, axis=1))[:, :, None] * d
+            )
+            cost = np.where(np.take_along_axis(near[block], j, axis=1)[:, :, None], np.round(cost, 2), np.inf)
+            pick = np.argmin(cost, axis=1)
+            low = np.take_along_axis(cost, pick[:, None, :], axis=1)[:, 0, :]
+            found = np.isfinite(low)
+            best[s, block] = np.where(found, np.take_along_axis(j, pick, axis=1), -1)
+            best_cost[s, block] = np.where(found, low, np.nan)
+            best_trucks[s, block] = np.where(found, np.take_along_axis(t, pick, axis=1), 0)
+
+    return {"quantity": q, "distance_km": d, "allow_stacking": stackings, "vehicles": names,
+            "best": best, "total_cost": best_cost, "num_trucks": best_trucks}
+
+def sweep_summary(sweep):
+    # Where each vehicle wins: one row per (stacking, vehicle) with its share of cells and quantity / distance span
+    rows = []
+    q, d = sweep["quantity"], sweep["distance_km"]
+    for s, stack in enumerate(sweep["allow_stacking"]):
+        best = sweep["best"][s]
+        for j in np.unique(best).tolist():
+            qi, di = np.nonzero(best == j)
+            rows.append({
+                "allow_stacking": stack,
+                "vehicle": sweep["vehicles"][j] if j >= 0 else "(no vehicle fits)",
+                "cells": len(qi),
+                "share": round(len(qi) / best.size, 4),
+                "min_quantity": int(q[qi].min()), "max_quantity": int(q[qi].max()),
+                "min_distance_km": float(d[di].min()), "max_distance_km": float(d[di].max()),
+            })
+    return sorted(rows, key=lambda r: (r["allow_stacking"], -r["cells"]))
@@ -1,116 +1,99 @@
+import csv
+import io
+import os
+import tempfile
+
 import streamlit as st
 import pandas as pd
-import altair as alt
-import math
-
-# ----------------------------
-# Vehicle master data
-# ----------------------------
-
-vehicle_types = [
-    {"name": "LCV Truck", "max_length": 4.2, "max_width": 2.0, "max_height": 2.2, "max_weight": 3000, "cost_per_km": 18, "cost_per_tkm": 5.5, "has_sidewalls": True},
-    {"name": "DCM Truck (7 Ton)", "max_length": 5.5, "max_width": 2.2, "max_height": 2.4, "max_weight": 7000, "cost_per_km": 24, "cost_per_tkm": 5.2, "has_sidewalls": True},
-    {"name": "14 ft Truck", "max_length": 6, "max_width": 2.5, "max_height": 2.5, "max_weight": 10000, "cost_per_km": 28, "cost_per_tkm": 5, "has_sidewalls": True},
-    {"name": "22 ft Truck", "max_length": 12, "max_width": 2.6, "max_height": 3, "max_weight": 20000, "cost_per_km": 38, "cost_per_tkm": 4.3, "has_sidewalls": True},
-    {"name": "Flatbed Trailer (40 ft)", "max_length": 18, "max_width": 2.6, "max_height": 3.5, "max_weight": 30000, "cost_per_km": 55, "cost_per_tkm": 3.8, "has_sidewalls": False},
-    {"name": "Flatbed Trailer (60 ft)", "max_length": 25, "max_width": 2.6, "max_height": 3.5, "max_weight": 35000, "cost_per_km": 65, "cost_per_tkm": 3.5, "has_sidewalls": False},
-    {"name": "Semi Low Bed", "max_length": 18, "max_width": 3.0, "max_height": 3.5, "max_weight": 40000, "cost_per_km": 75, "cost_per_tkm": 3.2, "has_sidewalls": False},
-    {"name": "Low Bed Trailer", "max_length": 18, "max_width": 3.5, "max_height": 4.2, "max_weight": 80000, "cost_per_km": 90, "cost_per_tkm": 3, "has_sidewalls": False},
-    {"name": "Multi-Axle Modular Trailer", "max_length": 30, "max_width": 5.0, "max_height": 5.5, "max_weight": 500000, "cost_per_km": 180, "cost_per_tkm": 2.5, "has_sidewalls": False},
-    {"name": "Container Trailer (40 ft)", "max_length": 12.2, "max_width": 2.6, "max_height": 2.9, "max_weight": 28000, "cost_per_km": 42, "cost_per_tkm": 3.8, "has_sidewalls": True}
-]
-
-# vehicle_types = [
-#     {"name": "LCV Truck", "max_length": 4.2, "max_width": 2.0, "max_height": 2.2, "max_weight": 3000, "cost_per_km": 18, "cost_per_tkm": 5.5, "has_sidewalls": True},
-#     {"name": "14 ft Truck", "max_length": 6, "max_width": 2.5, "max_height": 2.5, "max_weight": 10000, "cost_per_km": 28, "cost_per_tkm": 5, "has_sidewalls": True},
-#     {"name": "22 ft Truck", "max_length": 12, "max_width": 2.6, "max_height": 3, "max_weight": 20000, "cost_per_km": 38, "cost_per_tkm": 4.3, "has_sidewalls": True},
-#     {"name": "Flatbed Trailer (40 ft)", "max_length": 18, "max_width": 2.6, "max_height": 3.5, "max_weight": 30000, "cost_per_km": 55, "cost_per_tkm": 3.8, "has_sidewalls": False},
-#     {"name": "Flatbed Trailer (60 ft)", "max_length": 25, "max_width": 2.6, "max_height": 3.5, "max_weight": 35000, "cost_per_km": 65, "cost_per_tkm": 3.5, "has_sidewalls": False},
-#     {"name": "Semi Low Bed", "max_length": 18, "max_width": 3.0, "max_height": 3.5, "max_weight": 40000, "cost_per_km": 75, "cost_per_tkm": 3.2, "has_sidewalls": False},
-#     {"name": "Low Bed Trailer", "max_length": 18, "max_width": 3.5, "max_height": 4.2, "max_weight": 80000, "cost_per_km": 90, "cost_per_tkm": 3, "has_sidewalls": False},
-#     {"name": "Multi-Axle Modular Trailer", "max_length": 30, "max_width": 5.0, "max_height": 5.5, "max_weight": 500000, "cost_per_km": 180, "cost_per_tkm": 2.5, "has_sidewalls": False},
-#     {"name": "Container Trailer (40 ft)", "max_length": 12.2, "max_width": 2.6, "max_height": 2.9, "max_weight": 28000, "cost_per_km": 42, "cost_per_tkm": 3.8, "has_sidewalls": True}
-# ]
-
-ODC_LIMITS = {"length": 12.0, "width": 2.6, "height": 3.8, "weight": 40000}  # weight in kg
-
-fragile_items = {
-    "Precision Instrument": "Bubble Wrap + Custom Crating",
-    "Glass Equipment": "Wooden Crate + Shock Absorbers",
-    "Control Panel": "Shrink Wrap + Cushioning",
-    "Rotating Machinery": "Custom Industrial Packing",
-    "Fragile Custom Assembly": "Bubble Wrap + Wooden Crate"
-}
-
-def classify_vehicle(name):
-    if "LCV" in name or "14 ft" in name:
-        return "🟢 Light Commercial"
-    elif "22 ft" in name or "Container" in name or "Tanker" in name:
-        return "🟡 Medium Duty"
-    elif "Flatbed" in name or "Low Bed" in name:
-        return "🟠 Heavy Duty"
-    elif "Multi-Axle" in name:
-        return "🔴 Oversize Modular"
-    else:
-        return "🔧 Custom Haulage"
-
-def check_odc(length, width, height, weight):
-    exceeded = {}
-    if length > ODC_LIMITS["length"]:
-        exceeded["Length"] = f"{length} m > {ODC_LIMITS['length']} m"
-    if width > ODC_LIMITS["width"]:
-        exceeded["Width"] = f"{width} m > {ODC_LIMITS['width']} m"
-    if height > ODC_LIMITS["height"]:
-        exceeded["Height"] = f"{height} m > {ODC_LIMITS['height']} m"
-    if weight > ODC_LIMITS["weight"]:
-        exceeded["Weight"] = f"{weight} kg > {ODC_LIMITS['weight']} kg"
-    return exceeded
-
-def compute_best_vehicle(length, width, height, weight, quantity, distance_km, allow_stacking, cargo_type):
-    volume = length * width * height
-    total_weight = weight * quantity  # in kg
-    results = []
-
-    for v in vehicle_types:
-        if not v["has_sidewalls"] and cargo_type in fragile_items:
-            continue
-        
-        # Skip if cargo does not physically fit
-        if length > v["max_length"] or width > v["max_width"] or height > v["max_height"] or weight > v["max_weight"]:
-            continue
-
-        # Calculate how many cargo units can physically fit
-        fit_length = math.floor(v["max_length"] / length)
-        fit_width = math.floor(v["max_width"] / width)
-        fit_height = math.floor(v["max_height"] / height)
-
-        if allow_stacking:
-            max_units_vol = max(1, fit_length * fit_width * fit_height)
-        else:
-            max_units_vol = max(1, fit_length * fit_width)
-
-        # Calculate how many units fit by weight
-        max_units_wt = math.floor(v["max_weight"] / weight) if weight > 0 else quantity
-
 
-        max_units = max(1, min(max_units_vol, max_units_wt))
-        trucks_needed = math.ceil(quantity / max_units)
-        avg_weight_per_truck_tonnes = (total_weight / trucks_needed) / 1000
-
-        total_cost = trucks_needed * (
-            v["cost_per_km"] * distance_km +
-            v["cost_per_tkm"] * avg_weight_per_truck_tonnes * distance_km
-        )
-
-        results.append({
-            "vehicle": v["name"],
-            "class": classify_vehicle(v["name"]),
-            "num_trucks": trucks_needed,
-            "total_cost": round(total_cost, 2),
-            "max_units_per_truck": max_units
-        })
-
-    return sorted(results, key=lambda x: x["total_cost"])
+from vehicle_selector import classify_vehicle
+from vehicle_selector.catalog_store import CatalogReloader, builtin_snapshot
+from vehicle_selector.cost_risk import RISK_DRIVERS, cost_risk
+from vehicle_selector.export import EXPORT_FORMATS, REPORT_COLUMNS, ReportWriter
+from vehicle_selector.manifest import (
+    MANIFEST_CHUNK_SIZE,
+    MANIFEST_REQUIRED,
+    count_manifest_rows,
+    evaluate_manifest_chunk,
+    iter_manifest_chunks,
+    manifest_option_rows,
+    rank_manifest_chunk,
+)
+from vehicle_selector.metrics import metrics as stage_metrics
+from vehicle_selector.multi_drop import plan_multi_drop, prepare_instance
+from vehicle_selector.quote_store import QuoteStore
+from vehicle_selector.rate_cards import ingest_rate_cards
+from vehicle_selector.presentation import CHART_TOP_K, PAGE_SIZE, build_recommendation, sort_page, sweep_heatmaps, sweep_rows
+from vehicle_selector.result_cache import ResultCache, canonical_key
+from vehicle_selector.road_graph import load_road_graph
+from vehicle_selector.sweep import sweep_axis, sweep_grid, sweep_summary
+
+# The selection engine lives in the vehicle_selector package; this script is
+# only the Streamlit front-end.
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(max_entries=512, ttl_seconds=3600)
+
+@st.cache_resource
+def get_plan_cache():
+    return ResultCache(max_entries=2048, ttl_seconds=3600)
+
+@st.cache_resource
+def get_sweep_cache():
+    return ResultCache(max_entries=32, ttl_seconds=3600)
+
+@st.cache_resource
+def get_catalog_source():
+    # ARTSON_CATALOG points at a catalog directory or SQLite file; edits are picked up live
+    path = os.environ.get("ARTSON_CATALOG")
+    return CatalogReloader(path) if path else builtin_snapshot()
+
+@st.cache_resource
+def get_road_graph():
+    # ARTSON_ROAD_GRAPH points at an offline edges.csv (+ nodes.csv); paths are cached on the graph
+    path = os.environ.get("ARTSON_ROAD_GRAPH")
+    return load_road_graph(path) if path else None
+
+@st.cache_resource
+def get_rate_cards():
+    # ARTSON_RATE_CARDS points at a directory of transporter rate cards (CSV/Excel); (RateTable, report) or None
+    path = os.environ.get("ARTSON_RATE_CARDS")
+    return ingest_rate_cards(path) if path else None
+
+@st.cache_resource
+def get_quote_store():
+    # Every recommendation is kept in a local SQLite quote store (ARTSON_QUOTES, default ./artson_quotes.sqlite)
+    return QuoteStore(os.environ.get("ARTSON_QUOTES", "artson_quotes.sqlite"))
+
+@st.cache_resource
+def get_metrics():
+    # ARTSON_METRICS=1 turns on stage timing. ARTSON_METRICS_LOG appends one JSON line per request,
+    # ARTSON_METRICS_FILE is rewritten after each request (Prometheus textfile collector) and
+    # ARTSON_METRICS_PORT serves /metrics.
+    if os.environ.get("ARTSON_METRICS", "").lower() in ("1", "true", "yes"):
+        stage_metrics.configure(log_path=os.environ.get("ARTSON_METRICS_LOG"))
+        if os.environ.get("ARTSON_METRICS_PORT"):
+            stage_metrics.serve_prometheus(int(os.environ["ARTSON_METRICS_PORT"]))
+    return stage_metrics
+
+def current_catalog():
+    source = get_catalog_source()
+    return source.current() if isinstance(source, CatalogReloader) else source
+
+def show_table(table, key, sort_by="total_cost"):
+    # Sorted and paged server-side: only one page of the Arrow table goes to the browser
+    descending, page = False, 1
+    if table.num_rows > PAGE_SIZE:
+        columns = [c for c in table.column_names if c != "cheapest"]
+        tcol1, tcol2, tcol3 = st.columns([2, 1, 1])
+        sort_by = tcol1.selectbox("Sort by", columns, index=columns.index(sort_by), key=f"{key}_sort")
+        descending = tcol2.toggle("Descending", key=f"{key}_desc")
+        page = tcol3.number_input("Page", min_value=1, max_value=-(-table.num_rows // PAGE_SIZE), value=1, key=f"{key}_page")
+    rows, pages = sort_page(table, sort_by, descending, int(page) - 1)
+    st.dataframe(rows, hide_index=True, column_config={"cheapest": st.column_config.CheckboxColumn("✅ Cheapest")})
+    if pages > 1:
+        st.caption(f"Page {int(page)} of {pages} · {table.num_rows:,} options")
 
 # ----------------------------
 # Streamlit App Starts
@@ -120,62 +103,351 @@ st.title("🚛 Vehicle Recommendation Tool – Artson Logistics")
 st.caption("Built for SCM use-cases. Made by Pushkin Dugam.")
 st.markdown("---")
 
-# Inputs
-col1, col2 = st.columns(2)
-with col1:
-    length = st.number_input("Cargo Length (m)", value=2.2, min_value=0.1)
-    width = st.number_input("Cargo Width (m)", value=1.2, min_value=0.1)
-    height = st.number_input("Cargo Height (m)", value=1.8, min_value=0.1)
-    weight = st.number_input("Cargo Weight (kg)", value=1200.0, min_value=0.01)
-with col2:
-    quantity = st.number_input("Quantity of Cargo Units", value=4, min_value=1, step=1)
-    distance_km = st.number_input("Transport Distance (km)", value=800, min_value=1)
-    cargo_type = st.selectbox("Cargo Type", [
-        "Standard Steel Fabrication", "Precision Instrument", "Glass Equipment",
-        "Control Panel", "Pipeline", "Rotating Machinery", "Fragile Custom Assembly"
-    ], index=3)
-    stacking = st.checkbox("Allow Vertical Stacking (if feasible)", value=False)
-
-st.markdown("---")
-
-if st.button("🔍 Recommend Vehicle"):
-    results = compute_best_vehicle(length, width, height, weight, quantity, distance_km, stacking, cargo_type)
-
-    if not results:
-        st.error("❌ No suitable vehicle found.")
-    else:
-        best = results[0]
-        st.success(f"✅ **Recommended Vehicle:** {best['vehicle']}")
-        st.markdown(f"- **Class:** {best['class']}")
-        st.markdown(f"- **Number of Vehicles Required:** {best['num_trucks']}")
-        st.markdown(f"- **Estimated Transport Cost:** ₹ {best['total_cost']}")
-        st.markdown(f"- **Max Units per Vehicle:** {best['max_units_per_truck']}")
-
-        odc_exceeded = check_odc(length, width, height, weight)
-        if odc_exceeded:
-            st.warning("⚠️ **ODC Alert:** This cargo exceeds standard transport limits and qualifies as **Over Dimensional Cargo (ODC)**.")
-            st.markdown("### ❌ Dimensions Exceeding Limits:")
-            for key, msg in odc_exceeded.items():
-                st.markdown(f"- **{key}**: {msg}")
-            st.markdown("🔧 Please arrange for **special permits**, route clearance, and escort vehicles.")
+# One snapshot per rerun, so a reload mid-run cannot mix two catalog versions
+catalog = current_catalog()
+metrics = get_metrics()
+
+tab_single, tab_manifest, tab_multi = st.tabs(["📝 Single Cargo", "📂 Manifest Upload", "🚚 Multi-Drop"])
+
+with tab_single:
+    # Inputs
+    col1, col2 = st.columns(2)
+    with col1:
+        length = st.number_input("Cargo Length (m)", value=2.2, min_value=0.1)
+        width = st.number_input("Cargo Width (m)", value=1.2, min_value=0.1)
+        height = st.number_input("Cargo Height (m)", value=1.8, min_value=0.1)
+        weight = st.number_input("Cargo Weight (kg)", value=1200.0, min_value=0.01)
+    with col2:
+        quantity = st.number_input("Quantity of Cargo Units", value=4, min_value=1, step=1)
+        distance_km = st.number_input("Transport Distance (km)", value=800, min_value=1)
+        cargo_type = st.selectbox("Cargo Type", [
+            "Standard Steel Fabrication", "Precision Instrument", "Glass Equipment",
+            "Control Panel", "Pipeline", "Rotating Machinery", "Fragile Custom Assembly"
+        ], index=3)
+        stacking = st.checkbox("Allow Vertical Stacking (if feasible)", value=False)
+
+    graph = get_road_graph()
+    route = None
+    if graph is not None and st.toggle("🛣️ Use road network distance", value=False):
+        places = sorted(graph.nodes)
+        rcol1, rcol2 = st.columns(2)
+        origin = rcol1.selectbox("Origin", places, index=0)
+        destination = rcol2.selectbox("Destination", places, index=len(places) - 1)
+        route = (graph, origin, destination)
+
+    rate_cards = get_rate_cards()
+    lane = None
+    if rate_cards is not None and st.toggle("📄 Price with transporter rate cards", value=True):
+        rate_table = rate_cards[0]
+        lcol1, lcol2, lcol3 = st.columns(3)
+        if route is not None:
+            lane_origin, lane_destination = route[1], route[2]
         else:
-            st.info("📦 This cargo is **within standard CMVR transport limits** and does **not** qualify as ODC.")
+            lanes = ["Any"] + rate_table.places
+            lane_origin = lcol1.selectbox("Lane from", lanes, format_func=str.title, key="lane_origin")
+            lane_destination = lcol2.selectbox("Lane to", lanes, format_func=str.title, key="lane_destination")
+        lane = (lane_origin, lane_destination, lcol3.date_input("Rates valid on", key="lane_date"))
+
+    project = st.text_input("Project (optional, for the quote history)", value="", key="project").strip()
+
+    with st.expander("🎲 Cost risk simulation"):
+        simulate = st.checkbox("Simulate fuel, detention and escort variation", value=False)
+        rk1, rk2 = st.columns(2)
+        scenarios = rk1.number_input("Scenarios per vehicle", value=100_000, min_value=1_000, max_value=1_000_000, step=10_000)
+        seed = rk2.number_input("Random seed", value=0, min_value=0, step=1)
+        fuel_sd = rk1.number_input("Fuel price volatility (sd, %)", value=RISK_DRIVERS["fuel_change"]["sd"] * 100, min_value=0.0)
+        detention = rk2.number_input("Mean detention days per truck", value=RISK_DRIVERS["detention_days"]["mean"], min_value=0.0)
+        per_day = rk1.number_input("Detention charge per truck-day (₹)", value=RISK_DRIVERS["detention_per_day"]["value"], min_value=0.0)
+        escort = RISK_DRIVERS["escort_per_km"]
+        escort_low, escort_high = rk2.slider("ODC escort charge per km (₹)", 0.0, 150.0, (escort["low"], escort["high"]))
+        drivers = {
+            "fuel_change": {**RISK_DRIVERS["fuel_change"], "sd": fuel_sd / 100},
+            "detention_days": {"dist": "poisson", "mean": detention},
+            "detention_per_day": {"dist": "fixed", "value": per_day},
+            "escort_per_km": {"dist": "triangular", "low": escort_low, "mode": min(max(escort["mode"], escort_low), escort_high),
+                              "high": escort_high},
+        }
+
+    with st.expander("🧮 What-if sweep (quantity × distance × stacking)"):
+        st.caption("Best vehicle and cost for this cargo over a grid, with catalog rates and typed distances.")
+        wcol1, wcol2 = st.columns([3, 1])
+        sweep_quantity = wcol1.slider("Quantity", 1, 5000, (1, 500), key="sweep_quantity")
+        sweep_quantity_step = wcol2.number_input("Step", value=1, min_value=1, key="sweep_quantity_step")
+        sweep_distance = wcol1.slider("Distance (km)", 10, 5000, (50, 3000), key="sweep_distance")
+        sweep_distance_step = wcol2.number_input("Step (km)", value=30, min_value=1, key="sweep_distance_step")
+        sweep_stacking = st.multiselect("Stacking", [False, True], default=[False, True], key="sweep_stacking",
+                                        format_func=lambda s: "On" if s else "Off")
+        cells = (len(sweep_axis(*sweep_quantity, sweep_quantity_step)) * len(sweep_axis(*sweep_distance, sweep_distance_step))
+                 * len(sweep_stacking))
+        if st.button(f"▶️ Run sweep ({cells:,} cells)", disabled=not cells):
+            st.session_state["sweep_request"] = (length, width, height, weight, cargo_type, sweep_quantity, int(sweep_quantity_step),
+                                                 sweep_distance, int(sweep_distance_step), tuple(sweep_stacking))
+        if "sweep_request" in st.session_state:
+            with metrics.request("sweep"):
+                request = st.session_state["sweep_request"]
+                s_length, s_width, s_height, s_weight, s_cargo, q_range, q_step, d_range, d_step, s_stackings = request
+                with metrics.stage("sweep"):
+                    sweep = get_sweep_cache().get_or_compute(request + (catalog.version,), lambda: sweep_grid(
+                        s_length, s_width, s_height, s_weight, s_cargo, sweep_axis(*q_range, q_step), sweep_axis(*d_range, d_step),
+                        s_stackings, catalog.vehicles, catalog.fragile_items, catalog.axle_geometry))
+                st.dataframe(pd.DataFrame(sweep_summary(sweep)), hide_index=True,
+                             column_config={"share": st.column_config.ProgressColumn("Share of cells", min_value=0, max_value=1)})
+                with metrics.stage("render_chart"):
+                    vehicle_map, cost_map = sweep_heatmaps(sweep_rows(sweep))
+                    st.altair_chart(vehicle_map)
+                    st.altair_chart(cost_map)
 
-        if cargo_type in fragile_items:
-            st.info(f"📦 Fragile Cargo – Suggested Packaging: **{fragile_items[cargo_type]}**")
-
-        st.subheader("📊 Cost Comparison by Vehicle Type")
-        df = pd.DataFrame(results)
-        chart = alt.Chart(df).mark_bar().encode(
-            y=alt.Y("vehicle:N", title="Vehicle Type", sort="-x"),
-            x=alt.X("total_cost:Q", title="Estimated Cost ₹"),
-            color="class:N",
-            tooltip=["vehicle", "total_cost", "num_trucks"]
-        ).properties(height=400)
-        st.altair_chart(chart, use_container_width=True)
+    st.markdown("---")
 
-        st.subheader("🔄 Alternate Vehicle Options")
-        st.dataframe(df.style.highlight_min(subset=["total_cost"], color="lightgreen", axis=0))
+    if st.button("🔍 Recommend Vehicle"):
+        st.session_state["single_request"] = (length, width, height, weight, quantity, distance_km, stacking, cargo_type,
+                                               route[1:] if route else None, lane)
+        # Recorded once per click, not on the reruns that page through the results
+        st.session_state["record_quote"] = project
+
+    # Sorting and paging rerun the script, so results stay on the last requested cargo
+    if "single_request" in st.session_state:
+        with metrics.request("single"):
+            length, width, height, weight, quantity, distance_km, stacking, cargo_type, endpoints, lane = st.session_state["single_request"]
+            route = (graph, *endpoints) if endpoints and graph is not None else None
+            if route is not None:
+                origin, destination = endpoints
+            lane_rates = rate_cards[0].lane(*lane) if lane and rate_cards is not None else None
+            cache = get_result_cache()
+            # The loaded road graph and rate table versions join the catalog version (a change clears
+            # the cache); the lane and date are part of the key, so sessions on other lanes keep their entries
+            version = catalog.version if graph is None else f"{catalog.version}/{graph.version}"
+            if rate_cards is not None:
+                version = f"{version}/{rate_cards[0].version}"
+            lane_key = lane_rates.key if lane_rates is not None else None
+            if route is None:
+                key = canonical_key(length, width, height, weight, quantity, distance_km, stacking, cargo_type, None)[:-1] + (lane_key, version)
+            else:
+                # Road distances replace the typed distance
+                key = canonical_key(length, width, height, weight, quantity, 0, stacking, cargo_type, None)[:-1] + (origin, destination, lane_key,
+                                                                                                                 version)
+            hits = cache.hits
+            with metrics.stage("recommendation"):
+                rec = cache.get_or_compute(key, lambda: build_recommendation(length, width, height, weight, quantity, distance_km, stacking,
+                                                                             cargo_type, get_plan_cache(), catalog, route, lane_rates))
+            metrics.annotate(cache_hit=cache.hits > hits, options=len(rec["results"]))
+            results = rec["results"]
+            if "record_quote" in st.session_state:
+                store = get_quote_store()
+                with metrics.stage("quote_store"):
+                    st.session_state["previous_quotes"] = store.lookup(length, width, height, weight, quantity, stacking, cargo_type)
+                    store.record(length, width, height, weight, quantity, results[0].get("distance_km", distance_km) if results else distance_km,
+                                 stacking, cargo_type, results, catalog.version, st.session_state.pop("record_quote"))
+            previous = st.session_state.get("previous_quotes")
+            if previous:
+                with st.expander(f"📚 Quoted before ({len(previous)} time{'s' if len(previous) > 1 else ''})"):
+                    st.dataframe(pd.DataFrame([{
+                        "date": pd.Timestamp(q["created_at"], unit="s").strftime("%Y-%m-%d %H:%M"), "project": q["project"],
+                        "distance_km": q["distance_km"], "vehicle": q["vehicle"], "num_trucks": q["num_trucks"],
+                        "total_cost": q["total_cost"], "catalog": q["catalog_version"],
+                    } for q in previous]), hide_index=True)
+
+            if not results:
+                st.error("❌ No suitable vehicle found." if route is None else "❌ No suitable vehicle has a legal road between these places.")
+            else:
+                best = results[0]
+                st.success(f"✅ **Recommended Vehicle:** {best['vehicle']}")
+                st.markdown(f"- **Class:** {best['class']}")
+                if best.get("transporter"):
+                    st.markdown(f"- **Transporter (cheapest valid rate card):** {best['transporter']}")
+                st.markdown(f"- **Number of Vehicles Required:** {best['num_trucks']}")
+                st.markdown(f"- **Estimated Transport Cost:** ₹ {best['total_cost']}")
+                st.markdown(f"- **Max Units per Vehicle:** {best['max_units_per_truck']}"
+                            + (" (limited by axle loads / CG)" if best.get("axle_limited") else ""))
+                if "front_axle_kg" in best:
+                    st.markdown(f"- **Axle Loads per Vehicle:** front {best['front_axle_kg']:,} kg, rear {best['rear_axle_kg']:,} kg")
+                if best["vehicle"] in rec["paths"]:
+                    st.markdown(f"- **Route ({best['distance_km']:,} km):** {' → '.join(rec['paths'][best['vehicle']])}")
+
+                odc_exceeded = rec["odc_exceeded"]
+                if odc_exceeded:
+                    st.warning("⚠️ **ODC Alert:** This cargo exceeds standard transport limits and qualifies as **Over Dimensional Cargo (ODC)**.")
+                    st.markdown("### ❌ Dimensions Exceeding Limits:")
+                    for key, msg in odc_exceeded.items():
+                        st.markdown(f"- **{key}**: {msg}")
+                    st.markdown("🔧 Please arrange for **special permits**, route clearance, and escort vehicles.")
+                else:
+                    st.info("📦 This cargo is **within standard CMVR transport limits** and does **not** qualify as ODC.")
+
+                if rec["odc_rules"]:
+                    st.markdown("### 🗺️ State / Route Limits Exceeded")
+                    st.dataframe(pd.DataFrame(rec["odc_rules"]), hide_index=True)
+
+                if cargo_type in catalog.fragile_items:
+                    st.info(f"📦 Fragile Cargo – Suggested Packaging: **{catalog.fragile_items[cargo_type]}**")
+
+                st.subheader("📊 Trade-off Frontier (non-dominated options)")
+                st.caption("No other option is cheaper, needs fewer trucks, fills them better and needs fewer ODC permits at the same time.")
+                if simulate:
+                    chart_col, risk_col = st.columns([3, 2])
+                    with metrics.stage("render_chart"):
+                        chart_col.altair_chart(rec["chart"], use_container_width=True)
+                    # Seeded, so the same inputs always show the same percentiles
+                    with metrics.stage("cost_risk"):
+                        risk = cost_risk(results[:CHART_TOP_K], distance_km, int(scenarios), int(seed), drivers)
+                    risk_col.markdown(f"**Cost risk (₹, {int(scenarios):,} scenarios)**")
+                    risk_col.dataframe(pd.DataFrame(risk).set_index("vehicle")[["p50", "p90", "p99"]], use_container_width=True)
+                else:
+                    with metrics.stage("render_chart"):
+                        st.altair_chart(rec["chart"], use_container_width=True)
+
+                st.subheader("🔄 Alternate Vehicle Options")
+                with metrics.stage("render_table"):
+                    show_table(rec["table"], "options")
+        if metrics.enabled and os.environ.get("ARTSON_METRICS_FILE"):
+            metrics.write_prometheus(os.environ["ARTSON_METRICS_FILE"])
+
+
+with tab_manifest:
+    st.markdown("Upload a **CSV or Excel** manifest with columns `length`, `width`, `height`, `weight`, `quantity` "
+                "and optionally `distance_km`, `allow_stacking`, `cargo_type` per line.")
+    manifest = st.file_uploader("Cargo Manifest", type=["csv", "xlsx", "xlsm"])
+    mcol1, mcol2 = st.columns(2)
+    with mcol1:
+        m_distance_km = st.number_input("Default Transport Distance (km)", value=800, min_value=1, key="m_distance_km")
+        m_cargo_type = st.selectbox("Default Cargo Type", [
+            "Standard Steel Fabrication", "Precision Instrument", "Glass Equipment",
+            "Control Panel", "Pipeline", "Rotating Machinery", "Fragile Custom Assembly"
+        ], index=0, key="m_cargo_type")
+    with mcol2:
+        m_stacking = st.checkbox("Allow Vertical Stacking by default", value=False, key="m_stacking")
+        m_chunk_size = st.number_input("Rows per chunk", value=MANIFEST_CHUNK_SIZE, min_value=100, step=1000, key="m_chunk_size")
+    ecol1, ecol2 = st.columns(2)
+    m_export = ecol1.selectbox("Export every vehicle option as", ["Off", "CSV", "Excel", "Parquet"], key="m_export")
+    m_export_top = ecol2.number_input("Options per line in the export (0 = all)", value=0, min_value=0, key="m_export_top")
+    m_route = None
+    if len(catalog.odc_rules.rule_sets) > 1:
+        m_route = st.multiselect("ODC rule sets on the route", catalog.odc_rules.rule_sets,
+                                 default=catalog.odc_rules.rule_sets[:1], key="m_route")
+
+    if manifest is not None and st.button("🔍 Evaluate Manifest"):
+        total_rows = count_manifest_rows(manifest, manifest.name)
+        progress = st.progress(0.0, text="Evaluating manifest...")
+
+        # Only per-vehicle aggregates and a short preview are kept between chunks.
+        summary = {}
+        preview = []
+        done = 0
+        no_fit = 0
+        invalid = 0
+        flagged = {}
+        # The export is written to a temporary file chunk by chunk and only read back when downloaded
+        writer = None
+        previous_export = st.session_state.pop("manifest_export", None)
+        if previous_export and os.path.exists(previous_export[0]):
+            os.remove(previous_export[0])
+        if m_export != "Off":
+            fmt = {"CSV": "csv", "Excel": "xlsx", "Parquet": "parquet"}[m_export]
+            export_handle, export_path = tempfile.mkstemp(suffix=f".{fmt}", prefix="artson_manifest_")
+            os.close(export_handle)
+            writer = ReportWriter(export_path, fmt, REPORT_COLUMNS + ["error"])
+        failed = True
+        try:
+            for chunk in iter_manifest_chunks(manifest, manifest.name, int(m_chunk_size)):
+                with metrics.stage("manifest_chunk"):
+                    # With an export every option is ranked once; the best per line and the report rows both come from it
+                    ranked = rank_manifest_chunk(chunk, m_distance_km, m_stacking, m_cargo_type, catalog) if writer is not None else None
+                    best = evaluate_manifest_chunk(chunk, m_distance_km, m_stacking, m_cargo_type, catalog, m_route, ranked)
+                if writer is not None:
+                    with metrics.stage("manifest_export"):
+                        writer.write(manifest_option_rows(chunk, done + 1, m_distance_km, m_stacking, m_cargo_type, catalog,
+                                                          int(m_export_top), ranked))
+                done += len(best)
+                fits = best[best["num_trucks"] > 0]
+                bad = int(best["error"].notna().sum())
+                invalid += bad
+                no_fit += len(best) - len(fits) - bad
+                for severity in catalog.odc_rules.severities:
+                    flagged[severity] = flagged.get(severity, 0) + int(best[severity].sum())
+                for vehicle, group in fits.groupby("vehicle"):
+                    agg = summary.setdefault(vehicle, {"lines": 0, "num_trucks": 0, "total_cost": 0.0})
+                    agg["lines"] += len(group)
+                    agg["num_trucks"] += int(group["num_trucks"].sum())
+                    agg["total_cost"] += float(group["total_cost"].sum())
+                if len(preview) < 100:
+                    preview.extend(pd.concat([chunk[MANIFEST_REQUIRED], best], axis=1).head(100 - len(preview)).to_dict("records"))
+                label = f"Evaluated {done:,} of {total_rows:,} lines" if total_rows else f"Evaluated {done:,} lines"
+                progress.progress(min(1.0, done / total_rows) if total_rows else 1.0, text=label)
+            failed = False
+        except ValueError as exc:
+            st.error(f"❌ {exc}")
+        finally:
+            # The partial export of a failed (or interrupted) run is never offered for download
+            if writer is not None:
+                writer.close()
+                if failed:
+                    os.remove(export_path)
+        if not failed:
+            if writer is not None:
+                st.session_state["manifest_export"] = (export_path, fmt, writer.rows)
+            progress.progress(1.0, text=f"Evaluated {done:,} lines")
+            st.success(f"✅ **{done:,} cargo lines evaluated**")
+            if invalid:
+                st.warning(f"⚠️ {invalid:,} invalid line(s) were not quoted (see the error column).")
+            if no_fit:
+                st.warning(f"⚠️ {no_fit:,} line(s) have no suitable vehicle.")
+            for severity, count in flagged.items():
+                if count:
+                    st.warning(f"⚠️ {count:,} line(s) flagged **{severity.upper()}** on the selected route.")
+            if summary:
+                summary_df = pd.DataFrame(
+                    [{"vehicle": k, "class": classify_vehicle(k), **v} for k, v in summary.items()]
+                ).sort_values("total_cost", ascending=False)
+                summary_df["total_cost"] = summary_df["total_cost"].round(2)
+                st.markdown(f"- **Total Vehicles Required:** {int(summary_df['num_trucks'].sum()):,}")
+                st.markdown(f"- **Estimated Transport Cost:** ₹ {summary_df['total_cost'].sum():,.2f}")
+                st.subheader("📊 Recommended Vehicles Across Manifest")
+                st.dataframe(summary_df.head(PAGE_SIZE), hide_index=True)
+                if len(summary_df) > PAGE_SIZE:
+                    st.caption(f"Top {PAGE_SIZE} of {len(summary_df):,} vehicle types by total cost")
+            st.subheader("🔎 First Lines")
+            st.dataframe(pd.DataFrame(preview))
+
+    if "manifest_export" in st.session_state:
+        export_path, fmt, export_rows = st.session_state["manifest_export"]
+
+        def read_export(path=export_path):
+            with open(path, "rb") as f:
+                return f.read()
+
+        st.download_button(f"⬇️ Download all options ({export_rows:,} rows, {fmt.upper()})", read_export,
+                           f"manifest_options.{fmt}", EXPORT_FORMATS[fmt], on_click="ignore")
+
+with tab_multi:
+    st.markdown("Plan truck tours from one yard to several sites. Upload the **cargo lines** "
+                "(`site`, `length`, `width`, `height`, `weight`, `quantity`, optional `cargo_type`) and a "
+                "**distance matrix** in km with labelled rows and columns, yard first.")
+    dcol1, dcol2 = st.columns(2)
+    cargo_file = dcol1.file_uploader("Cargo Lines (CSV)", type=["csv"], key="md_cargo")
+    matrix_file = dcol2.file_uploader("Distance Matrix (CSV)", type=["csv"], key="md_matrix")
+    dcol3, dcol4 = st.columns(2)
+    md_budget = dcol3.number_input("Planning time budget (s)", value=3.0, min_value=0.5, max_value=60.0, key="md_budget")
+    md_stacking = dcol4.checkbox("Allow Vertical Stacking", value=False, key="md_stacking")
+
+    if cargo_file is not None and matrix_file is not None and st.button("🗺️ Plan Tours"):
+        try:
+            cargo_rows = list(csv.DictReader(io.StringIO(cargo_file.getvalue().decode("utf-8-sig"))))
+            matrix_rows = [r for r in csv.reader(io.StringIO(matrix_file.getvalue().decode("utf-8-sig"))) if r]
+            sites, distances = prepare_instance(cargo_rows, matrix_rows)
+        except (KeyError, TypeError, ValueError) as exc:
+            st.error(f"❌ {exc}")
+        else:
+            with st.spinner(f"Planning tours for {len(sites):,} sites..."):
+                plan = plan_multi_drop(sites, distances, md_stacking, "Standard Steel Fabrication",
+                                       catalog.vehicles, catalog.fragile_items, time_budget=md_budget)
+            st.success(f"✅ **{plan['num_trucks']:,} trucks**, {plan['total_km']:,.0f} km, est. ₹ {plan['total_cost']:,.2f}")
+            if plan["unserved"]:
+                st.warning(f"⚠️ No vehicle can carry the cargo for: {', '.join(plan['unserved'])}")
+            if not plan["complete"]:
+                st.info("⏱️ Time budget reached; tours are good but may not be fully optimised.")
+            tours = pd.DataFrame(plan["tours"])
+            tours["stops"] = tours["stops"].map(" → ".join)
+            st.dataframe(tours[["vehicle", "class", "trucks", "stops", "distance_km", "weight", "load_fraction", "cost"]], hide_index=True)
 
 # Sidebar
 with st.sidebar:
@@ -190,12 +462,71 @@ with st.sidebar:
     dimensions. This tool helps ensure **safe & compliant** transport.
     """)
     st.markdown("### 📏 Standard ODC Limits")
-    st.markdown("""
-    - **Max Length:** 12.0 m  
-    - **Max Width:** 2.6 m  
-    - **Max Height:** 3.8 m  
-    - **Max Weight:** 40,000 kg
+    st.markdown(f"""
+    - **Max Length:** {catalog.odc_limits['length']} m  
+    - **Max Width:** {catalog.odc_limits['width']} m  
+    - **Max Height:** {catalog.odc_limits['height']} m  
+    - **Max Weight:** {catalog.odc_limits['weight']:,.0f} kg
     """)
+    with st.expander("⚡ Result Cache"):
+        stats = get_result_cache().stats()
+        st.markdown(f"""
+        - **Catalog:** `{catalog.source}` ({len(catalog.vehicles):,} vehicles)
+        - **Catalog Version:** `{catalog.version}`
+        - **Entries:** {stats['entries']}
+        - **Hits / Misses:** {stats['hits']} / {stats['misses']} ({stats['hit_rate']:.0%} hit rate)
+        - **Evictions:** {stats['evictions']}
+        """)
+        plan_stats = get_plan_cache().stats()
+        st.markdown(f"""
+        - **Packing Plans Cached:** {plan_stats['entries']}
+        - **Plan Hits / Misses:** {plan_stats['hits']} / {plan_stats['misses']}
+        """)
+        source = get_catalog_source()
+        if isinstance(source, CatalogReloader) and source.last_error:
+            st.error(f"Catalog reload failed, still serving the last good version: {source.last_error}")
+    if get_rate_cards() is not None:
+        with st.expander("📄 Rate Cards"):
+            rate_table, report = get_rate_cards()
+            st.markdown(f"""
+            - **Files:** {report['files']:,}
+            - **Rates:** {report['rows']:,} from {len({r['transporter'] for r in rate_table.rows}):,} transporters
+            - **Rejected Rows:** {len(report['rejected']):,}
+            """)
+            for error in report["failed"]:
+                st.error(error)
+            if report["rejected"]:
+                st.dataframe(pd.DataFrame(report["rejected"][:PAGE_SIZE]), hide_index=True)
+            if st.button("🔄 Reload rate cards"):
+                get_rate_cards.clear()
+                st.rerun()
+    with st.expander("📚 Quote History"):
+        store = get_quote_store()
+        hcol1, hcol2 = st.columns(2)
+        h_project = hcol1.selectbox("Project", ["All"] + store.projects(), key="history_project")
+        h_days = hcol2.number_input("Last days", value=30, min_value=1, key="history_days")
+        since = pd.Timestamp.now().timestamp() - h_days * 86400
+        quotes = store.history(None if h_project == "All" else h_project, since=since, limit=PAGE_SIZE)
+        if quotes:
+            st.dataframe(pd.DataFrame([{"date": pd.Timestamp(q["created_at"], unit="s").strftime("%Y-%m-%d"), "vehicle": q["vehicle"],
+                                        "total_cost": q["total_cost"]} for q in quotes]), hide_index=True)
+        else:
+            st.caption("No quotes in this period.")
+    # Hidden unless the page is opened with ?debug=1
+    if st.query_params.get("debug") == "1":
+        with st.expander("🐞 Stage Timings", expanded=True):
+            if st.toggle("Record stage timings", value=metrics.enabled, key="debug_metrics") != metrics.enabled:
+                metrics.configure(not metrics.enabled, metrics.log_path)
+            summary = metrics.summary()
+            if summary:
+                st.dataframe(pd.DataFrame(summary), hide_index=True)
+                recent = metrics.recent()
+                st.markdown(f"**Last {len(recent)} requests**")
+                st.dataframe(pd.DataFrame([{"label": r["label"], "total_ms": r["total_ms"], "cache_hit": r.get("cache_hit"),
+                                            **r["stages"]} for r in recent]), hide_index=True)
+                st.download_button("Prometheus metrics", metrics.prometheus_text(), "artson_metrics.prom", "text/plain")
+            else:
+                st.caption("No requests recorded yet.")
     st.markdown("---")
     st.markdown("### 🛠️ Artson SCM Team – 2025")
     st.markdown("*by **Pushkin Dugam***")